@@ -0,0 +1,449 @@
+"""
+Elección automática del motor (bucle de Python o ruta vectorizada) según el
+tamaño de cada primitiva.
+
+Para líneas muy cortas y radios pequeños la sobrecarga fija de cada llamada
+a NumPy pesa más que los bucles de 'nucleo'; para tamaños grandes los bucles
+pierden por mucho. El punto de cruce depende de la máquina, así que la
+primera vez que se usa una operación se mide en el propio equipo (unas
+décimas de segundo) y la tabla resultante se guarda en disco. Después cada
+llamada solo calcula el tamaño y busca su tramo en la tabla.
+
+La variable de entorno RASTER_AUTOTUNE controla el ajuste: vacía usa la
+caché por defecto (~/.cache/programa_linea/autoajuste.json), "0" desactiva
+la medición (siempre la ruta vectorizada) y cualquier otro valor es la ruta
+del archivo de caché. Para ver la tabla y las decisiones:
+
+    python autoajuste.py                  # tabla (calibra si hace falta)
+    python autoajuste.py --recalibrate    # vuelve a medir
+    python autoajuste.py --explain dda 0 0 12 5
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from bisect import bisect_right
+from collections import Counter
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from motor_circulos import midpoint_circle_cached, shape_cache
+from motor_lineas import bresenham_cached, bresenham_points, dda_buffers, pattern_cache
+from nucleo import dda_algorithm, midpoint_circle_algorithm
+from puntos import PointBuffer
+from recorte import Viewport
+
+# Variable de entorno con la ruta de la caché ("0" desactiva la medición)
+ENV_VAR = "RASTER_AUTOTUNE"
+DEFAULT_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                            "programa_linea", "autoajuste.json")
+
+# Versión del formato de la caché: al cambiar los motores o la forma de
+# medir se vuelve a calibrar
+CACHE_VERSION = 2
+
+# Tamaños medidos (potencias de 2) y parámetros de la medición
+CALIBRATION_SIZES = [2 ** k for k in range(13)]
+SAMPLES = 16
+REPEATS = 3
+# El bucle de referencia que pierde por este factor en dos tamaños seguidos
+# ya no se mide en los siguientes: solo empeora con el tamaño
+GIVE_UP_RATIO = 4.0
+
+
+# ---------- Motores de Python con la interfaz de los vectorizados ----------
+
+def dda_python(x1, y1, x2, y2):
+    """
+    'nucleo.dda_algorithm' (el bucle de referencia) con la interfaz de
+    'dda_buffers'.
+    """
+    points_int, points_float, dx, dy = dda_algorithm(x1, y1, x2, y2)
+    return (PointBuffer(np.array(points_int, dtype=np.int32).reshape(-1, 2)),
+            PointBuffer(np.array(points_float, dtype=np.float64).reshape(-1, 2)), dx, dy)
+
+
+def bresenham_python(x1: int, y1: int, x2: int, y2: int):
+    """
+    'bresenham_points' (bucle de Python) con la interfaz de 'bresenham_cached'.
+    """
+    points = PointBuffer(np.array(bresenham_points(x1, y1, x2, y2), dtype=np.int32))
+    return points, points, x2 - x1, y2 - y1
+
+
+def midpoint_circle_python(xc: int, yc: int, r: int) -> np.ndarray:
+    """
+    'nucleo.midpoint_circle_algorithm' como arreglo (n, 2), igual que
+    'midpoint_circle_cached'.
+    """
+    return np.array(midpoint_circle_algorithm(xc, yc, r), dtype=np.int64).reshape(-1, 2)
+
+
+# ---------- Registro ----------
+
+class Operation:
+    """
+    Una operación con varios motores intercambiables (misma interfaz y
+    mismos píxeles), una función 'size(*args)' que da el tamaño de una
+    llamada y 'sample(rng, n)' que genera argumentos de tamaño n para medir.
+
+    El motor 'reference' define el resultado: al calibrar, cada motor debe
+    dar los mismos píxeles ('pixels(resultado)') que él en todas las
+    muestras; el que no coincide se descarta ('rejected') y nunca se elige.
+
+    'table' es la lista ordenada de tramos (tamaño mínimo, motor): cada
+    llamada usa el motor del último tramo cuyo mínimo no supera su tamaño.
+    """
+    def __init__(self, name: str, size: Callable, sample: Callable, default: str,
+                 reference: str, pixels: Callable) -> None:
+        self.name = name
+        self.size = size
+        self.sample = sample
+        self.default = default
+        self.reference = reference
+        self.pixels = pixels
+        self.engines: Dict[str, Callable] = {}
+        self.caches: Dict[str, object] = {}
+        self.rejected: Dict[str, str] = {}
+        self.timings: Dict[int, Dict[str, float]] = {}
+        self.source = "sin calibrar"
+        self.set_table([(0, default)])
+
+    def register(self, name: str, fn: Callable, cache=None) -> Callable:
+        """
+        Agrega un motor; 'cache' es la caché que usa (con 'bypass()'), que
+        se evita al medir para cronometrar el cálculo completo.
+        """
+        self.engines[name] = fn
+        if cache is not None:
+            self.caches[name] = cache
+        self.set_table(self.table)
+        return fn
+
+    def set_table(self, table: List[Tuple[int, str]]) -> None:
+        self.table = [(int(start), name) for start, name in table]
+        self._starts = [start for start, _ in self.table]
+        self._fns = [self.engines.get(name) for _, name in self.table]
+
+
+def _line_pixels(result) -> np.ndarray:
+    return np.asarray(result[0])
+
+
+def _line_size(x1, y1, x2, y2) -> int:
+    # Puntos que produce la línea
+    return int(max(abs(x2 - x1), abs(y2 - y1))) + 1
+
+
+def _line_sample(rng: random.Random, n: int) -> tuple:
+    # Segmento de n puntos con dirección y posición al azar
+    major = n - 1
+    minor = rng.randint(0, major)
+    dx, dy = (major, minor) if rng.random() < 0.5 else (minor, major)
+    x1, y1 = rng.randint(-1000, 1000), rng.randint(-1000, 1000)
+    return (x1, y1, x1 + rng.choice((-1, 1)) * dx, y1 + rng.choice((-1, 1)) * dy)
+
+
+def _circle_size(xc, yc, r) -> int:
+    return int(r)
+
+
+def _circle_sample(rng: random.Random, n: int) -> tuple:
+    return (rng.randint(-1000, 1000), rng.randint(-1000, 1000), n)
+
+
+class EngineTuner:
+    """
+    Registro de operaciones con calibración perezosa y caché en disco.
+
+    La primera llamada a una operación carga su tabla del archivo de caché
+    (si es de esta máquina y de estos motores) o la mide y la guarda. Con
+    'debug' activo se cuentan las decisiones por (operación, motor) en
+    'decisions'; 'explain' y 'report' muestran el porqué de cada elección.
+    """
+    def __init__(self, path: Optional[str] = None, enabled: bool = True) -> None:
+        self.path = path or DEFAULT_PATH
+        self.enabled = enabled
+        self.debug = False
+        self.decisions: Counter = Counter()
+        self.operations: Dict[str, Operation] = {}
+        self._ready: Dict[str, bool] = {}
+        self._cache: Optional[dict] = None
+
+    @classmethod
+    def from_env(cls) -> "EngineTuner":
+        value = os.environ.get(ENV_VAR, "")
+        return cls(path=value if value not in ("", "0", "1") else None, enabled=value != "0")
+
+    def operation(self, name: str, size: Callable, sample: Callable, default: str,
+                  reference: str, pixels: Callable = np.asarray) -> Operation:
+        op = Operation(name, size, sample, default, reference, pixels)
+        self.operations[name] = op
+        return op
+
+    # ---------- Despacho ----------
+
+    def select(self, name: str, *args) -> Callable:
+        """
+        Motor más rápido para estos argumentos (calibra la operación la
+        primera vez).
+        """
+        if not self._ready.get(name):
+            self.prepare(name)
+        op = self.operations[name]
+        i = max(bisect_right(op._starts, op.size(*args)) - 1, 0)
+        if self.debug:
+            self.decisions[(name, op.table[i][1])] += 1
+        return op._fns[i]
+
+    # ---------- Calibración y caché ----------
+
+    def prepare(self, name: str, recalibrate: bool = False) -> Operation:
+        """
+        Deja lista la tabla de una operación: de la caché en disco, midiendo
+        (y guardando) o, con el ajuste desactivado, la ruta por defecto.
+        """
+        op = self.operations[name]
+        if not self.enabled:
+            op.set_table([(0, op.default)])
+            op.timings = {}
+            op.source = f"desactivado ({ENV_VAR}=0)"
+        elif recalibrate or not self._load(op):
+            self.calibrate(op)
+            self._save(op)
+        self._ready[name] = True
+        return op
+
+    def calibrate(self, op: Operation, sizes: List[int] = CALIBRATION_SIZES) -> None:
+        """
+        Mide cada motor en cada tamaño y construye la tabla con el ganador
+        de cada tamaño; un tramo empieza en el primer tamaño medido que gana.
+
+        Cada una de las REPEATS pasadas usa SAMPLES argumentos nuevos y las
+        cachés de los motores se evitan ('bypass'), así que se mide el
+        cálculo completo y no aciertos de caché; las cachés compartidas
+        quedan como estaban. Antes de medir, los píxeles de cada motor se
+        comparan con los de la referencia mientras esta se siga midiendo.
+        """
+        rng = random.Random(0)
+        alive = set(op.engines)
+        losses = Counter()
+        op.timings = {}
+        op.rejected = {}
+        winners = []
+        with ExitStack() as stack:
+            for cache in {id(c): c for c in op.caches.values()}.values():
+                stack.enter_context(cache.bypass())
+            for n in sizes:
+                rounds = [[op.sample(rng, n) for _ in range(SAMPLES)] for _ in range(REPEATS)]
+                if op.reference in alive:
+                    self._verify(op, alive, rounds[0])
+                times = {}
+                for name, fn in op.engines.items():
+                    if name not in alive:
+                        continue
+                    fn(*rounds[0][0])  # Calienta las rutas de import
+                    best = float("inf")
+                    for samples in rounds:
+                        start = time.perf_counter()
+                        for args in samples:
+                            fn(*args)
+                        best = min(best, time.perf_counter() - start)
+                    times[name] = best / SAMPLES
+                fastest = min(times, key=times.get)
+                # Solo el bucle de referencia crece peor que los demás: deja de
+                # medirse tras perder por mucho dos veces seguidas
+                if op.reference in times:
+                    name = op.reference
+                    losses[name] = losses[name] + 1 if times[name] > GIVE_UP_RATIO * times[fastest] else 0
+                    if losses[name] >= 2 and len(alive) > 1:
+                        alive.discard(name)
+                op.timings[n] = times
+                winners.append((n, fastest))
+
+        table = [(0, winners[0][1])]
+        for n, name in winners[1:]:
+            if name != table[-1][1]:
+                table.append((n, name))
+        op.set_table(table)
+        op.source = f"medido en {platform.node() or 'este equipo'}"
+
+    @staticmethod
+    def _verify(op: Operation, alive: set, samples: list) -> None:
+        # Descarta los motores cuyos píxeles difieren de los de la referencia
+        reference = op.engines[op.reference]
+        for args in samples:
+            expected = op.pixels(reference(*args))
+            for name in sorted(alive - {op.reference}):
+                if not np.array_equal(op.pixels(op.engines[name](*args)), expected):
+                    op.rejected[name] = f"píxeles distintos de {op.reference} en {args}"
+                    alive.discard(name)
+
+    def fingerprint(self) -> dict:
+        return {
+            "host": platform.node(),
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "cpus": os.cpu_count(),
+            "version": CACHE_VERSION,
+        }
+
+    def _read_cache(self) -> dict:
+        if self._cache is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError):
+                self._cache = {}
+            if self._cache.get("fingerprint") != self.fingerprint():
+                self._cache = {"fingerprint": self.fingerprint(), "operations": {}}
+        return self._cache
+
+    def _load(self, op: Operation) -> bool:
+        entry = self._read_cache()["operations"].get(op.name)
+        if not entry or sorted(entry.get("engines", ())) != sorted(op.engines):
+            return False
+        op.set_table([tuple(row) for row in entry["table"]])
+        op.timings = {int(n): times for n, times in entry["timings"].items()}
+        op.rejected = entry.get("rejected", {})
+        op.source = f"caché {self.path}"
+        return True
+
+    def _save(self, op: Operation) -> None:
+        cache = self._read_cache()
+        cache["operations"][op.name] = {
+            "engines": sorted(op.engines),
+            "table": op.table,
+            "timings": {str(n): times for n, times in op.timings.items()},
+            "rejected": op.rejected,
+        }
+        # Escritura atómica: otro proceso nunca ve un archivo a medias
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=1)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # Sin caché escribible se vuelve a medir en el próximo proceso
+
+    # ---------- Depuración ----------
+
+    def explain(self, name: str, *args) -> str:
+        """
+        Por qué se elige un motor para estos argumentos: tamaño, tramo de la
+        tabla y tiempos medidos en el tamaño calibrado más cercano.
+        """
+        op = self.operations[name] if self._ready.get(name) else self.prepare(name)
+        size = op.size(*args)
+        i = max(bisect_right(op._starts, size) - 1, 0)
+        start, engine = op.table[i]
+        end = op.table[i + 1][0] - 1 if i + 1 < len(op.table) else None
+        text = f"{name}: tamaño {size} -> {engine} (tramo {start}..{'' if end is None else end}; {op.source})"
+        if op.timings:
+            nearest = min(op.timings, key=lambda n: abs(np.log2(max(n, 1)) - np.log2(max(size, 1))))
+            measured = ", ".join(f"{e} {t * 1e6:.1f} µs" for e, t in sorted(op.timings[nearest].items(),
+                                                                          key=lambda item: item[1]))
+            text += f"\n  medido con tamaño {nearest}: {measured}"
+        for engine, reason in op.rejected.items():
+            text += f"\n  descartado {engine}: {reason}"
+        return text
+
+    def report(self) -> str:
+        """
+        Tabla de cada operación y tiempos por tamaño (µs por llamada); con
+        'debug', también las decisiones tomadas.
+        """
+        lines = []
+        for name, op in self.operations.items():
+            if not self._ready.get(name):
+                self.prepare(name)
+            ranges = ", ".join(f"{start}+ {engine}" for start, engine in op.table)
+            lines.append(f"{name}: {ranges}  ({op.source})")
+            for n, times in sorted(op.timings.items()):
+                cells = "  ".join(f"{e} {times[e] * 1e6:9.1f}" if e in times else f"{e} {'-':>9s}"
+                                  for e in op.engines)
+                lines.append(f"  {n:>6d}  {cells}")
+            for engine, reason in op.rejected.items():
+                lines.append(f"  descartado {engine}: {reason}")
+        if self.decisions:
+            lines.append("decisiones: " + ", ".join(f"{op}/{engine} {count}"
+                                                   for (op, engine), count in sorted(self.decisions.items())))
+        return "\n".join(lines)
+
+
+# Ajustador compartido y operaciones registradas
+tuner = EngineTuner.from_env()
+
+# Los bucles de Python son la referencia de cada operación
+_dda = tuner.operation("dda", _line_size, _line_sample, default="numpy",
+                       reference="python", pixels=_line_pixels)
+_dda.register("python", dda_python)
+_dda.register("numpy", dda_buffers)
+
+_bresenham = tuner.operation("bresenham", _line_size, _line_sample, default="numpy",
+                             reference="python", pixels=_line_pixels)
+_bresenham.register("python", bresenham_python)
+_bresenham.register("numpy", bresenham_cached, cache=pattern_cache)
+
+_circle = tuner.operation("circle", _circle_size, _circle_sample, default="numpy",
+                          reference="python")
+_circle.register("python", midpoint_circle_python)
+_circle.register("numpy", midpoint_circle_cached, cache=shape_cache)
+
+
+def dda_auto(x1, y1, x2, y2, viewport: Optional[Viewport] = None):
+    """
+    Igual interfaz que 'dda_buffers', con el motor elegido por longitud.
+    Con 'viewport' se usa siempre la variante recortada.
+    """
+    if viewport is not None:
+        return dda_buffers(x1, y1, x2, y2, viewport)
+    return tuner.select("dda", x1, y1, x2, y2)(x1, y1, x2, y2)
+
+
+def bresenham_auto(x1: int, y1: int, x2: int, y2: int, viewport: Optional[Viewport] = None):
+    """
+    Igual interfaz que 'bresenham_cached', con el motor elegido por longitud.
+    """
+    if viewport is not None:
+        return bresenham_cached(x1, y1, x2, y2, viewport)
+    return tuner.select("bresenham", x1, y1, x2, y2)(x1, y1, x2, y2)
+
+
+def midpoint_circle_auto(xc: int, yc: int, r: int, viewport: Optional[Viewport] = None) -> np.ndarray:
+    """
+    Igual interfaz que 'midpoint_circle_cached', con el motor elegido por radio.
+    """
+    if viewport is not None:
+        return midpoint_circle_cached(xc, yc, r, viewport)
+    return tuner.select("circle", xc, yc, r)(xc, yc, r)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tabla de motores elegidos por tamaño.")
+    parser.add_argument("--recalibrate", action="store_true", help="Vuelve a medir y reescribe la caché.")
+    parser.add_argument("--explain", nargs="+", metavar=("OPERACION", "ARG"),
+                        help="Explica la elección para unos argumentos, p. ej. dda 0 0 12 5.")
+    args = parser.parse_args(argv)
+    if args.recalibrate:
+        for name in tuner.operations:
+            tuner.prepare(name, recalibrate=True)
+    if args.explain:
+        name, *values = args.explain
+        if name not in tuner.operations:
+            parser.error(f"Operación desconocida: {name} (hay {', '.join(tuner.operations)})")
+        print(tuner.explain(name, *map(int, values)))
+    else:
+        print(tuner.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+Banco de pruebas de rendimiento (sin ventana) de los algoritmos y del dibujo.
+
+Recorre longitudes de segmento, radios y tamaños de triángulo en varios
+órdenes de magnitud y mide, por separado, el tiempo de cálculo, el tiempo
+de dibujo (con un canvas Agg, sin Tk) y el pico de memoria del cálculo.
+Los resultados se guardan en JSON y pueden compararse con una línea base:
+
+    python benchmarks.py --output resultados.json
+    python benchmarks.py --quick --compare base.json --threshold 0.25
+
+Con '--compare' el proceso termina con código 1 si algún caso es más lento
+que la base en más del umbral indicado.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from autoajuste import dda_auto, midpoint_circle_auto, tuner
+from circulo import fill_circle_raster, midpoint_circle_algorithm, plot_circle
+from linea import plot_line
+from motor_circulos import shape_cache, span_cache
+from motor_lineas import bresenham_buffers, bresenham_cached, dda_buffers, pattern_cache
+from nucleo import dda_algorithm
+from poligono import plot_polygon
+from raster import Framebuffer
+from relleno import polygon_runs
+from triangulo import fill_triangle, plot_triangle
+
+# Tamaños recorridos por defecto y en modo rápido
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+QUICK_SIZES = [10, 100, 1_000]
+
+
+# Cachés de formas y patrones: el cálculo se mide sin ellas (ver 'Case')
+CACHES = (shape_cache, span_cache, pattern_cache)
+
+
+class Case:
+    """
+    Un caso del banco: 'setup(n)' prepara los argumentos, 'compute(*args)'
+    ejecuta el algoritmo y, si existe, 'render(renderer, args, result)'
+    dibuja el resultado ya calculado.
+
+    El cálculo se mide con las cachés de formas y patrones desactivadas
+    ('bypass'), así que es el costo completo; con 'cached' se mide con las
+    cachés ya llenas (aciertos), como caso aparte. 'prepare()', si existe,
+    se llama una vez antes de medir (p. ej. para calibrar el autoajuste).
+    """
+    def __init__(self, name: str, setup: Callable, compute: Callable,
+                 render: Optional[Callable] = None, cached: bool = False,
+                 prepare: Optional[Callable] = None) -> None:
+        self.name = name
+        self.setup = setup
+        self.compute = compute
+        self.render = render
+        self.cached = cached
+        self.prepare = prepare
+
+
+def _line_args(n: int) -> tuple:
+    # Segmento en el primer octante con pendiente no entera
+    return (0, 0, n, (n * 3) // 7)
+
+
+def _circle_args(n: int) -> tuple:
+    return (0, 0, n)
+
+
+def _triangle_args(n: int) -> tuple:
+    return ([(0, 0), (n, n // 3), (n // 4, n)],)
+
+
+def _polygon_args(n: int) -> tuple:
+    # Estrella cóncava de 64 puntas con radio exterior n
+    k = 128
+    angles = np.arange(k) * (2 * np.pi / k)
+    radii = np.where(np.arange(k) % 2, n / 2, n)
+    return (np.column_stack([radii * np.cos(angles), radii * np.sin(angles)]),)
+
+
+def _fill_circle(xc: int, yc: int, r: int) -> Framebuffer:
+    fb = Framebuffer.for_bounds(xc - r, yc - r, xc + r, yc + r, margin=1)
+    fill_circle_raster(fb, xc, yc, r)
+    return fb
+
+
+def _render_line(renderer, args, result):
+    plot_line(renderer, result[1], result[0])
+
+
+def _render_circle(renderer, args, result):
+    plot_circle(renderer, result, *args, fill=False)
+
+
+def _render_fill_circle(renderer, args, result):
+    plot_circle(renderer, midpoint_circle_algorithm(*args), *args, fill=True)
+
+
+CASES = [
+    Case("dda_algorithm", _line_args, dda_algorithm, _render_line),
+    Case("dda_buffers", _line_args, dda_buffers, _render_line),
+    # Motor elegido por longitud (bucle de Python en trazos cortos); la
+    # calibración se hace antes de medir
+    Case("dda_auto", _line_args, dda_auto, _render_line, prepare=lambda: tuner.prepare("dda")),
+    Case("bresenham_buffers", _line_args, bresenham_buffers, _render_line),
+    # Trazo repetido: sale de la caché de patrones (aciertos, ver 'Case')
+    Case("bresenham_cached", _line_args, bresenham_cached, _render_line, cached=True),
+    Case("midpoint_circle_algorithm", _circle_args, midpoint_circle_algorithm, _render_circle),
+    Case("midpoint_circle_algorithm_cached", _circle_args, midpoint_circle_algorithm, _render_circle,
+         cached=True),
+    Case("midpoint_circle_auto", _circle_args, midpoint_circle_auto, _render_circle,
+         prepare=lambda: tuner.prepare("circle")),
+    Case("fill_circle", _circle_args, _fill_circle, _render_fill_circle),
+    Case("fill_circle_cached", _circle_args, _fill_circle, _render_fill_circle, cached=True),
+    Case("fill_triangle", _triangle_args, lambda tri: fill_triangle(None, tri, "DDA"),
+         lambda renderer, args, result: plot_triangle(renderer, args[0], "DDA")),
+    Case("fill_triangle_bresenham", _triangle_args, lambda tri: fill_triangle(None, tri, "Bresenham"),
+         lambda renderer, args, result: plot_triangle(renderer, args[0], "Bresenham")),
+    Case("fill_polygon", _polygon_args, polygon_runs,
+         lambda renderer, args, result: plot_polygon(renderer, args[0], spans=result)),
+]
+
+
+def _time(fn: Callable, repeat: int) -> Tuple[float, object]:
+    """
+    Mediana de 'repeat' ejecuciones de 'fn()' (en segundos) y su último resultado.
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def _peak_memory(fn: Callable) -> int:
+    """
+    Pico de memoria (bytes) asignada durante una ejecución de 'fn()'.
+    NumPy informa sus reservas a tracemalloc, así que se cuentan los arreglos.
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _make_renderer():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from renderizador import PlotRenderer
+    return PlotRenderer(None, "benchmark", canvas_factory=FigureCanvasAgg)
+
+
+def run(cases: List[Case], sizes: List[int], repeat: int = 3,
+        render: bool = True, log=sys.stderr) -> List[Dict]:
+    """
+    Ejecuta los casos para cada tamaño y devuelve una fila por (caso, tamaño).
+
+    Args:
+        cases (List[Case]): Casos a medir.
+        sizes (List[int]): Longitudes, radios o lados recorridos.
+        repeat (int, optional): Repeticiones por medida (se toma la mediana).
+        render (bool, optional): Si es False no se mide el dibujo.
+        log: Flujo donde se informa el progreso (None para silenciar).
+
+    Returns:
+        List[Dict]: Filas con 'case', 'size', 'compute_s', 'render_s' y 'peak_bytes'.
+    """
+    renderer = _make_renderer() if render else None
+    rows = []
+    try:
+        for case in cases:
+            if case.prepare is not None:
+                case.prepare()
+            for n in sizes:
+                args = case.setup(n)
+                with ExitStack() as stack:
+                    if not case.cached:
+                        for cache in CACHES:
+                            stack.enter_context(cache.bypass())
+                    else:
+                        case.compute(*args)  # Llena las cachés antes de medir
+                    compute_s, result = _time(lambda: case.compute(*args), repeat)
+                    peak = _peak_memory(lambda: case.compute(*args))
+                render_s = None
+                if renderer is not None and case.render is not None:
+                    render_s, _ = _time(lambda: case.render(renderer, args, result), repeat)
+                row = {"case": case.name, "size": n, "compute_s": compute_s,
+                       "render_s": render_s, "peak_bytes": peak}
+                rows.append(row)
+                if log is not None:
+                    render_txt = "-" if render_s is None else f"{render_s * 1e3:9.2f} ms"
+                    print(f"{case.name:32s} {n:>8d}  cálculo {compute_s * 1e3:9.2f} ms  "
+                          f"dibujo {render_txt:>12s}  memoria {peak / 1024:10.1f} KiB", file=log)
+    finally:
+        if renderer is not None:
+            renderer.close()
+    return rows
+
+
+def metadata() -> Dict:
+    """
+    Datos del entorno guardados junto a los resultados.
+    """
+    import matplotlib
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def compare(current: List[Dict], baseline: List[Dict], threshold: float = 0.2) -> List[Dict]:
+    """
+    Compara los resultados con una línea base y devuelve las regresiones.
+
+    Un caso es una regresión si su tiempo de cálculo o de dibujo supera al de
+    la base en más de 'threshold' (0.2 = 20 % más lento), o si su pico de
+    memoria lo supera en la misma proporción. Los casos sin pareja en la
+    base se ignoran.
+
+    Returns:
+        List[Dict]: Una fila por métrica empeorada con 'case', 'size',
+        'metric', 'baseline', 'current' y 'ratio'.
+    """
+    base = {(row["case"], row["size"]): row for row in baseline}
+    regressions = []
+    for row in current:
+        old = base.get((row["case"], row["size"]))
+        if old is None:
+            continue
+        for metric in ("compute_s", "render_s", "peak_bytes"):
+            before, after = old.get(metric), row.get(metric)
+            if not before or after is None:
+                continue
+            ratio = after / before
+            if ratio > 1 + threshold:
+                regressions.append({"case": row["case"], "size": row["size"], "metric": metric,
+                                    "baseline": before, "current": after, "ratio": ratio})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Banco de rendimiento de los algoritmos de rasterizado.")
+    parser.add_argument("--output", "-o", default="benchmark.json", help="Archivo JSON de resultados.")
+    parser.add_argument("--compare", metavar="BASE", help="JSON de línea base con el que comparar.")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Empeoramiento relativo tolerado antes de marcar regresión (0.2 = 20 %%).")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medida (mediana).")
+    parser.add_argument("--sizes", type=int, nargs="+", help="Tamaños a recorrer.")
+    parser.add_argument("--quick", action="store_true", help="Solo tamaños pequeños.")
+    parser.add_argument("--case", action="append", dest="cases", help="Limita a los casos con este nombre.")
+    parser.add_argument("--no-render", action="store_true", help="No mide el dibujo.")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    cases = [c for c in CASES if not args.cases or c.name in args.cases]
+    rows = run(cases, sizes, args.repeat, render=not args.no_render)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": metadata(), "results": rows}, f, indent=2)
+    print(f"Resultados guardados en {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(rows, baseline, args.threshold)
+        for reg in regressions:
+            print(f"REGRESIÓN {reg['case']} (tamaño {reg['size']}) {reg['metric']}: "
+                  f"{reg['baseline']:.6g} -> {reg['current']:.6g} (x{reg['ratio']:.2f})", file=sys.stderr)
+        if regressions:
+            return 1
+        print("Sin regresiones frente a la línea base.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
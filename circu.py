@@ -1,12 +1,18 @@
-import math
 import tkinter as tk
-from tkinter import messagebox, ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from typing import List, Tuple, Set
-
-
-def midpoint_circle_algorithm(xc: int, yc: int, r: int) -> List[Tuple[int, int]]:
+from tkinter import messagebox
+from typing import Optional
+from motor_circulos import circle_fill_runs, circle_progressive, midpoint_circle_cached
+from puntos import PointBuffer
+from raster import Framebuffer
+from recorte import Viewport
+from renderizador import PlotRenderer
+from tabla_virtual import VirtualTable
+from trabajos import JobRunner
+from tramos import SpanSet
+from trazas import tracer
+
+
+def midpoint_circle_algorithm(xc: int, yc: int, r: int, viewport: Optional[Viewport] = None) -> PointBuffer:
     """
     Calcula los puntos de una circunferencia utilizando el algoritmo del punto medio.
 
@@ -24,103 +30,117 @@ def midpoint_circle_algorithm(xc: int, yc: int, r: int) -> List[Tuple[int, int]]
         xc (int): Coordenada X del centro.
         yc (int): Coordenada Y del centro.
         r (int): Radio del círculo.
+        viewport (Viewport, optional): Si se indica, solo se generan los
+            puntos visibles en él.
 
     Returns:
-        List[Tuple[int, int]]: Lista de puntos (x, y) de la circunferencia.
+        PointBuffer: Puntos (x, y) de la circunferencia en un arreglo compacto,
+        sin repetidos y en orden angular (sentido horario desde (xc, yc + r)).
     """
-    x = 0
-    y = r
-    p = 1 - r  # Valor de decisión inicial
-    points: Set[Tuple[int, int]] = set()
-
-    while x <= y:
-        # Agrega los 8 puntos de simetría
-        points.update({
-            (xc + x, yc + y),
-            (xc - x, yc + y),
-            (xc + x, yc - y),
-            (xc - x, yc - y),
-            (xc + y, yc + x),
-            (xc - y, yc + x),
-            (xc + y, yc - x),
-            (xc - y, yc - x)
-        })
-        if p < 0:
-            p += 2 * x + 3
-        else:
-            p += 2 * x - 2 * y + 5
-            y -= 1
-        x += 1
-
-    return sorted(list(points), key=lambda pt: (pt[0], pt[1]))
-
-
-def fill_circle(ax: plt.Axes, xc: int, yc: int, r: int, color: str = 'orange') -> None:
+    # La forma depende solo del radio: se toma de la caché y se traslada al centro
+    return PointBuffer(midpoint_circle_cached(xc, yc, r, viewport))
+
+
+def fill_circle(renderer: PlotRenderer, xc: int, yc: int, r: int, color: str = 'orange',
+                viewport: Optional[Viewport] = None) -> SpanSet:
     """
     Rellena el círculo utilizando la técnica de 'scanline'.
 
     Para cada valor de y entre (yc - r) y (yc + r), se calcula la extensión horizontal
     (x_start, x_end) mediante la ecuación del círculo:
         dx = sqrt(r² - (y - yc)²)
-    y se dibuja una línea horizontal entre (xc - dx) y (xc + dx).
+    Todas las filas se obtienen a la vez como un SpanSet (tramos RLE
+    fila, inicio, largo), memorizados por radio, y se dibujan como una única LineCollection
+    que el renderizador reutiliza entre ejecuciones.
 
     Args:
-        ax (plt.Axes): Objeto de ejes de matplotlib.
+        renderer (PlotRenderer): Renderizador persistente de la ventana.
         xc (int): Coordenada X del centro.
         yc (int): Coordenada Y del centro.
         r (int): Radio del círculo.
         color (str, optional): Color del relleno. Por defecto es 'orange'.
+        viewport (Viewport, optional): Si se indica, solo se calculan las
+            filas visibles, recortadas a sus bordes.
+
+    Returns:
+        SpanSet: Los tramos del relleno.
     """
-    for y in range(yc - r, yc + r + 1):
-        try:
-            dx = int(round(math.sqrt(r * r - (y - yc) ** 2)))
-        except ValueError:
-            continue
-        x_start = xc - dx
-        x_end = xc + dx
-        ax.hlines(y, x_start, x_end, colors=color, linewidth=1)
+    runs = circle_fill_runs(xc, yc, r, viewport)
+    renderer.hlines('fill', runs.rows, runs.starts, runs.ends, colors=color, linewidth=1)
+    return runs
 
 
-def plot_circle(canvas: tk.Frame, points: List[Tuple[int, int]], xc: int, yc: int, r: int, fill: bool) -> None:
+def fill_circle_raster(fb: Framebuffer, xc: int, yc: int, r: int, color: str = 'orange',
+                       viewport: Optional[Viewport] = None) -> SpanSet:
     """
-    Grafica la circunferencia (y opcionalmente su relleno) en un canvas de Tkinter.
+    Rellena el círculo directamente en un framebuffer.
+
+    Usa los mismos tramos que 'fill_circle', pintados como rebanadas
+    horizontales del lienzo.
 
     Args:
-        canvas (tk.Frame): Frame de Tkinter donde se mostrará la gráfica.
-        points (List[Tuple[int, int]]): Puntos calculados de la circunferencia.
+        fb (Framebuffer): Lienzo donde se pinta el relleno.
         xc (int): Coordenada X del centro.
         yc (int): Coordenada Y del centro.
         r (int): Radio del círculo.
-        fill (bool): Indica si se debe rellenar el círculo.
+        color (str, optional): Color del relleno. Por defecto es 'orange'.
+        viewport (Viewport, optional): Recorte de los tramos, como en 'fill_circle'.
+
+    Returns:
+        SpanSet: Los tramos pintados.
     """
-    fig, ax = plt.subplots(figsize=(6, 6))
-    # Extrae las coordenadas para graficar
-    x_vals = [pt[0] for pt in points]
-    y_vals = [pt[1] for pt in points]
-    ax.scatter(x_vals, y_vals, color='blue', label='Circunferencia', s=10)
-    # Marca el centro
-    ax.scatter([xc], [yc], color='green', s=100, marker='x', label='Centro')
+    runs = circle_fill_runs(xc, yc, r, viewport)
+    runs.blit(fb, color)
+    return runs
 
+
+def plot_circle(renderer: PlotRenderer, points: PointBuffer, xc: int, yc: int, r: int, fill: bool,
+                overlay: bool = False, viewport: Optional[Viewport] = None) -> None:
+    """
+    Grafica la circunferencia (y opcionalmente su relleno) con el renderizador de la ventana.
+
+    Los píxeles se pintan en un framebuffer NumPy que se muestra como una sola
+    imagen, en lugar de un artista de matplotlib por punto o por fila. La
+    figura y los artistas se reutilizan entre ejecuciones.
+
+    Args:
+        renderer (PlotRenderer): Renderizador persistente de la ventana.
+        points (PointBuffer): Puntos calculados de la circunferencia.
+        xc (int): Coordenada X del centro.
+        yc (int): Coordenada Y del centro.
+        r (int): Radio del círculo.
+        fill (bool): Indica si se debe rellenar el círculo.
+        overlay (bool, optional): Si es True, dibuja además los puntos y el
+            relleno como artistas de matplotlib sobre la imagen.
+        viewport (Viewport, optional): Si se indica, los puntos ya vienen
+            recortados y el lienzo, el relleno y los ejes se limitan a esa vista.
+    """
+    renderer.begin()
+    if viewport is None:
+        fb = Framebuffer.for_bounds(xc - r, yc - r, xc + r, yc + r, margin=1)
+    else:
+        fb = Framebuffer.for_bounds(viewport.x_min, viewport.y_min, viewport.x_max, viewport.y_max)
     if fill:
-        fill_circle(ax, xc, yc, r)
+        fill_circle_raster(fb, xc, yc, r, viewport=viewport)
+    fb.plot_points(points, 'blue')
+    renderer.image('raster', fb)
+
+    if overlay:
+        # Columnas x e y del buffer (vistas, sin copiar), con nivel de detalle
+        renderer.lod_points('circle', points.x, points.y, color='blue', label='Circunferencia', s=10)
+        if fill:
+            fill_circle(renderer, xc, yc, r, viewport=viewport)
+    # Marca el centro
+    renderer.points('center', [xc], [yc], color='green', s=100, marker='x', label='Centro')
 
-    ax.set_title("Círculo generado (Algoritmo de Punto Medio)")
-    ax.set_xlabel("Eje X")
-    ax.set_ylabel("Eje Y")
-    ax.grid(True)
-    ax.set_aspect('equal', adjustable='box')
+    if viewport is not None:
+        renderer.finish((viewport.x_min - 0.5, viewport.x_max + 0.5),
+                        (viewport.y_min - 0.5, viewport.y_max + 0.5))
+        return
 
     margin = r * 0.2 if r > 0 else 10
-    ax.set_xlim(xc - r - margin, xc + r + margin)
-    ax.set_ylim(yc - r - margin, yc + r + margin)
-    ax.legend()
-
-    # Limpia el canvas y muestra la nueva gráfica
-    for widget in canvas.winfo_children():
-        widget.destroy()
-    canvas_plot = FigureCanvasTkAgg(fig, master=canvas)
-    canvas_plot.draw()
-    canvas_plot.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    renderer.finish((xc - r - margin, xc + r + margin),
+                    (yc - r - margin, yc + r + margin))
 
 
 def is_valid_int(value: str) -> bool:
@@ -155,11 +175,19 @@ class CircleApp:
         self.root.resizable(False, False)
         self.root.configure(bg="#f0f0f0")
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def create_widgets(self) -> None:
         """
         Crea y organiza los widgets de la interfaz.
         """
+        # Barra de estado con el desglose de tiempos (solo con RASTER_TRACE activo)
+        if tracer.enabled:
+            self.status_var = tk.StringVar()
+            tk.Label(self.root, textvariable=self.status_var, anchor="w", relief=tk.SUNKEN,
+                     font=("Arial", 9)).pack(side=tk.BOTTOM, fill=tk.X)
+            tracer.on_run = self.status_var.set
+
         # Panel izquierdo: Controles, tabla y explicación
         self.frame_left = tk.Frame(self.root, bg="#f0f0f0")
         self.frame_left.pack(side=tk.LEFT, padx=20, pady=20, fill=tk.Y)
@@ -192,18 +220,34 @@ class CircleApp:
         self.fill_check = tk.Checkbutton(self.frame_left, text="Rellenar Círculo", variable=self.fill_var, font=("Arial", 12), bg="#f0f0f0")
         self.fill_check.pack(pady=10)
 
+        # Checkbox para superponer los artistas de matplotlib sobre la imagen
+        self.overlay_var = tk.BooleanVar()
+        self.overlay_check = tk.Checkbutton(self.frame_left, text="Superponer puntos (matplotlib)", variable=self.overlay_var, font=("Arial", 12), bg="#f0f0f0")
+        self.overlay_check.pack(pady=5)
+
+        # Recorte: el siguiente círculo se calcula solo dentro de la vista actual
+        self.clip_var = tk.BooleanVar()
+        self.clip_check = tk.Checkbutton(self.frame_left, text="Recortar a la vista actual", variable=self.clip_var, font=("Arial", 12), bg="#f0f0f0")
+        self.clip_check.pack(pady=5)
+
+        # Cálculo en segundo plano (hilo trabajador, resultados por root.after)
+        self.runner = JobRunner(self.root)
+
         # Botones
         tk.Button(self.frame_left, text="Generar Círculo", command=self.run_circle, font=("Arial", 12), bg="#4CAF50", fg="white").pack(pady=5)
+        tk.Button(self.frame_left, text="Cancelar", command=self.runner.cancel, font=("Arial", 12), bg="#ff9800", fg="white").pack(pady=5)
         tk.Button(self.frame_left, text="Limpiar", command=self.clear_entries, font=("Arial", 12), bg="#f44336", fg="white").pack(pady=5)
 
         # Tabla explicativa de puntos (usando Treeview)
         tk.Label(self.frame_left, text="Tabla de Puntos y Explicación", font=("Arial", 14, "bold"), bg="#f0f0f0").pack(pady=10)
-        self.tree = ttk.Treeview(self.frame_left, columns=("punto", "descripcion"), show="headings", height=8)
+        # Tabla virtual: solo se crean y formatean las filas visibles
+        self.table = VirtualTable(self.frame_left, columns=("punto", "descripcion"), height=8, bg="#f0f0f0")
+        self.tree = self.table.tree
         self.tree.heading("punto", text="Punto")
         self.tree.heading("descripcion", text="Descripción")
         self.tree.column("punto", width=100, anchor="center")
         self.tree.column("descripcion", width=250, anchor="w")
-        self.tree.pack(pady=5)
+        self.table.pack(pady=5)
 
         # Área de explicación del algoritmo con fórmulas
         formulas_text = (
@@ -219,11 +263,13 @@ class CircleApp:
         # Canvas para la gráfica en el panel derecho
         self.graph_canvas = tk.Frame(self.frame_right, bg="#ffffff")
         self.graph_canvas.pack(expand=True, fill=tk.BOTH)
+        self.renderer = PlotRenderer(self.graph_canvas, "Círculo generado (Algoritmo de Punto Medio)")
         tk.Label(self.frame_right, text="Plano de Coordenadas", font=("Arial", 16, "bold"), bg="#ffffff").pack(pady=10)
 
     def run_circle(self) -> None:
         """
-        Valida las entradas, calcula la circunferencia, actualiza la gráfica y la tabla explicativa.
+        Valida las entradas y lanza el cálculo de la circunferencia en segundo
+        plano; la gráfica y la tabla se actualizan con los resultados parciales.
         """
         xc_val = self.entry_xc.get().strip()
         yc_val = self.entry_yc.get().strip()
@@ -240,31 +286,57 @@ class CircleApp:
             messagebox.showerror("Error", "El radio debe ser un número positivo.")
             return
 
-        points = midpoint_circle_algorithm(xc, yc, r)
+        viewport = self.renderer.view() if self.clip_var.get() else None
         fill_option = self.fill_var.get()
+        overlay = self.overlay_var.get()
+        self.runner.submit(
+            lambda: circle_progressive(xc, yc, r, viewport),
+            on_progress=lambda points: self.show_circle(points, xc, yc, r, fill_option, overlay, viewport),
+            on_done=lambda points: self.finish_circle(points, xc, yc, r, fill_option, overlay, viewport),
+            on_error=lambda exc: messagebox.showerror("Error", str(exc)))
+
+    def finish_circle(self, points: PointBuffer, xc: int, yc: int, r: int, fill: bool,
+                      overlay: bool, viewport: Optional[Viewport]) -> None:
+        """
+        Muestra el resultado final dentro de una ejecución instrumentada, con
+        el tiempo de cálculo del hilo trabajador como etapa 'algoritmo'.
+        """
+        job = self.runner.job
+        with tracer.run("circulo"):
+            tracer.record("algoritmo", job.started, job.finished)
+            self.show_circle(points, xc, yc, r, fill, overlay, viewport)
 
-        # Actualiza la tabla de puntos y explicación
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        for pt in points:
-            punto_str = f"({pt[0]}, {pt[1]})"
-            descripcion = "Calculado por simetría (Punto Medio)"
-            self.tree.insert("", tk.END, values=(punto_str, descripcion))
+    def show_circle(self, points: PointBuffer, xc: int, yc: int, r: int, fill: bool,
+                    overlay: bool, viewport: Optional[Viewport]) -> None:
+        """
+        Muestra un resultado (parcial o final) en la tabla y en la gráfica.
+        """
+        # Actualiza la tabla de puntos y explicación (formateada bajo demanda)
+        descripcion = "Calculado por simetría (Punto Medio)"
+        with tracer.span("tabla"):
+            self.table.set_source(len(points), lambda i: (f"({points[i][0]}, {points[i][1]})", descripcion))
 
         # Grafica el círculo
-        plot_circle(self.graph_canvas, points, xc, yc, r, fill_option)
+        plot_circle(self.renderer, points, xc, yc, r, fill, overlay, viewport)
 
     def clear_entries(self) -> None:
         """
-        Limpia las entradas, la tabla y la gráfica.
+        Limpia las entradas, la tabla y la gráfica (y cancela un cálculo en curso).
         """
+        self.runner.cancel()
         self.entry_xc.delete(0, tk.END)
         self.entry_yc.delete(0, tk.END)
         self.entry_r.delete(0, tk.END)
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        for widget in self.graph_canvas.winfo_children():
-            widget.destroy()
+        self.table.clear()
+        self.renderer.clear()
+
+    def on_close(self) -> None:
+        """
+        Cancela el cálculo en curso, libera los hilos y la figura y cierra la ventana.
+        """
+        self.runner.shutdown()
+        self.renderer.close()
+        self.root.destroy()
 
 
 if __name__ == "__main__":
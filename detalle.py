@@ -0,0 +1,61 @@
+import numpy as np
+from typing import Sequence, Tuple
+
+# Tamaño de celda en píxeles de pantalla: un marcador por celda de puntos y
+# una etiqueta por celda de etiquetas (aprox. el tamaño de un texto "(x,y)")
+POINT_CELL_PX = 3.0
+LABEL_CELL_PX = (70.0, 16.0)
+
+
+def extreme_indices(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """
+    Índices que siempre se conservan: primer y último punto y los extremos
+    (mínimo y máximo) en x y en y.
+    """
+    if len(xs) == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.array([0, len(xs) - 1, np.argmin(xs), np.argmax(xs), np.argmin(ys), np.argmax(ys)],
+                    dtype=np.int64)
+
+
+def decimate(xs, ys, xlim: Tuple[float, float], ylim: Tuple[float, float],
+             size_px: Tuple[float, float], cell_px=POINT_CELL_PX,
+             keep: Sequence[int] = ()) -> np.ndarray:
+    """
+    Elige qué puntos dibujar según la resolución de pantalla.
+
+    La vista (xlim, ylim) se divide en celdas de 'cell_px' píxeles del
+    widget ('size_px' = ancho, alto) y de cada celda ocupada se conserva el
+    primer punto; los puntos fuera de la vista se descartan. Siempre se
+    conservan el inicio, el fin, los extremos en x e y y los índices 'keep'.
+    El costo es O(n) con NumPy y el resultado tiene a lo sumo un punto por
+    celda visible (más los conservados), sin importar n.
+
+    Args:
+        xs, ys: Coordenadas de los puntos (mismo largo n).
+        xlim (Tuple[float, float]): Límites x de la vista.
+        ylim (Tuple[float, float]): Límites y de la vista.
+        size_px (Tuple[float, float]): Tamaño de los ejes en píxeles.
+        cell_px (float o Tuple[float, float], optional): Tamaño de celda.
+        keep (Sequence[int], optional): Índices que se conservan siempre.
+
+    Returns:
+        np.ndarray: Índices (ordenados, sin repetidos) de los puntos a dibujar.
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    cell_w, cell_h = cell_px if np.ndim(cell_px) else (cell_px, cell_px)
+    cols = max(1, int(size_px[0] / cell_w))
+    rows = max(1, int(size_px[1] / cell_h))
+    if len(xs) <= 2:
+        return np.arange(len(xs))
+
+    x0, x1 = sorted(xlim)
+    y0, y1 = sorted(ylim)
+    inside = np.flatnonzero((xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1))
+    cx = np.minimum(((xs[inside] - x0) * (cols / max(x1 - x0, 1e-300))).astype(np.int64), cols - 1)
+    cy = np.minimum(((ys[inside] - y0) * (rows / max(y1 - y0, 1e-300))).astype(np.int64), rows - 1)
+    _, first = np.unique(cy * cols + cx, return_index=True)
+
+    kept = np.concatenate([inside[first], extreme_indices(xs, ys), np.asarray(keep, dtype=np.int64)])
+    return np.unique(kept)
@@ -0,0 +1,348 @@
+"""
+Exportación de puntos y lienzos a disco, sin ventana.
+
+Los conjuntos de puntos se escriben como .npy (directamente desde el
+arreglo compacto, sin copiarlo) o como CSV por bloques; los lienzos
+(Framebuffer o TiledCanvas) como PBM, PGM o PNG, fila a fila por bloques.
+El texto CSV se arma con NumPy para todo el bloque a la vez, sin crear una
+cadena de Python por punto. También se puede usar desde la línea de órdenes:
+
+    python exportar.py linea 0 0 1000000 300000 -o linea.npy
+    python exportar.py linea 0 0 5000 1200 --engine Bresenham -o linea.csv
+    python exportar.py circulo 0 0 2000 --fill -o circulo.png
+    python exportar.py circulo 0 0 2000 --fill -o circulo.csv   # y circulo_relleno.csv
+    python exportar.py poligono 0,0 400,0 400,300 200,100 0,300 -o poligono.pgm
+"""
+import argparse
+import os
+import struct
+import sys
+import zlib
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from motor_circulos import circle_chunks, circle_fill_runs, circle_total
+from motor_lineas import bresenham_chunks, dda_chunks
+from nucleo import CHUNK_SIZE
+from puntos import PointBuffer
+from raster import Framebuffer
+from relleno import polygon_runs
+from tramos import SpanSet
+
+# Filas de píxeles por bloque al escribir un lienzo
+ROW_CHUNK = 256
+
+_POWERS = 10 ** np.arange(1, 19, dtype=np.uint64)
+
+
+# ---------- Puntos ----------
+
+def _as_array(points) -> np.ndarray:
+    if isinstance(points, PointBuffer):
+        return points.data
+    if isinstance(points, SpanSet):
+        return points.to_array()
+    return np.asarray(points)
+
+
+def _chunks(points, chunk_size: int) -> Iterator[np.ndarray]:
+    """
+    Bloques de un arreglo (o PointBuffer / SpanSet) o de un iterable de bloques.
+    """
+    if isinstance(points, (np.ndarray, PointBuffer, SpanSet)):
+        data = _as_array(points)
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+    else:
+        for chunk in points:
+            yield np.asarray(chunk)
+
+
+def save_npy(path: str, points, count: Optional[int] = None) -> int:
+    """
+    Escribe puntos (o cualquier arreglo) en formato .npy.
+
+    Un arreglo o PointBuffer contiguo se escribe desde su propia memoria,
+    sin copia. Un iterable de bloques se vuelca a un .npy mapeado en
+    memoria de 'count' filas, bloque a bloque, sin reunirlo en RAM.
+
+    Returns:
+        int: Número de filas escritas.
+    """
+    if isinstance(points, (np.ndarray, PointBuffer, SpanSet)):
+        data = _as_array(points)
+        np.save(path, data)
+        return len(data)
+    if count is None:
+        raise ValueError("Para escribir bloques en .npy hace falta 'count'.")
+    out = None
+    n = 0
+    for chunk in points:
+        chunk = np.asarray(chunk)
+        if out is None:
+            out = np.lib.format.open_memmap(path, mode="w+", dtype=chunk.dtype,
+                                            shape=(count,) + chunk.shape[1:])
+        out[n:n + len(chunk)] = chunk
+        n += len(chunk)
+    if out is None:
+        raise ValueError("No hay bloques que escribir.")
+    out.flush()
+    return n
+
+
+def _digits(values: np.ndarray, decimals: int) -> tuple:
+    """
+    Caracteres (alineados a la derecha) de una columna de números como
+    matriz (n, ancho) uint8, y la máscara de los caracteres válidos.
+    """
+    if decimals:
+        scaled = np.rint(np.asarray(values, dtype=np.float64) * 10.0 ** decimals)
+        if len(scaled) and np.abs(scaled).max() >= 2.0 ** 62:
+            raise OverflowError("Valores demasiado grandes para el formato de punto fijo.")
+        scaled = scaled.astype(np.int64)
+    else:
+        scaled = np.asarray(values, dtype=np.int64)
+    negative = scaled < 0
+    magnitude = np.abs(scaled).astype(np.uint64)
+    count = np.searchsorted(_POWERS, magnitude, side="right") + 1
+    count = np.maximum(count, decimals + 1)
+    length = count + (decimals > 0) + negative
+    width = int(length.max()) if len(length) else 1
+
+    chars = np.empty((len(scaled), width), dtype=np.uint8)
+    rest = magnitude.copy()
+    for pos in range(width):
+        col = width - 1 - pos
+        if decimals and pos == decimals:
+            chars[:, col] = ord(".")
+            continue
+        chars[:, col] = ord("0") + (rest % 10).astype(np.uint8)
+        rest //= 10
+    first = width - length
+    chars[np.flatnonzero(negative), first[negative]] = ord("-")
+    mask = np.arange(width)[None, :] >= first[:, None]
+    return chars, mask
+
+
+def format_csv(columns: Sequence[np.ndarray], decimals: Sequence[int]) -> bytes:
+    """
+    Texto CSV (una fila por elemento, columnas separadas por comas) armado
+    con NumPy para todo el bloque: los dígitos de cada columna se calculan
+    de forma vectorizada y se concatenan en una sola matriz de bytes.
+    Los enteros se escriben tal cual y los reales con 'decimals' cifras.
+    """
+    n = len(columns[0])
+    parts = []
+    masks = []
+    for i, (values, dec) in enumerate(zip(columns, decimals)):
+        chars, mask = _digits(values, dec)
+        parts.append(chars)
+        masks.append(mask)
+        sep = np.full((n, 1), ord(",") if i < len(columns) - 1 else ord("\n"), dtype=np.uint8)
+        parts.append(sep)
+        masks.append(np.ones((n, 1), dtype=bool))
+    return np.hstack(parts)[np.hstack(masks)].tobytes()
+
+
+def write_csv(path: Union[str, BinaryIO], points, header: Optional[Sequence[str]] = ("x", "y"),
+              decimals: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Escribe puntos (o tramos) en CSV por bloques de 'chunk_size' filas.
+
+    'points' puede ser un arreglo (n, k), un PointBuffer, un SpanSet o un
+    iterable de bloques (por ejemplo, un generador de 'dda_chunks'), así
+    que la memoria no depende del total. Los enteros se escriben exactos;
+    los reales con 'decimals' cifras (6 por defecto).
+
+    Returns:
+        int: Número de filas escritas.
+    """
+    own = isinstance(path, str)
+    f = open(path, "wb") if own else path
+    try:
+        if header:
+            f.write((",".join(header) + "\n").encode())
+        n = 0
+        for chunk in _chunks(points, chunk_size):
+            chunk = chunk.reshape(len(chunk), -1)
+            dec = 0 if np.issubdtype(chunk.dtype, np.integer) else (6 if decimals is None else decimals)
+            f.write(format_csv(chunk.T, [dec] * chunk.shape[1]))
+            n += len(chunk)
+        return n
+    finally:
+        if own:
+            f.close()
+
+
+# ---------- Lienzos ----------
+
+def _row_blocks(raster, chunk_rows: int) -> Iterator[np.ndarray]:
+    # Filas del lienzo de arriba abajo, en bloques (k, ancho, 4) uint8
+    for start in range(0, raster.height, chunk_rows):
+        yield raster.row_block(start, min(start + chunk_rows, raster.height))
+
+
+def _gray(block: np.ndarray) -> np.ndarray:
+    # Luminancia del color compuesto sobre fondo blanco
+    rgb = block[..., :3].astype(np.uint32)
+    alpha = block[..., 3].astype(np.uint32)
+    lum = (299 * rgb[..., 0] + 587 * rgb[..., 1] + 114 * rgb[..., 2]) // 1000
+    return ((lum * alpha + 255 * (255 - alpha)) // 255).astype(np.uint8)
+
+
+def write_pbm(path: str, raster, chunk_rows: int = ROW_CHUNK) -> None:
+    """
+    PBM binario (P4): negro donde hay algo pintado (alfa > 0), blanco en el resto.
+    """
+    with open(path, "wb") as f:
+        f.write(b"P4\n%d %d\n" % (raster.width, raster.height))
+        for block in _row_blocks(raster, chunk_rows):
+            f.write(np.packbits(block[..., 3] > 0, axis=1).tobytes())
+
+
+def write_pgm(path: str, raster, chunk_rows: int = ROW_CHUNK) -> None:
+    """
+    PGM binario (P5) de 8 bits: el lienzo en escala de grises sobre fondo blanco.
+    """
+    with open(path, "wb") as f:
+        f.write(b"P5\n%d %d\n255\n" % (raster.width, raster.height))
+        for block in _row_blocks(raster, chunk_rows):
+            f.write(_gray(block).tobytes())
+
+
+def _png_chunk(f: BinaryIO, kind: bytes, data: bytes) -> None:
+    f.write(struct.pack(">I", len(data)))
+    f.write(kind)
+    f.write(data)
+    f.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+
+def write_png(path: str, raster, chunk_rows: int = ROW_CHUNK, level: int = 6) -> None:
+    """
+    PNG RGBA de 8 bits escrito por bloques de filas: cada bloque se
+    comprime con el mismo compresor zlib incremental y se emite como uno o
+    más fragmentos IDAT, así que nunca se arma la imagen completa en memoria.
+    """
+    compressor = zlib.compressobj(level)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        _png_chunk(f, b"IHDR", struct.pack(">IIBBBBB", raster.width, raster.height, 8, 6, 0, 0, 0))
+        for block in _row_blocks(raster, chunk_rows):
+            # Cada fila lleva delante su tipo de filtro (0 = ninguno)
+            rows = np.zeros((len(block), 1 + raster.width * 4), dtype=np.uint8)
+            rows[:, 1:] = block.reshape(len(block), -1)
+            data = compressor.compress(rows.tobytes())
+            if data:
+                _png_chunk(f, b"IDAT", data)
+        _png_chunk(f, b"IDAT", compressor.flush())
+        _png_chunk(f, b"IEND", b"")
+
+
+RASTER_WRITERS = {
+    ".pbm": write_pbm,
+    ".pgm": write_pgm,
+    ".png": write_png,
+}
+
+
+def export(path: str, data, count: Optional[int] = None) -> None:
+    """
+    Exporta según la extensión de 'path': .npy o .csv para puntos y tramos,
+    .pbm, .pgm o .png para lienzos.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        save_npy(path, data, count)
+    elif ext == ".csv":
+        header = ("y", "x_start", "x_end") if isinstance(data, SpanSet) else ("x", "y")
+        write_csv(path, data, header)
+    elif ext in RASTER_WRITERS:
+        RASTER_WRITERS[ext](path, data)
+    else:
+        raise ValueError(f"Formato de exportación desconocido: {ext}")
+
+
+# ---------- Línea de órdenes ----------
+
+def _parse_vertex(text: str) -> tuple:
+    x, y = text.split(",")
+    return float(x), float(y)
+
+
+def _shape(args) -> tuple:
+    """
+    Genera la figura pedida: (bloques de puntos, total, tramos de relleno, caja).
+    """
+    if args.shape == "linea":
+        x1, y1, x2, y2 = args.coords
+        total = max(abs(x2 - x1), abs(y2 - y1)) + 1
+        if args.engine == "Bresenham":
+            chunks = bresenham_chunks(x1, y1, x2, y2)
+        else:
+            column = 1 if args.float else 0
+            chunks = (pair[column] for pair in dda_chunks(x1, y1, x2, y2))
+        return chunks, total, None, (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+    if args.shape == "circulo":
+        xc, yc, r = args.coords
+        runs = circle_fill_runs(xc, yc, r) if args.fill else None
+        return circle_chunks(xc, yc, r), circle_total(r), runs, (xc - r, yc - r, xc + r, yc + r)
+    vertices = np.array([_parse_vertex(v) for v in args.vertices])
+    x_min, y_min = np.floor(vertices.min(axis=0)).astype(int).tolist()
+    x_max, y_max = np.ceil(vertices.max(axis=0)).astype(int).tolist()
+    return None, 0, polygon_runs(vertices), (x_min, y_min, x_max, y_max)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # Opciones comunes, aceptadas después de la figura (como en los ejemplos)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--output", "-o", required=True,
+                        help="Archivo de salida (.npy, .csv, .pbm, .pgm o .png).")
+    common.add_argument("--max-side", type=int, default=4096,
+                        help="Lado máximo en píxeles de la imagen (escala mayor si no cabe).")
+    parser = argparse.ArgumentParser(description="Exporta puntos, tramos o imágenes de una figura.")
+    sub = parser.add_subparsers(dest="shape", required=True)
+    line = sub.add_parser("linea", parents=[common], help="Segmento (x1 y1 x2 y2).")
+    line.add_argument("coords", type=int, nargs=4)
+    line.add_argument("--engine", choices=("DDA", "Bresenham"), default="DDA")
+    line.add_argument("--float", action="store_true", help="Exporta los puntos flotantes de DDA.")
+    circle = sub.add_parser("circulo", parents=[common], help="Circunferencia (xc yc r).")
+    circle.add_argument("coords", type=int, nargs=3)
+    circle.add_argument("--fill", action="store_true", help="Exporta o pinta también el relleno.")
+    circle.add_argument("--fill-output", metavar="RUTA",
+                        help="Archivo de los tramos del relleno con salida .npy o .csv "
+                             "(por defecto, <salida>_relleno con la misma extensión).")
+    polygon = sub.add_parser("poligono", parents=[common], help="Relleno de un polígono (vértices x,y).")
+    polygon.add_argument("vertices", nargs="+")
+    args = parser.parse_args(argv)
+    if args.shape == "circulo" and args.coords[2] < 0:
+        parser.error("El radio debe ser un número positivo.")
+
+    chunks, total, runs, box = _shape(args)
+    ext = os.path.splitext(args.output)[1].lower()
+    if ext in RASTER_WRITERS:
+        fb = Framebuffer.for_bounds(*box, margin=1, max_side=args.max_side)
+        if runs is not None:
+            runs.blit(fb, "red")
+        for chunk in chunks or ():
+            fb.plot_points(chunk, "blue")
+        export(args.output, fb)
+        print(f"Imagen {fb.width}x{fb.height} (escala {fb.scale}) guardada en {args.output}", file=sys.stderr)
+    else:
+        if chunks is not None:
+            export(args.output, chunks, total)
+            print(f"{total} puntos guardados en {args.output}", file=sys.stderr)
+        if runs is not None:
+            # El contorno y el relleno tienen columnas distintas: si hay
+            # ambos, los tramos van a un segundo archivo
+            path = args.output
+            if chunks is not None:
+                stem, ext = os.path.splitext(args.output)
+                path = args.fill_output or f"{stem}_relleno{ext}"
+            export(path, runs)
+            print(f"{len(runs)} tramos guardados en {path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
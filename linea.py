@@ -1,223 +1,261 @@
 import math
-import matplotlib.pyplot as plt
-import numpy as np
 import tkinter as tk
-from tkinter import ttk, messagebox
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-# Función para el algoritmo DDA (dos listas: entero y flotante)
-def dda_algorithm(x1, y1, x2, y2):
-    dx = x2 - x1
-    dy = y2 - y1
-    steps = max(abs(dx), abs(dy))
-    
-    # Evitar división entre 0 si x1 == x2 y y1 == y2 (línea de un solo punto)
-    if steps == 0:
-        return [(x1, y1)], [(float(x1), float(y1))], dx, dy
-    
-    x_inc = dx / steps
-    y_inc = dy / steps
-    
-    x, y = x1, y1
+from tkinter import messagebox
+from nucleo import classify_case
+from motor_lineas import bresenham_progressive, dda_progressive
+from puntos import as_points
+from raster import Framebuffer
+from renderizador import PlotRenderer
+from tabla_virtual import VirtualList
+from trabajos import JobRunner
+from trazas import tracer
+
+# Motores de línea disponibles, seleccionables por nombre, en su variante
+# progresiva (bloque a bloque): la ventana calcula en segundo plano
+LINE_STREAMS = {
+    "DDA": dda_progressive,
+    "Bresenham": bresenham_progressive,
+}
+
+# Función para graficar la línea: los píxeles enteros se pintan en un
+# framebuffer NumPy que se muestra como una sola imagen; con 'overlay'
+# se dibujan además los puntos flotantes y sus etiquetas con matplotlib.
+# El renderizador reutiliza la misma figura y artistas en cada ejecución.
+# Los puntos llegan como PointBuffer (o listas de tuplas, que se convierten).
+# Con 'viewport' los puntos ya vienen recortados: el framebuffer y los ejes
+# cubren solo esa vista y no se marcan los extremos (pueden quedar fuera).
+def plot_line(renderer, points_float, points_int, overlay=False, viewport=None):
+    renderer.begin()
     
-    points_int = []    # Puntos con round (enteros)
-    points_float = []  # Puntos en flotante
-
-    for _ in range(int(steps) + 1):
-        points_int.append((round(x), round(y)))
-        points_float.append((x, y))
-        x += x_inc
-        y += y_inc
+    # Columnas x e y de los puntos flotantes (vistas, sin copiar)
+    points_float = as_points(points_float)
+    x_vals = points_float.x
+    y_vals = points_float.y
     
-    return points_int, points_float, dx, dy
-
-# Función para clasificar el caso de la pendiente
-def classify_case(dx, dy):
-    if dx == 0:
-        return "Pendiente indefinida (línea vertical)", None
-    m = dy / dx
-    if m > 1:
-        return "Pendiente positiva > 1", m
-    elif 0 < m <= 1:
-        return "Pendiente positiva <= 1", m
-    elif -1 <= m < 0:
-        return "Pendiente negativa >= -1", m
-    elif m < -1:
-        return "Pendiente negativa < -1", m
+    # Píxeles de la línea en el framebuffer
+    pixels = as_points(points_int)
+    if viewport is None:
+        fb = Framebuffer.for_bounds(pixels.x.min(), pixels.y.min(),
+                                    pixels.x.max(), pixels.y.max(), margin=1)
     else:
-        # m == 0
-        return "Pendiente 0 (línea horizontal)", m
-
-# Función para graficar la línea usando los puntos flotantes
-def plot_line(canvas, points_float):
-    fig, ax = plt.subplots(figsize=(6, 6))
-    
-    # Extrae las coordenadas flotantes en listas separadas
-    x_vals = [p[0] for p in points_float]
-    y_vals = [p[1] for p in points_float]
+        fb = Framebuffer.for_bounds(viewport.x_min, viewport.y_min, viewport.x_max, viewport.y_max)
+    fb.plot_points(pixels, 'blue')
+    renderer.image('raster', fb)
     
-    # Grafica la línea con puntos flotantes para que sea “suave”
-    ax.plot(x_vals, y_vals, marker='o', linestyle='-', color='b', label='Línea DDA (float)')
+    if overlay:
+        # Grafica la línea con puntos flotantes para que sea “suave”; con
+        # nivel de detalle solo se dibujan los marcadores que caben en pantalla
+        renderer.lod_line('float', x_vals, y_vals, marker='o', linestyle='-', color='b', label='Línea DDA (float)')
+        
+        # Etiquetar los puntos (una etiqueta por zona visible de la pantalla)
+        renderer.lod_texts(x_vals, y_vals, lambda i: f'({x_vals[i]:.1f},{y_vals[i]:.1f})',
+                           fontsize=8, ha='right')
     
-    # Etiquetar cada punto (opcional)
-    for px, py in points_float:
-        ax.text(px, py, f'({px:.1f},{py:.1f})', fontsize=8, ha='right')
+    if viewport is not None:
+        renderer.finish((viewport.x_min - 0.5, viewport.x_max + 0.5),
+                        (viewport.y_min - 0.5, viewport.y_max + 0.5))
+        return
     
     # ========== MARCAS DE PUNTO INICIAL (INICIO) Y FINAL (FIN) ==========
-    ax.scatter([x_vals[0]], [y_vals[0]], 
-               color='lime', s=200, marker='o', label='Inicio')  # Punto de inicio
-    ax.scatter([x_vals[-1]], [y_vals[-1]], 
-               color='magenta', s=200, marker='x', label='Fin')  # Punto final
-    
-    ax.set_title('Generación de Línea con Algoritmo DDA')
-    ax.set_xlabel('Eje X')
-    ax.set_ylabel('Eje Y')
-    ax.grid(color='gray', linestyle='--', linewidth=0.5)
+    renderer.points('start', x_vals[:1], y_vals[:1],
+                    color='lime', s=200, marker='o', label='Inicio')  # Punto de inicio
+    renderer.points('end', x_vals[-1:], y_vals[-1:],
+                    color='magenta', s=200, marker='x', label='Fin')  # Punto final
     
     # Ajuste dinámico de los límites de los ejes
-    x_min, x_max = min(x_vals), max(x_vals)
-    y_min, y_max = min(y_vals), max(y_vals)
+    x_min, x_max = float(x_vals.min()), float(x_vals.max())
+    y_min, y_max = float(y_vals.min()), float(y_vals.max())
     margin_x = (x_max - x_min) * 0.1 if x_max != x_min else 1
     margin_y = (y_max - y_min) * 0.1 if y_max != y_min else 1
-    ax.set_xlim(x_min - margin_x, x_max + margin_x)
-    ax.set_ylim(y_min - margin_y, y_max + margin_y)
-    
-    # Escala igual en ambos ejes
-    ax.set_aspect('equal', adjustable='box')
-    
-    # Mostramos leyenda (para Inicio, Fin, etc.)
-    ax.legend()
-    
-    # Limpiamos cualquier contenido previo en el canvas de Tkinter
-    for widget in canvas.winfo_children():
-        widget.destroy()
-    
-    # Mostramos la figura en el Frame de Tkinter
-    canvas_plot = FigureCanvasTkAgg(fig, master=canvas)
-    canvas_plot.draw()
-    canvas_plot.get_tk_widget().pack()
+    renderer.finish((x_min - margin_x, x_max + margin_x),
+                    (y_min - margin_y, y_max + margin_y))
 
-# Función para ejecutar el algoritmo DDA
+# Función para ejecutar el algoritmo DDA: el cálculo corre en un hilo
+# trabajador y la lista y la gráfica se van llenando con los resultados
+# parciales; el botón "Cancelar" detiene un cálculo en curso
 def run_dda():
     try:
         x1 = int(entry_x1.get())
         y1 = int(entry_y1.get())
         x2 = int(entry_x2.get())
         y2 = int(entry_y2.get())
-        
-        points_int, points_float, dx, dy = dda_algorithm(x1, y1, x2, y2)
-        case_desc, m = classify_case(dx, dy)
-        
-        # Calculamos el ángulo en grados con atan2
-        if dx == 0 and dy == 0:
-            # Ambos puntos son iguales (sin línea)
-            angle_deg = 0.0
-        else:
-            angle_rad = math.atan2(dy, dx)
-            angle_deg = math.degrees(angle_rad)
-        
-        # DETECCIÓN DE DIRECCIÓN
-        if x2 > x1:
-            dir_x = "izquierda a derecha"
-        elif x2 < x1:
-            dir_x = "derecha a izquierda"
-        else:
-            dir_x = "sin cambio horizontal"
-        
-        if y2 > y1:
-            dir_y = "abajo a arriba"
-        elif y2 < y1:
-            dir_y = "arriba a abajo"
-        else:
-            dir_y = "sin cambio vertical"
-        
-        direction_text = f"Dirección: {dir_x}, {dir_y}"
-        
-        # Construimos el texto para resultados
-        if m is not None:
-            result_text.set(
-                f"{case_desc}\n"
-                f"Pendiente: {m:.2f}\n"
-                f"Inclinación: {angle_deg:.2f}°\n"
-                f"{direction_text}"
-            )
-        else:
-            # Si la pendiente es indefinida (dx=0), m es None
-            result_text.set(
-                f"{case_desc}\n"
-                f"Inclinación: {angle_deg:.2f}°\n"
-                f"{direction_text}"
-            )
-
-        # Mostramos los puntos en la lista con 2 decimales (del array FLOAT)
-        coord_list.delete(0, tk.END)
-        for px, py in points_float:
-            coord_list.insert(tk.END, f"({px:.2f}, {py:.2f})")
-        
-        # Graficamos usando los puntos flotantes para línea suave
-        plot_line(graph_canvas, points_float)
     except ValueError:
         messagebox.showerror("Error", "Por favor, ingrese valores enteros válidos.")
+        return
+    
+    line_stream = LINE_STREAMS[engine_var.get()]
+    # Con "Recortar a la vista" solo se calculan los puntos visibles
+    viewport = renderer.view() if clip_var.get() else None
+    overlay = overlay_var.get()
+    result_text.set("Calculando...")
+    runner.submit(lambda: line_stream(x1, y1, x2, y2, viewport),
+                  on_progress=lambda result: show_line(result, x1, y1, x2, y2, overlay, viewport),
+                  on_done=lambda result: finish_line(result, x1, y1, x2, y2, overlay, viewport),
+                  on_error=lambda exc: messagebox.showerror("Error", str(exc)),
+                  on_cancel=lambda: result_text.set("Cálculo cancelado"))
+
+# Resultado final: se muestra dentro de una ejecución instrumentada, con el
+# tiempo de cálculo del hilo trabajador como etapa "algoritmo"
+def finish_line(result, x1, y1, x2, y2, overlay, viewport):
+    job = runner.job
+    with tracer.run("linea"):
+        tracer.record("algoritmo", job.started, job.finished)
+        show_line(result, x1, y1, x2, y2, overlay, viewport)
+
+# Muestra un resultado (parcial o final) en la lista, el texto y la gráfica
+def show_line(result, x1, y1, x2, y2, overlay, viewport):
+    points_int, points_float, dx, dy = result
+    case_desc, m = classify_case(dx, dy)
+    
+    # Calculamos el ángulo en grados con atan2
+    if dx == 0 and dy == 0:
+        # Ambos puntos son iguales (sin línea)
+        angle_deg = 0.0
+    else:
+        angle_rad = math.atan2(dy, dx)
+        angle_deg = math.degrees(angle_rad)
+    
+    # DETECCIÓN DE DIRECCIÓN
+    if x2 > x1:
+        dir_x = "izquierda a derecha"
+    elif x2 < x1:
+        dir_x = "derecha a izquierda"
+    else:
+        dir_x = "sin cambio horizontal"
+    
+    if y2 > y1:
+        dir_y = "abajo a arriba"
+    elif y2 < y1:
+        dir_y = "arriba a abajo"
+    else:
+        dir_y = "sin cambio vertical"
+    
+    direction_text = f"Dirección: {dir_x}, {dir_y}"
+    
+    # Construimos el texto para resultados
+    if m is not None:
+        result_text.set(
+            f"{case_desc}\n"
+            f"Pendiente: {m:.2f}\n"
+            f"Inclinación: {angle_deg:.2f}°\n"
+            f"{direction_text}"
+        )
+    else:
+        # Si la pendiente es indefinida (dx=0), m es None
+        result_text.set(
+            f"{case_desc}\n"
+            f"Inclinación: {angle_deg:.2f}°\n"
+            f"{direction_text}"
+        )
+
+    # Mostramos los puntos en la lista con 2 decimales (del array FLOAT);
+    # la lista es virtual y solo formatea las filas visibles
+    with tracer.span("lista"):
+        coord_list.set_source(len(points_float),
+                              lambda i: f"({points_float[i][0]:.2f}, {points_float[i][1]:.2f})")
+    
+    # Graficamos los píxeles (y, si se pide, los puntos flotantes encima)
+    plot_line(renderer, points_float, points_int, overlay, viewport)
 
 # Función para limpiar las entradas y resultados
 def clear_entries():
+    runner.cancel()
     for entry in [entry_x1, entry_y1, entry_x2, entry_y2]:
         entry.delete(0, tk.END)
     result_text.set("")
-    coord_list.delete(0, tk.END)
-    for widget in graph_canvas.winfo_children():
-        widget.destroy()
-
-# Configuración de la ventana principal
-root = tk.Tk()
-root.title("Algoritmo DDA - Generación de Líneas")
-root.geometry("1000x700")
-root.resizable(False, False)
-root.configure(bg='#f0f0f0')
-
-# Frame izquierdo para controles
-frame_left = tk.Frame(root, bg='#f0f0f0')
-frame_left.pack(side=tk.LEFT, padx=20, pady=20)
-
-# Frame derecho para el gráfico
-frame_right = tk.Frame(root, bg='#ffffff')
-frame_right.pack(side=tk.RIGHT, padx=20, pady=20, expand=True, fill=tk.BOTH)
-
-# Título de coordenadas
-tk.Label(frame_left, text="Coordenadas", font=("Arial", 12, "bold"), bg='#f0f0f0').pack()
-
-# Frame para entradas
-entry_frame = tk.Frame(frame_left, bg='#f0f0f0')
-entry_frame.pack()
-
-# Entradas para coordenadas
-for i, (label, var) in enumerate(zip(["x1:", "y1:", "x2:", "y2:"],
-                                     ["entry_x1", "entry_y1", "entry_x2", "entry_y2"])):
-    tk.Label(entry_frame, text=label, font=("Arial", 10), bg='#f0f0f0').grid(row=i, column=0, padx=5, pady=5)
-    globals()[var] = tk.Entry(entry_frame, font=("Arial", 10), width=5)
-    globals()[var].grid(row=i, column=1, padx=5, pady=5)
-
-# Botones para generar línea y limpiar
-tk.Button(frame_left, text="Generar Línea", command=run_dda,
-          font=("Arial", 10), bg='#4CAF50', fg='white').pack(pady=10)
-tk.Button(frame_left, text="Limpiar", command=clear_entries,
-          font=("Arial", 10), bg='#f44336', fg='white').pack()
-
-# Resultados
-tk.Label(frame_left, text="Resultados", font=("Arial", 12, "bold"), bg='#f0f0f0').pack(pady=5)
-result_text = tk.StringVar()
-tk.Label(frame_left, textvariable=result_text, font=("Arial", 10), bg='#f0f0f0', justify=tk.LEFT).pack()
-
-# Lista de puntos de la línea (más alta para menos scroll)
-tk.Label(frame_left, text="Puntos de la Línea", font=("Arial", 12, "bold"), bg='#f0f0f0').pack(pady=5)
-coord_list = tk.Listbox(frame_left, height=20, width=25, font=("Arial", 10))
-coord_list.pack()
-
-# Canvas para el gráfico
-graph_canvas = tk.Frame(frame_right, bg='#ffffff')
-graph_canvas.pack(expand=True, fill=tk.BOTH)
-
-# Título del gráfico
-tk.Label(frame_right, text="Plano de Coordenadas", font=("Arial", 14, "bold"), bg='#ffffff').pack()
-
-root.mainloop()
+    coord_list.clear()
+    renderer.clear()
+
+if __name__ == "__main__":
+    # Configuración de la ventana principal
+    root = tk.Tk()
+    root.title("Algoritmo DDA - Generación de Líneas")
+    root.geometry("1000x700")
+    root.resizable(False, False)
+    root.configure(bg='#f0f0f0')
+
+    # Barra de estado con el desglose de tiempos (solo con RASTER_TRACE activo)
+    if tracer.enabled:
+        status_var = tk.StringVar()
+        tk.Label(root, textvariable=status_var, anchor="w", relief=tk.SUNKEN,
+                 font=("Arial", 9)).pack(side=tk.BOTTOM, fill=tk.X)
+        tracer.on_run = status_var.set
+
+    # Frame izquierdo para controles
+    frame_left = tk.Frame(root, bg='#f0f0f0')
+    frame_left.pack(side=tk.LEFT, padx=20, pady=20)
+
+    # Frame derecho para el gráfico
+    frame_right = tk.Frame(root, bg='#ffffff')
+    frame_right.pack(side=tk.RIGHT, padx=20, pady=20, expand=True, fill=tk.BOTH)
+
+    # Título de coordenadas
+    tk.Label(frame_left, text="Coordenadas", font=("Arial", 12, "bold"), bg='#f0f0f0').pack()
+
+    # Frame para entradas
+    entry_frame = tk.Frame(frame_left, bg='#f0f0f0')
+    entry_frame.pack()
+
+    # Entradas para coordenadas
+    for i, (label, var) in enumerate(zip(["x1:", "y1:", "x2:", "y2:"],
+                                         ["entry_x1", "entry_y1", "entry_x2", "entry_y2"])):
+        tk.Label(entry_frame, text=label, font=("Arial", 10), bg='#f0f0f0').grid(row=i, column=0, padx=5, pady=5)
+        globals()[var] = tk.Entry(entry_frame, font=("Arial", 10), width=5)
+        globals()[var].grid(row=i, column=1, padx=5, pady=5)
+
+    # Selección del motor de línea
+    engine_var = tk.StringVar(value="DDA")
+    tk.Label(entry_frame, text="Algoritmo:", font=("Arial", 10), bg='#f0f0f0').grid(row=4, column=0, padx=5, pady=5)
+    tk.OptionMenu(entry_frame, engine_var, *LINE_STREAMS).grid(row=4, column=1, padx=5, pady=5)
+
+    # Opción para superponer los puntos como artistas de matplotlib
+    overlay_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(frame_left, text="Superponer puntos (matplotlib)", variable=overlay_var,
+                   font=("Arial", 10), bg='#f0f0f0').pack()
+
+    # Recorte a la vista actual: la siguiente línea se calcula solo dentro
+    # de los límites que muestra la gráfica
+    clip_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(frame_left, text="Recortar a la vista actual", variable=clip_var,
+                   font=("Arial", 10), bg='#f0f0f0').pack()
+
+    # Cálculo en segundo plano: un hilo trabajador y resultados por root.after
+    runner = JobRunner(root)
+
+    # Botones para generar línea, cancelar y limpiar
+    tk.Button(frame_left, text="Generar Línea", command=run_dda,
+              font=("Arial", 10), bg='#4CAF50', fg='white').pack(pady=10)
+    tk.Button(frame_left, text="Cancelar", command=runner.cancel,
+              font=("Arial", 10), bg='#ff9800', fg='white').pack(pady=(0, 10))
+    tk.Button(frame_left, text="Limpiar", command=clear_entries,
+              font=("Arial", 10), bg='#f44336', fg='white').pack()
+
+    # Resultados
+    tk.Label(frame_left, text="Resultados", font=("Arial", 12, "bold"), bg='#f0f0f0').pack(pady=5)
+    result_text = tk.StringVar()
+    tk.Label(frame_left, textvariable=result_text, font=("Arial", 10), bg='#f0f0f0', justify=tk.LEFT).pack()
+
+    # Lista de puntos de la línea (más alta para menos scroll)
+    tk.Label(frame_left, text="Puntos de la Línea", font=("Arial", 12, "bold"), bg='#f0f0f0').pack(pady=5)
+    coord_list = VirtualList(frame_left, height=20, width=25, font=("Arial", 10))
+    coord_list.pack()
+
+    # Canvas para el gráfico
+    graph_canvas = tk.Frame(frame_right, bg='#ffffff')
+    graph_canvas.pack(expand=True, fill=tk.BOTH)
+
+    # Renderizador persistente: una sola figura reutilizada en cada ejecución
+    renderer = PlotRenderer(graph_canvas, 'Generación de Línea con Algoritmo DDA',
+                            grid=dict(color='gray', linestyle='--', linewidth=0.5))
+
+    # Título del gráfico
+    tk.Label(frame_right, text="Plano de Coordenadas", font=("Arial", 14, "bold"), bg='#ffffff').pack()
+
+    # Al cerrar se cancela el cálculo en curso y se liberan los hilos
+    def on_close():
+        runner.shutdown()
+        renderer.close()
+        root.destroy()
+    root.protocol("WM_DELETE_WINDOW", on_close)
+
+    root.mainloop()
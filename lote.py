@@ -0,0 +1,412 @@
+"""
+Modo por lotes sin ventana: rasteriza las primitivas de un archivo de escena.
+
+La escena se lee en streaming, primitiva a primitiva, así que puede tener
+millones de figuras sin caber en memoria. Formatos aceptados:
+
+- JSON: un arreglo de objetos o un objeto por línea (JSON Lines), p. ej.
+    {"type": "line", "x1": 0, "y1": 0, "x2": 10, "y2": 4, "engine": "DDA"}
+    {"type": "circle", "xc": 0, "yc": 0, "r": 5, "fill": true}
+    {"type": "triangle", "points": [[0, 0], [8, 2], [3, 7]], "engine": "Bresenham"}
+- CSV: una primitiva por fila, con el tipo y sus números en orden
+    linea,x1,y1,x2,y2[,motor]
+    circulo,xc,yc,r[,relleno]
+    triangulo,xa,ya,xb,yb,xc,yc[,motor]
+
+Cada primitiva pasa por los mismos motores que las ventanas (línea,
+circunferencia con relleno opcional, triángulo con relleno y aristas) y
+se mide su tiempo de cálculo. Las salidas también se escriben por bloques:
+
+    python lote.py escena.json --points puntos.csv --timings tiempos.csv
+    python lote.py escena.csv --image salida.png --bounds -100 -100 900 700
+    python lote.py escena.jsonl --canvas lienzo.npy --bounds 0 0 99999 99999
+    python lote.py escena.csv --engines    # motores elegidos por tamaño (autoajuste)
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+from autoajuste import bresenham_auto, dda_auto, midpoint_circle_auto, tuner
+from exportar import RASTER_WRITERS, write_csv
+from motor_circulos import circle_fill_runs
+from motor_lineas import bresenham_points_cached, dda_float_points
+from mosaico import TiledCanvas
+from nucleo import CHUNK_SIZE, classify_case
+from raster import Framebuffer
+from relleno import triangle_runs
+
+# Nombres de tipo aceptados (en inglés o en español) y su nombre normalizado
+KINDS = {
+    "line": "line", "linea": "line", "línea": "line",
+    "circle": "circle", "circulo": "circle", "círculo": "circle",
+    "triangle": "triangle", "triangulo": "triangle", "triángulo": "triangle",
+}
+
+# Motores de línea por nombre, los mismos que usan linea.py y triangulo.py;
+# las escenas por lotes suelen tener muchas primitivas pequeñas, así que
+# cada una se despacha por tamaño (autoajuste)
+LINE_ENGINES = {"DDA": dda_auto, "Bresenham": bresenham_auto}
+EDGE_ENGINES = {"DDA": dda_float_points, "Bresenham": bresenham_points_cached}
+
+# Tamaño del bloque de lectura de JSON (caracteres)
+READ_SIZE = 1 << 20
+
+
+# ---------- Lectura de escenas ----------
+
+def iter_json(stream: TextIO) -> Iterator[dict]:
+    """
+    Objetos de un arreglo JSON o de un archivo JSON Lines, uno a uno (ver
+    '_iter_json_lines').
+    """
+    for _, obj in _iter_json_lines(stream):
+        yield obj
+
+
+def _iter_json_lines(stream: TextIO) -> Iterator[Tuple[int, dict]]:
+    """
+    Pares (línea donde empieza, objeto) de un arreglo JSON o de un archivo
+    JSON Lines.
+
+    El texto se lee en bloques de READ_SIZE caracteres y cada objeto se
+    decodifica con 'raw_decode' en cuanto está completo; los corchetes y
+    comas del arreglo se saltan. Nunca se carga el archivo entero.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    line = 1     # Línea de 'buffer[counted]'
+    counted = 0  # Hasta dónde se contaron los saltos de línea del bloque
+    eof = False
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                return
+            line += buffer.count("\n", counted)
+            buffer, pos, counted = stream.read(READ_SIZE), 0, 0
+            eof = not buffer
+            continue
+        try:
+            obj, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more = stream.read(READ_SIZE)
+            eof = not more
+            line += buffer.count("\n", counted, pos)
+            buffer, pos, counted = buffer[pos:] + more, 0, 0
+            continue
+        line += buffer.count("\n", counted, pos)
+        counted = pos
+        yield line, obj
+        pos = end
+
+
+def _engine(value: Optional[str]) -> str:
+    # Sin motor se usa DDA; un nombre desconocido es un error, no DDA
+    if value is None or value == "":
+        return "DDA"
+    if value not in LINE_ENGINES:
+        raise ValueError(f"Motor de línea desconocido: {value!r} (hay {', '.join(LINE_ENGINES)}).")
+    return value
+
+
+def _radius(r) -> int:
+    r = int(r)
+    if r < 0:
+        raise ValueError("El radio debe ser un número positivo.")
+    return r
+
+
+def parse_json_primitive(obj: dict) -> Tuple[str, dict]:
+    """
+    Normaliza un objeto JSON de la escena a (tipo, parámetros).
+    """
+    kind = KINDS[str(obj.get("type", "")).lower()]
+    if kind == "line":
+        return kind, {"x1": int(obj["x1"]), "y1": int(obj["y1"]), "x2": int(obj["x2"]), "y2": int(obj["y2"]),
+                      "engine": _engine(obj.get("engine"))}
+    if kind == "circle":
+        return kind, {"xc": int(obj["xc"]), "yc": int(obj["yc"]), "r": _radius(obj["r"]),
+                      "fill": bool(obj.get("fill", False))}
+    points = [(int(x), int(y)) for x, y in obj["points"]]
+    if len(points) != 3:
+        raise ValueError("Un triángulo necesita 3 vértices.")
+    return kind, {"points": points, "engine": _engine(obj.get("engine"))}
+
+
+def parse_csv_primitive(row: List[str]) -> Tuple[str, dict]:
+    """
+    Normaliza una fila CSV de la escena a (tipo, parámetros).
+    """
+    kind = KINDS[row[0].strip().lower()]
+    if kind == "line":
+        x1, y1, x2, y2 = map(int, row[1:5])
+        return kind, {"x1": x1, "y1": y1, "x2": x2, "y2": y2,
+                      "engine": _engine(row[5].strip() if len(row) > 5 else None)}
+    if kind == "circle":
+        xc, yc, r = map(int, row[1:4])
+        r = _radius(r)
+        fill = len(row) > 4 and row[4].strip().lower() in ("1", "true", "si", "sí", "relleno", "fill")
+        return kind, {"xc": xc, "yc": yc, "r": r, "fill": fill}
+    coords = list(map(int, row[1:7]))
+    return kind, {"points": list(zip(coords[0::2], coords[1::2])),
+                  "engine": _engine(row[7].strip() if len(row) > 7 else None)}
+
+
+def read_scene(stream: TextIO, fmt: str) -> Iterator[Tuple[str, dict]]:
+    """
+    Primitivas normalizadas de una escena ('json' o 'csv'), en streaming.
+    Las filas CSV vacías o que empiezan con '#' se ignoran.
+
+    Raises:
+        ValueError: Si una primitiva no es válida (radio negativo, motor
+        desconocido...); el mensaje indica la línea de la escena.
+    """
+    if fmt == "json":
+        for line, obj in _iter_json_lines(stream):
+            yield _parse_at(line, parse_json_primitive, obj)
+        return
+    reader = csv.reader(stream)
+    for row in reader:
+        if not row or not row[0].strip() or row[0].lstrip().startswith("#"):
+            continue
+        if row[0].strip().lower() in ("type", "tipo"):
+            continue  # Encabezado
+        yield _parse_at(reader.line_num, parse_csv_primitive, row)
+
+
+def _parse_at(line: int, parse: Callable, item) -> Tuple[str, dict]:
+    try:
+        return parse(item)
+    except ValueError as exc:
+        raise ValueError(f"Línea {line} de la escena: {exc}") from exc
+
+
+# ---------- Cálculo ----------
+
+def compute(kind: str, params: dict) -> Tuple[np.ndarray, Optional[object], str]:
+    """
+    Calcula una primitiva con los motores de las ventanas.
+
+    Returns:
+        Tuple: (píxeles (n, 2) del trazo, SpanSet del relleno o None,
+        descripción, p. ej. el caso de pendiente de la línea).
+
+    Raises:
+        ValueError: Si el radio de una circunferencia es negativo.
+    """
+    if kind == "line":
+        x1, y1, x2, y2 = params["x1"], params["y1"], params["x2"], params["y2"]
+        points_int, _, dx, dy = LINE_ENGINES[params["engine"]](x1, y1, x2, y2)
+        return points_int.data, None, classify_case(dx, dy)[0]
+    if kind == "circle":
+        xc, yc, r = params["xc"], params["yc"], params["r"]
+        if r < 0:
+            raise ValueError("El radio debe ser un número positivo.")
+        runs = circle_fill_runs(xc, yc, r) if params["fill"] else None
+        return midpoint_circle_auto(xc, yc, r), runs, "relleno" if runs is not None else ""
+    tri = params["points"]
+    runs = triangle_runs(tri, params["engine"])
+    edge = EDGE_ENGINES[params["engine"]]
+    edges = [np.rint(edge(*tri[i], *tri[(i + 1) % 3])) for i in range(3)]
+    return np.concatenate(edges).astype(np.int64), runs, ""
+
+
+# ---------- Salidas ----------
+
+class CsvSink:
+    """
+    Salida CSV con un identificador de primitiva por fila; las filas se
+    acumulan y se escriben en bloques de al menos 'chunk_size' con
+    'exportar.write_csv', sin una cadena de Python por punto.
+    """
+    def __init__(self, path: str, header: Tuple[str, ...], chunk_size: int = CHUNK_SIZE) -> None:
+        self.file = open(path, "wb")
+        self.file.write((",".join(header) + "\n").encode())
+        self.chunk_size = chunk_size
+        self.pending: List[np.ndarray] = []
+        self.count = 0
+
+    def add(self, ident: int, rows: np.ndarray) -> None:
+        block = np.empty((len(rows), rows.shape[1] + 1), dtype=np.int64)
+        block[:, 0] = ident
+        block[:, 1:] = rows
+        self.pending.append(block)
+        self.count += len(block)
+        if self.count >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending:
+            write_csv(self.file, np.concatenate(self.pending), header=None)
+        self.pending = []
+        self.count = 0
+
+    def close(self) -> None:
+        self.flush()
+        self.file.close()
+
+
+class Summary:
+    """
+    Tiempos de cálculo por tipo de primitiva (arreglos compactos de floats).
+    """
+    def __init__(self) -> None:
+        self.times: Dict[str, array] = {}
+        self.points: Dict[str, int] = {}
+
+    def add(self, kind: str, seconds: float, points: int) -> None:
+        self.times.setdefault(kind, array("d")).append(seconds)
+        self.points[kind] = self.points.get(kind, 0) + points
+
+    def rows(self) -> List[dict]:
+        rows = []
+        for kind, times in self.times.items():
+            ordered = sorted(times)
+            rows.append({
+                "kind": kind,
+                "count": len(times),
+                "points": self.points[kind],
+                "total_s": sum(times),
+                "mean_ms": statistics.fmean(times) * 1e3,
+                "p50_ms": ordered[len(ordered) // 2] * 1e3,
+                "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e3,
+                "max_ms": ordered[-1] * 1e3,
+            })
+        return rows
+
+
+def _open_input(path: str) -> TextIO:
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    return open(path, encoding="utf-8", newline="")
+
+
+def run(args) -> List[dict]:
+    """
+    Procesa la escena con las opciones de la línea de órdenes y devuelve
+    el resumen de tiempos por tipo.
+    """
+    fmt = args.format or ("csv" if args.scene.lower().endswith(".csv") else "json")
+    canvas = None
+    if args.canvas or args.image:
+        x_min, y_min, x_max, y_max = args.bounds
+        if args.canvas:
+            canvas = TiledCanvas.create(args.canvas, x_max - x_min + 1, y_max - y_min + 1, x_min, y_min)
+        else:
+            canvas = Framebuffer.for_bounds(x_min, y_min, x_max, y_max, max_side=args.max_side)
+
+    points_out = CsvSink(args.points, ("id", "x", "y")) if args.points else None
+    spans_out = CsvSink(args.spans, ("id", "y", "x_start", "x_end")) if args.spans else None
+    timings_file = open(args.timings, "w", encoding="utf-8", newline="") if args.timings else None
+    timings = csv.writer(timings_file) if timings_file else None
+    if timings:
+        timings.writerow(["id", "kind", "points", "spans", "compute_ms", "description"])
+
+    # La elección de motores se calibra (o se lee de la caché) y cada ruta
+    # se ejecuta una vez con una figura mínima antes de medir: la primera
+    # primitiva no debe cargar con la calibración ni con los imports
+    # perezosos de NumPy
+    for name in tuner.operations:
+        tuner.prepare(name)
+    for engine in LINE_ENGINES:
+        compute("line", {"x1": 0, "y1": 0, "x2": 2, "y2": 1, "engine": engine})
+        compute("triangle", {"points": [(0, 0), (2, 0), (0, 2)], "engine": engine})
+    compute("circle", {"xc": 0, "yc": 0, "r": 2, "fill": True})
+
+    summary = Summary()
+    start = time.perf_counter()
+    count = 0
+    try:
+        with _open_input(args.scene) as stream:
+            for ident, (kind, params) in enumerate(read_scene(stream, fmt)):
+                t0 = time.perf_counter()
+                points, runs, description = compute(kind, params)
+                elapsed = time.perf_counter() - t0
+                summary.add(kind, elapsed, len(points))
+                count += 1
+
+                if timings:
+                    timings.writerow([ident, kind, len(points), len(runs) if runs is not None else 0,
+                                      f"{elapsed * 1e3:.4f}", description])
+                if points_out:
+                    points_out.add(ident, points)
+                if spans_out and runs is not None:
+                    spans_out.add(ident, runs.to_array())
+                if canvas is not None:
+                    # Mismos colores que las ventanas
+                    if runs is not None:
+                        runs.blit(canvas, "orange" if kind == "circle" else "red")
+                    canvas.plot_points(points, "blue")
+    finally:
+        for sink in (points_out, spans_out):
+            if sink:
+                sink.close()
+        if timings_file:
+            timings_file.close()
+
+    if args.image:
+        ext = os.path.splitext(args.image)[1].lower()
+        RASTER_WRITERS[ext](args.image, canvas)
+    if isinstance(canvas, TiledCanvas):
+        canvas.close()
+
+    rows = summary.rows()
+    total = time.perf_counter() - start
+    print(f"{count} primitivas en {total:.3f} s", file=sys.stderr)
+    for row in rows:
+        print(f"{row['kind']:9s} {row['count']:>9d}  puntos {row['points']:>12d}  "
+              f"total {row['total_s'] * 1e3:10.2f} ms  media {row['mean_ms']:8.4f} ms  "
+              f"p95 {row['p95_ms']:8.4f} ms  máx {row['max_ms']:8.3f} ms", file=sys.stderr)
+    if args.engines:
+        print(tuner.report(), file=sys.stderr)
+    if args.summary:
+        engines = {f"{op}/{engine}": n for (op, engine), n in sorted(tuner.decisions.items())}
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump({"primitives": count, "wall_s": total, "kinds": rows, "engines": engines}, f, indent=2)
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rasteriza sin ventana las primitivas de un archivo de escena.")
+    parser.add_argument("scene", help="Escena JSON, JSON Lines o CSV ('-' para la entrada estándar).")
+    parser.add_argument("--format", choices=("json", "csv"), help="Formato de la escena (por extensión).")
+    parser.add_argument("--points", metavar="CSV", help="Píxeles de los trazos: id,x,y.")
+    parser.add_argument("--spans", metavar="CSV", help="Tramos de los rellenos: id,y,x_start,x_end.")
+    parser.add_argument("--timings", metavar="CSV", help="Tiempo de cálculo de cada primitiva.")
+    parser.add_argument("--summary", metavar="JSON", help="Resumen de tiempos por tipo.")
+    parser.add_argument("--image", metavar="IMG", help="Imagen de la escena (.png, .pgm o .pbm).")
+    parser.add_argument("--canvas", metavar="NPY", help="Lienzo por mosaicos en disco (mosaico.TiledCanvas).")
+    parser.add_argument("--bounds", type=int, nargs=4, metavar=("X_MIN", "Y_MIN", "X_MAX", "Y_MAX"),
+                        help="Rectángulo del mundo que cubre la imagen o el lienzo.")
+    parser.add_argument("--max-side", type=int, default=4096,
+                        help="Lado máximo de la imagen en memoria (escala mayor si no cabe).")
+    parser.add_argument("--engines", action="store_true",
+                        help="Muestra los motores elegidos por tamaño y cuántas veces se usó cada uno.")
+    args = parser.parse_args(argv)
+    tuner.debug = args.engines
+    if (args.image or args.canvas) and args.bounds is None:
+        parser.error("--image y --canvas necesitan --bounds")
+    if args.image and os.path.splitext(args.image)[1].lower() not in RASTER_WRITERS:
+        parser.error(f"Formato de imagen no soportado: {args.image}")
+    try:
+        run(args)
+    except ValueError as exc:
+        parser.exit(1, f"{parser.prog}: error: {exc}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
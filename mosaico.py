@@ -0,0 +1,274 @@
+import json
+from typing import Callable, Iterator, Tuple
+
+import numpy as np
+
+from motor_circulos import circle_fill_runs, midpoint_circle_cached
+from motor_lineas import bresenham_buffers, dda_buffers
+from raster import Framebuffer
+from recorte import Viewport, liang_barsky
+from relleno import polygon_runs
+
+# Lado (en píxeles) de los mosaicos por defecto: 1024 x 1024 x 4 B = 4 MiB
+TILE_SIZE = 1024
+
+
+class TiledCanvas:
+    """
+    Lienzo RGBA más grande que la memoria, guardado en disco como un arreglo
+    .npy mapeado en memoria ('np.memmap') y organizado en mosaicos.
+
+    El archivo tiene forma (filas de mosaicos, columnas de mosaicos, lado,
+    lado, 4): cada mosaico ocupa un bloque contiguo, así que pintar en él
+    solo toca sus páginas. Cada mosaico se expone como un Framebuffer sobre
+    esa memoria (sin copiarla ni borrarla), con el mismo sistema de
+    coordenadas: (x0, y0) es la esquina inferior izquierda del mundo y la
+    fila 0 del mosaico 0 es la fila superior.
+
+    El archivo se crea disperso (sin escribir los ceros, que son el color
+    transparente), así que un lienzo de 100k x 100k solo ocupa en disco y en
+    memoria los mosaicos que se han pintado. La geometría se guarda junto al
+    archivo en 'ruta.json' para poder reabrirlo y seguir dibujando.
+    """
+    def __init__(self, path: str, tiles: np.memmap, width: int, height: int,
+                 x0: int = 0, y0: int = 0) -> None:
+        self.path = path
+        self.tiles = tiles
+        self.width = width
+        self.height = height
+        self.x0 = x0
+        self.y0 = y0
+        self.tile_size = tiles.shape[2]
+        self.y_top = y0 + height - 1
+
+    @classmethod
+    def create(cls, path: str, width: int, height: int, x0: int = 0, y0: int = 0,
+               tile_size: int = TILE_SIZE) -> "TiledCanvas":
+        """
+        Crea un lienzo nuevo (transparente) en 'path', sobrescribiendo el anterior.
+        """
+        shape = (-(-height // tile_size), -(-width // tile_size), tile_size, tile_size, 4)
+        tiles = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=shape)
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump({"width": width, "height": height, "x0": x0, "y0": y0}, f)
+        return cls(path, tiles, width, height, x0, y0)
+
+    @classmethod
+    def open(cls, path: str, mode: str = "r+") -> "TiledCanvas":
+        """
+        Reabre un lienzo existente ("r+" para seguir dibujando, "r" solo lectura).
+        """
+        with open(path + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        tiles = np.load(path, mmap_mode=mode)
+        return cls(path, tiles, meta["width"], meta["height"], meta["x0"], meta["y0"])
+
+    def flush(self) -> None:
+        """
+        Escribe en disco los mosaicos modificados.
+        """
+        self.tiles.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self.tiles = None
+
+    def __enter__(self) -> "TiledCanvas":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        Número de mosaicos (filas, columnas).
+        """
+        return self.tiles.shape[:2]
+
+    def viewport(self) -> Viewport:
+        return Viewport(self.x0, self.y0, self.x0 + self.width - 1, self.y_top)
+
+    def tile(self, row: int, col: int) -> Framebuffer:
+        """
+        Framebuffer sobre la memoria del mosaico (row, col); los del borde
+        derecho e inferior se recortan al tamaño del lienzo.
+        """
+        t = self.tile_size
+        w = min(t, self.width - col * t)
+        h = min(t, self.height - row * t)
+        top = self.y_top - row * t
+        # Vista ndarray simple sobre la misma memoria: indexar la subclase
+        # memmap fila a fila (p. ej. en 'fill_spans') es mucho más lento
+        return Framebuffer(w, h, self.x0 + col * t, top - h + 1,
+                           pixels=self.tiles[row, col, :h, :w].view(np.ndarray))
+
+    def tile_rows(self, y_min: int, y_max: int) -> range:
+        """
+        Filas de mosaicos que cubren las coordenadas y en [y_min, y_max].
+        """
+        t = self.tile_size
+        first = max(0, (self.y_top - y_max) // t)
+        last = min(self.shape[0] - 1, (self.y_top - y_min) // t)
+        return range(first, last + 1)
+
+    def tile_cols(self, x_min: int, x_max: int) -> range:
+        """
+        Columnas de mosaicos que cubren las coordenadas x en [x_min, x_max].
+        """
+        t = self.tile_size
+        first = max(0, (x_min - self.x0) // t)
+        last = min(self.shape[1] - 1, (x_max - self.x0) // t)
+        return range(first, last + 1)
+
+    def tiles_in(self, x_min: int, y_min: int, x_max: int, y_max: int) -> Iterator[Tuple[int, int]]:
+        """
+        Mosaicos (fila, columna) que intersecan el rectángulo dado.
+        """
+        for row in self.tile_rows(y_min, y_max):
+            for col in self.tile_cols(x_min, x_max):
+                yield row, col
+
+    def draw(self, bounds: Tuple[int, int, int, int], paint: Callable[[Framebuffer], None]) -> int:
+        """
+        Llama a 'paint(fb)' con cada mosaico que interseca 'bounds'
+        (x_min, y_min, x_max, y_max); 'paint' debe usar 'fb.viewport()' para
+        calcular solo lo visible en el mosaico. Devuelve los mosaicos visitados.
+        """
+        count = 0
+        for row, col in self.tiles_in(*bounds):
+            paint(self.tile(row, col))
+            count += 1
+        return count
+
+    # ---------- Primitivas ----------
+
+    def plot_points(self, points, color="blue") -> None:
+        """
+        Pinta un arreglo (n, 2) de puntos enteros, agrupados por mosaico.
+        """
+        pts = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        t = self.tile_size
+        rows = (self.y_top - pts[:, 1]) // t
+        cols = (pts[:, 0] - self.x0) // t
+        inside = (rows >= 0) & (rows < self.shape[0]) & (cols >= 0) & (cols < self.shape[1])
+        pts, keys = pts[inside], rows[inside] * self.shape[1] + cols[inside]
+        order = np.argsort(keys, kind="stable")
+        pts, keys = pts[order], keys[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else []
+        for start, stop in zip(starts, list(starts[1:]) + [len(keys)]):
+            row, col = divmod(int(keys[start]), self.shape[1])
+            self.tile(row, col).plot_points(pts[start:stop], color)
+
+    def fill_spans(self, ys, x_starts, x_ends, color="orange") -> None:
+        """
+        Pinta tramos horizontales [x_start, x_end] (inclusive); cada mosaico
+        recibe solo los tramos que lo tocan, ya recortados por 'fill_spans'.
+        """
+        ys = np.asarray(ys, dtype=np.int64)
+        x_starts = np.asarray(x_starts, dtype=np.int64)
+        x_ends = np.asarray(x_ends, dtype=np.int64)
+        if len(ys) == 0:
+            return
+        for row in self.tile_rows(int(ys.min()), int(ys.max())):
+            top = self.y_top - row * self.tile_size
+            in_row = np.flatnonzero((ys <= top) & (ys > top - self.tile_size))
+            if len(in_row) == 0:
+                continue
+            for col in self.tile_cols(int(x_starts[in_row].min()), int(x_ends[in_row].max())):
+                fb = self.tile(row, col)
+                x_max = fb.x0 + fb.width - 1
+                hit = in_row[(x_starts[in_row] <= x_max) & (x_ends[in_row] >= fb.x0)]
+                fb.fill_spans(ys[hit], x_starts[hit], x_ends[hit], color)
+
+    def draw_line(self, x1, y1, x2, y2, color="blue", engine: str = "DDA") -> None:
+        """
+        Dibuja un segmento con el motor recortado. Bresenham se evalúa
+        mosaico a mosaico (en cada fila de mosaicos solo se visitan las
+        columnas que cruza el segmento); DDA acumula desde el inicio, así que
+        se recorta una sola vez al lienzo y los píxeles se reparten por
+        mosaico, con los mismos valores que la línea sin mosaicos.
+        """
+        if engine != "Bresenham":
+            self.plot_points(dda_buffers(x1, y1, x2, y2, self.viewport())[0], color)
+            return
+        for row in self.tile_rows(min(y1, y2), max(y1, y2)):
+            top = self.y_top - row * self.tile_size
+            # Tramo del segmento dentro de la banda de la fila (medio píxel de holgura)
+            clip = liang_barsky(x1, y1, x2, y2, self.x0 - 0.5, top - self.tile_size + 0.5,
+                                self.x0 + self.width - 0.5, top + 0.5)
+            if clip is None:
+                continue
+            xa, xb = x1 + clip[0] * (x2 - x1), x1 + clip[1] * (x2 - x1)
+            for col in self.tile_cols(int(np.floor(min(xa, xb))) - 1, int(np.ceil(max(xa, xb))) + 1):
+                fb = self.tile(row, col)
+                fb.plot_points(bresenham_buffers(x1, y1, x2, y2, fb.viewport())[0], color)
+
+    def draw_circle(self, xc: int, yc: int, r: int, color="blue", fill: bool = False) -> None:
+        """
+        Dibuja una circunferencia (o su relleno) mosaico a mosaico. Para el
+        contorno se omiten los mosaicos que quedan por completo dentro o
+        fuera del anillo; el relleno se calcula por bandas de filas.
+        """
+        if fill:
+            vp = self.viewport()
+            for row in self.tile_rows(yc - r, yc + r):
+                top = self.y_top - row * self.tile_size
+                band = Viewport(vp.x_min, max(top - self.tile_size + 1, vp.y_min), vp.x_max, top)
+                circle_fill_runs(xc, yc, r, band).blit(self, color)
+            return
+        for row, col in self.tiles_in(xc - r, yc - r, xc + r, yc + r):
+            fb = self.tile(row, col)
+            vp = fb.viewport()
+            near_x = min(max(xc, vp.x_min), vp.x_max) - xc
+            near_y = min(max(yc, vp.y_min), vp.y_max) - yc
+            far_x = max(abs(vp.x_min - xc), abs(vp.x_max - xc))
+            far_y = max(abs(vp.y_min - yc), abs(vp.y_max - yc))
+            if near_x * near_x + near_y * near_y > (r + 1) ** 2 or far_x * far_x + far_y * far_y < (r - 1) ** 2:
+                continue
+            fb.plot_points(midpoint_circle_cached(xc, yc, r, vp), color)
+
+    def fill_polygon(self, vertices, color="red") -> None:
+        """
+        Rellena un polígono por bandas de filas de mosaicos (ver relleno.polygon_runs).
+        """
+        v = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        vp = self.viewport()
+        for row in self.tile_rows(int(np.floor(v[:, 1].min())), int(np.ceil(v[:, 1].max()))):
+            top = self.y_top - row * self.tile_size
+            band = Viewport(vp.x_min, max(top - self.tile_size + 1, vp.y_min), vp.x_max, top)
+            polygon_runs(v, band).blit(self, color)
+
+    def row_block(self, start: int, stop: int) -> np.ndarray:
+        """
+        Filas [start, stop) del lienzo (contadas desde arriba) a todo lo
+        ancho, como arreglo (k, ancho, 4) uint8. Solo se leen los mosaicos
+        de esas filas, así que el lienzo se puede exportar por bloques.
+        """
+        t = self.tile_size
+        out = np.empty((stop - start, self.width, 4), dtype=np.uint8)
+        row = start
+        while row < stop:
+            tile_row, offset = divmod(row, t)
+            n = min(stop - row, t - offset)
+            block = self.tiles[tile_row, :, offset:offset + n]
+            out[row - start:row - start + n] = block.transpose(1, 0, 2, 3).reshape(n, -1, 4)[:, :self.width]
+            row += n
+        return out
+
+    def region(self, viewport: Viewport) -> Framebuffer:
+        """
+        Copia a un Framebuffer en memoria la parte del lienzo dentro de
+        'viewport' (por ejemplo, para mostrarla o exportarla).
+        """
+        out = Framebuffer(viewport.x_max - viewport.x_min + 1, viewport.y_max - viewport.y_min + 1,
+                          viewport.x_min, viewport.y_min)
+        for row, col in self.tiles_in(viewport.x_min, viewport.y_min, viewport.x_max, viewport.y_max):
+            fb = self.tile(row, col)
+            x_a, x_b = max(fb.x0, out.x0), min(fb.x0 + fb.width - 1, viewport.x_max)
+            y_a, y_b = max(fb.y0, out.y0), min(fb.y_top, out.y_top)
+            if x_a > x_b or y_a > y_b:
+                continue
+            out.pixels[out.y_top - y_b:out.y_top - y_a + 1, x_a - out.x0:x_b - out.x0 + 1] = \
+                fb.pixels[fb.y_top - y_b:fb.y_top - y_a + 1, x_a - fb.x0:x_b - fb.x0 + 1]
+        return out
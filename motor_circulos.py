@@ -0,0 +1,268 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+
+from nucleo import CHUNK_SIZE, midpoint_octant
+from puntos import PointBuffer
+from recorte import Viewport, circle_clipped, circle_clipped_chunks, circle_fill_clipped, octant_end, octant_y
+from tramos import SpanSet
+
+
+def _circle_pieces(xc: int, yc: int, r: int) -> list:
+    """
+    Recorre el primer octante una sola vez y devuelve los 8 tramos (xs, ys)
+    de la circunferencia (r > 0), en el orden de 'iter_circle_points'; la
+    suma de sus largos es el número de puntos.
+    """
+    octant = np.array(midpoint_octant(r), dtype=np.int64)
+    ox, oy = octant[:, 0], octant[:, 1]
+    on_diagonal = ox[-1] == oy[-1]
+    fx, fy = ox[1:], oy[1:]
+    bx, by = (ox[-2::-1], oy[-2::-1]) if on_diagonal else (ox[::-1], oy[::-1])
+
+    return [
+        (xc + ox, yc + oy),
+        (xc + by, yc + bx),
+        (xc + fy, yc - fx),
+        (xc + bx, yc - by),
+        (xc - fx, yc - fy),
+        (xc - by, yc - bx),
+        (xc - fy, yc + fx),
+        (xc - bx[:-1], yc + by[:-1]),
+    ]
+
+
+def _write_pieces(out: np.ndarray, pieces: list) -> int:
+    n = 0
+    for px, py in pieces:
+        m = len(px)
+        out[n:n + m, 0] = px
+        out[n:n + m, 1] = py
+        n += m
+    return n
+
+
+def circle_points_into(out: np.ndarray, xc: int, yc: int, r: int) -> int:
+    """
+    Escribe los píxeles de la circunferencia en un arreglo ya reservado,
+    en el mismo orden que 'iter_circle_points'.
+
+    Args:
+        out (np.ndarray): Arreglo (m, 2) con m >= circle_point_count(r).
+        xc (int): Coordenada X del centro.
+        yc (int): Coordenada Y del centro.
+        r (int): Radio del círculo.
+
+    Returns:
+        int: Número de puntos escritos.
+    """
+    if r == 0:
+        out[0] = (xc, yc)
+        return 1
+    return _write_pieces(out, _circle_pieces(xc, yc, r))
+
+
+def midpoint_circle_offsets(r: int) -> np.ndarray:
+    """
+    Calcula los desplazamientos (dx, dy) de la circunferencia de radio 'r'
+    respecto a su centro, con el algoritmo del punto medio.
+
+    El resultado solo depende de 'r': el centro es una simple traslación.
+    Cada píxel aparece una sola vez, en el orden de 'iter_circle_points'.
+    El octante se recorre una sola vez: el total sale de los tramos.
+
+    Args:
+        r (int): Radio del círculo.
+
+    Returns:
+        np.ndarray: Arreglo (n, 2) de enteros int32 con los desplazamientos.
+    """
+    if r == 0:
+        return np.zeros((1, 2), dtype=np.int32)
+    pieces = _circle_pieces(0, 0, r)
+    offsets = np.empty((sum(len(px) for px, _ in pieces), 2), dtype=np.int32)
+    _write_pieces(offsets, pieces)
+    return offsets
+
+
+def circle_fill_offsets(r: int) -> np.ndarray:
+    """
+    Tramos horizontales del relleno del círculo de radio 'r', relativos al centro.
+
+    Todas las semianchuras dx = sqrt(r² - dy²) se calculan a la vez, con el
+    mismo redondeo que round() (mitad al par).
+
+    Args:
+        r (int): Radio del círculo.
+
+    Returns:
+        np.ndarray: Arreglo (2r + 1, 3) int32 con filas (dy, -dx, dx).
+    """
+    dy = np.arange(-r, r + 1, dtype=np.int64)
+    dx = np.rint(np.sqrt(r * r - dy * dy)).astype(np.int32)
+    spans = np.empty((len(dy), 3), dtype=np.int32)
+    spans[:, 0] = dy
+    spans[:, 1] = -dx
+    spans[:, 2] = dx
+    return spans
+
+
+class CircleShapeCache:
+    """
+    Caché LRU de desplazamientos de circunferencias, indexada por radio.
+
+    Guarda un arreglo int32 compacto por radio y desaloja los radios menos
+    usados recientemente cuando el total de bytes supera 'max_bytes'; una
+    forma más grande que 'max_bytes' se calcula pero no se guarda. Dibujar
+    el mismo radio en muchos centros cuesta entonces una suma de arreglos en
+    lugar de repetir todo el recorrido del parámetro de decisión.
+
+    'compute' es la función r -> arreglo que se memoriza (por defecto, los
+    puntos de la circunferencia).
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024,
+                 compute: Callable[[int], np.ndarray] = midpoint_circle_offsets) -> None:
+        self.max_bytes = max_bytes
+        self.compute = compute
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._shapes: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+    def offsets(self, r: int) -> np.ndarray:
+        """
+        Devuelve los desplazamientos del radio 'r' (solo lectura), calculándolos
+        y guardándolos si aún no están en la caché.
+        """
+        shape = self._shapes.get(r)
+        if shape is not None:
+            self.hits += 1
+            self._shapes.move_to_end(r)
+            return shape
+
+        self.misses += 1
+        shape = self.compute(r)
+        shape.setflags(write=False)
+        # Una forma más grande que 'max_bytes' se devuelve sin guardarla
+        if shape.nbytes <= self.max_bytes:
+            self._shapes[r] = shape
+            self.nbytes += shape.nbytes
+            while self.nbytes > self.max_bytes:
+                _, old = self._shapes.popitem(last=False)
+                self.nbytes -= old.nbytes
+        return shape
+
+    def points(self, xc: int, yc: int, r: int) -> np.ndarray:
+        """
+        Devuelve una copia trasladada al centro (xc, yc) de la forma de radio 'r'.
+        """
+        return self.offsets(r) + np.array([xc, yc], dtype=np.int64)
+
+    def clear(self) -> None:
+        """
+        Vacía la caché y reinicia los contadores.
+        """
+        self._shapes.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def bypass(self):
+        """
+        Contexto en el que la caché no devuelve ni guarda formas (cada
+        llamada las calcula enteras); al salir se restauran su contenido y
+        sus contadores. Sirve para medir el costo sin caché.
+        """
+        saved = (self._shapes, self.nbytes, self.hits, self.misses, self.max_bytes)
+        self._shapes = OrderedDict()
+        self.nbytes = 0
+        self.max_bytes = 0
+        try:
+            yield self
+        finally:
+            self._shapes, self.nbytes, self.hits, self.misses, self.max_bytes = saved
+
+
+# Cachés compartidas por las aplicaciones
+shape_cache = CircleShapeCache()
+span_cache = CircleShapeCache(compute=circle_fill_offsets)
+
+
+def midpoint_circle_cached(xc: int, yc: int, r: int, viewport: Optional[Viewport] = None) -> np.ndarray:
+    """
+    Puntos (n, 2) de la circunferencia de centro (xc, yc) y radio 'r',
+    usando la caché compartida de formas.
+
+    Con 'viewport', si el círculo no cabe entero en él, solo se generan los
+    puntos visibles (ver recorte.circle_clipped) y no se usa la caché.
+    """
+    if viewport is not None and not viewport.contains_box(xc - r, yc - r, xc + r, yc + r):
+        return circle_clipped(xc, yc, r, viewport)
+    return shape_cache.points(xc, yc, r)
+
+
+def circle_fill_spans(xc: int, yc: int, r: int, viewport: Optional[Viewport] = None) -> np.ndarray:
+    """
+    Tramos (y, x_start, x_end) del relleno del círculo de centro (xc, yc),
+    usando la caché compartida de tramos por radio.
+
+    El resultado se puede pintar en un framebuffer con 'fill_spans' o
+    dibujar en matplotlib con una sola llamada a 'hlines' (una LineCollection).
+    Con 'viewport' solo se calculan las filas visibles, recortadas a sus bordes.
+    """
+    if viewport is not None and not viewport.contains_box(xc - r, yc - r, xc + r, yc + r):
+        return circle_fill_clipped(xc, yc, r, viewport)
+    return span_cache.offsets(r) + np.array([yc, xc, xc], dtype=np.int64)
+
+
+def circle_fill_runs(xc: int, yc: int, r: int, viewport: Optional[Viewport] = None) -> SpanSet:
+    """
+    Relleno del círculo como SpanSet (una fila por tramo), a partir de
+    'circle_fill_spans', que ya da los tramos ordenados y disjuntos.
+    """
+    return SpanSet.from_array(circle_fill_spans(xc, yc, r, viewport), normalize=False)
+
+
+def circle_total(r: int) -> int:
+    """
+    Número de puntos de la circunferencia (igual que 'circle_point_count'),
+    con la última columna del octante en forma cerrada: O(log r).
+    """
+    if r == 0:
+        return 1
+    last = octant_end(r)
+    return 8 * (last + 1) - 4 - 4 * (last == octant_y(r, last))
+
+
+def circle_chunks(xc: int, yc: int, r: int, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Versión en streaming de la circunferencia: bloques (k, 2) de enteros de
+    a lo sumo 'chunk_size' puntos, en el orden de 'iter_circle_chunks', con
+    memoria acotada por el tamaño del bloque y no por el radio. Cada bloque
+    se evalúa vectorizado con la forma cerrada del octante (ver
+    recorte.circle_clipped_chunks sobre la caja del círculo).
+    """
+    yield from circle_clipped_chunks(xc, yc, r, Viewport(xc - r, yc - r, xc + r, yc + r), chunk_size)
+
+
+def circle_progressive(xc: int, yc: int, r: int, viewport: Optional[Viewport] = None,
+                       chunk_size: int = CHUNK_SIZE) -> Iterator[PointBuffer]:
+    """
+    Versión progresiva de 'midpoint_circle_cached': produce, tras cada bloque,
+    un PointBuffer con los puntos calculados hasta ese momento (en orden
+    angular). El total y cada bloque salen de la forma cerrada del octante
+    (recorte.octant_y), así que ni siquiera el conteo inicial recorre todo
+    el radio y el trabajo se puede interrumpir entre bloques.
+    """
+    if viewport is not None and not viewport.contains_box(xc - r, yc - r, xc + r, yc + r):
+        yield PointBuffer(circle_clipped(xc, yc, r, viewport))
+        return
+    points = PointBuffer.empty(circle_total(r), np.int64)
+    n = 0
+    for chunk in circle_chunks(xc, yc, r, chunk_size):
+        points.data[n:n + len(chunk)] = chunk
+        n += len(chunk)
+        yield points[:n]
@@ -0,0 +1,486 @@
+import numpy as np
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from nucleo import CHUNK_SIZE
+from puntos import PointBuffer
+from recorte import Viewport, bresenham_clipped, dda_clipped
+
+
+def dda_batch(segments) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ejecuta el algoritmo DDA sobre muchos segmentos en una sola llamada.
+
+    Cada fila de 'segments' es (x1, y1, x2, y2). Los puntos se obtienen con
+    la misma acumulación que 'dda_algorithm' (x += x_inc en cada paso), pero
+    calculada con np.cumsum, que suma de forma secuencial; así los valores
+    flotantes y el redondeo (mitad al par, igual que round()) coinciden
+    exactamente con la versión de un solo segmento.
+
+    Para no iterar por píxel, los segmentos se agrupan por potencias de 2
+    de su número de pasos; cada grupo se rellena hasta su longitud máxima,
+    se acumula en bloque y se descartan las posiciones de relleno.
+
+    Args:
+        segments: Arreglo (N, 4) con los extremos de cada segmento.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            - Puntos enteros (M, 2) de todos los segmentos, concatenados.
+            - Puntos flotantes (M, 2) en el mismo orden.
+            - Offsets (N + 1,): los puntos del segmento i son
+              points[offsets[i]:offsets[i + 1]].
+    """
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    x1, y1, x2, y2 = seg.T
+    dx = x2 - x1
+    dy = y2 - y1
+    steps = np.maximum(np.abs(dx), np.abs(dy))
+
+    # Evitar división entre 0 en segmentos de un solo punto
+    safe_steps = np.where(steps == 0, 1.0, steps)
+    x_inc = np.where(steps == 0, 0.0, dx / safe_steps)
+    y_inc = np.where(steps == 0, 0.0, dy / safe_steps)
+
+    counts = steps.astype(np.int64) + 1
+    offsets = np.zeros(len(seg) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    points_float = np.empty((offsets[-1], 2), dtype=np.float64)
+    buckets = np.frexp(counts.astype(np.float64))[1]
+    for bucket in np.unique(buckets):
+        idx = np.nonzero(buckets == bucket)[0]
+        width = int(counts[idx].max())
+
+        block = np.empty((len(idx), width, 2), dtype=np.float64)
+        block[:, 0, 0] = x1[idx]
+        block[:, 0, 1] = y1[idx]
+        block[:, 1:, 0] = x_inc[idx, None]
+        block[:, 1:, 1] = y_inc[idx, None]
+        np.cumsum(block, axis=1, out=block)
+
+        cols = np.arange(width)
+        valid = cols < counts[idx, None]
+        positions = offsets[idx, None] + cols
+        points_float[positions[valid]] = block[valid]
+
+    points_int = np.rint(points_float).astype(np.int64)
+    return points_int, points_float, offsets
+
+
+def bresenham_points(x1: int, y1: int, x2: int, y2: int) -> List[Tuple[int, int]]:
+    """
+    Algoritmo de Bresenham (solo aritmética entera) para los 8 octantes.
+
+    Se avanza un píxel por paso en el eje mayor y el parámetro de decisión
+    entero 'p' indica cuándo avanzar en el eje menor, por lo que no hay
+    acumulación de error flotante sin importar la longitud de la línea.
+
+    Fórmulas utilizadas (eje mayor 'dM', eje menor 'dm'):
+        - Valor de decisión inicial: p0 = 2dm - dM
+        - Si p > 0: se avanza en el eje menor y p = p - 2dM
+        - En cada paso: p = p + 2dm
+
+    Args:
+        x1 (int): Coordenada X inicial.
+        y1 (int): Coordenada Y inicial.
+        x2 (int): Coordenada X final.
+        y2 (int): Coordenada Y final.
+
+    Returns:
+        List[Tuple[int, int]]: Puntos (x, y) de la línea, del inicio al final.
+    """
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    sx = 1 if x2 >= x1 else -1
+    sy = 1 if y2 >= y1 else -1
+    x, y = x1, y1
+    points = []
+
+    if dx >= dy:
+        p = 2 * dy - dx
+        for _ in range(dx + 1):
+            points.append((x, y))
+            if p > 0:
+                y += sy
+                p -= 2 * dx
+            p += 2 * dy
+            x += sx
+    else:
+        p = 2 * dx - dy
+        for _ in range(dy + 1):
+            points.append((x, y))
+            if p > 0:
+                x += sx
+                p -= 2 * dy
+            p += 2 * dx
+            y += sy
+
+    return points
+
+
+def bresenham_array(x1: int, y1: int, x2: int, y2: int) -> np.ndarray:
+    """
+    Versión con arreglos de 'bresenham_points'.
+
+    El número de pasos en el eje menor tras i pasos en el eje mayor tiene
+    forma cerrada: (2·i·dm + dM - 1) // (2·dM), que es exactamente lo que
+    acumula el parámetro de decisión. Así se calculan todos los píxeles a
+    la vez con enteros, sin bucle de Python.
+
+    Args:
+        x1 (int): Coordenada X inicial.
+        y1 (int): Coordenada Y inicial.
+        x2 (int): Coordenada X final.
+        y2 (int): Coordenada Y final.
+
+    Returns:
+        np.ndarray: Arreglo (n, 2) de enteros con los puntos de la línea.
+    """
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    sx = 1 if x2 >= x1 else -1
+    sy = 1 if y2 >= y1 else -1
+    major, minor = (dx, dy) if dx >= dy else (dy, dx)
+
+    i = np.arange(major + 1, dtype=np.int64)
+    if major == 0:
+        minor_steps = np.zeros_like(i)
+    else:
+        minor_steps = (2 * i * minor + major - 1) // (2 * major)
+
+    points = np.empty((major + 1, 2), dtype=np.int64)
+    if dx >= dy:
+        points[:, 0] = x1 + sx * i
+        points[:, 1] = y1 + sy * minor_steps
+    else:
+        points[:, 0] = x1 + sx * minor_steps
+        points[:, 1] = y1 + sy * i
+    return points
+
+
+def bresenham_algorithm(x1: int, y1: int, x2: int, y2: int):
+    """
+    Igual interfaz que 'dda_algorithm': (puntos enteros, puntos flotantes, dx, dy).
+
+    Los puntos "flotantes" son los mismos píxeles enteros convertidos a
+    float, para que la gráfica y la lista de coordenadas no cambien.
+    """
+    points_int = bresenham_points(x1, y1, x2, y2)
+    points_float = [(float(x), float(y)) for x, y in points_int]
+    return points_int, points_float, x2 - x1, y2 - y1
+
+
+def bresenham_batch(segments) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Versión por lotes de 'bresenham_array' para muchos segmentos enteros.
+
+    Todos los píxeles se obtienen con la misma forma cerrada entera, sin
+    bucle por segmento ni por píxel.
+
+    Args:
+        segments: Arreglo (N, 4) de enteros con los extremos de cada segmento.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]:
+            - Puntos (M, 2) de todos los segmentos, concatenados.
+            - Offsets (N + 1,) como en 'dda_batch'.
+    """
+    seg = np.asarray(segments, dtype=np.int64).reshape(-1, 4)
+    x1, y1, x2, y2 = seg.T
+    dx = np.abs(x2 - x1)
+    dy = np.abs(y2 - y1)
+    sx = np.where(x2 >= x1, 1, -1)
+    sy = np.where(y2 >= y1, 1, -1)
+    x_major = dx >= dy
+    major = np.maximum(dx, dy)
+    minor = np.minimum(dx, dy)
+
+    counts = major + 1
+    offsets = np.zeros(len(seg) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    owner = np.repeat(np.arange(len(seg)), counts)
+    i = np.arange(offsets[-1], dtype=np.int64) - offsets[owner]
+    m_major = major[owner]
+    # Los segmentos de un solo punto (m_major == 0) no avanzan en el eje menor
+    minor_steps = (2 * i * minor[owner] + np.maximum(m_major - 1, 0)) // np.maximum(2 * m_major, 1)
+
+    along_x = x_major[owner]
+    points = np.empty((offsets[-1], 2), dtype=np.int64)
+    points[:, 0] = x1[owner] + sx[owner] * np.where(along_x, i, minor_steps)
+    points[:, 1] = y1[owner] + sy[owner] * np.where(along_x, minor_steps, i)
+    return points, offsets
+
+
+def dda_chunks(x1, y1, x2, y2, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Versión en streaming de 'dda_batch' para un segmento: produce bloques
+    (puntos enteros (k, 2), puntos flotantes (k, 2)) de a lo sumo
+    'chunk_size' puntos.
+
+    Cada bloque se acumula con np.cumsum partiendo del último valor del
+    bloque anterior más el incremento, igual que el bucle x += x_inc, así
+    que los valores coinciden exactamente con 'dda_algorithm'.
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    steps = max(abs(dx), abs(dy))
+    total = int(steps) + 1
+    inc = np.array([dx / steps, dy / steps]) if steps else np.zeros(2)
+
+    start = np.array([x1, y1], dtype=np.float64)
+    done = 0
+    while done < total:
+        n = min(chunk_size, total - done)
+        block = np.empty((n, 2), dtype=np.float64)
+        block[0] = start
+        block[1:] = inc
+        np.cumsum(block, axis=0, out=block)
+        start = block[-1] + inc
+        done += n
+        yield np.rint(block).astype(np.int64), block
+
+
+def bresenham_chunks(x1: int, y1: int, x2: int, y2: int,
+                     chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Versión en streaming de 'bresenham_array': bloques (k, 2) de a lo sumo
+    'chunk_size' puntos, calculados con la misma forma cerrada entera.
+    """
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    sx = 1 if x2 >= x1 else -1
+    sy = 1 if y2 >= y1 else -1
+    major, minor = (dx, dy) if dx >= dy else (dy, dx)
+
+    for first in range(0, major + 1, chunk_size):
+        i = np.arange(first, min(first + chunk_size, major + 1), dtype=np.int64)
+        if major == 0:
+            minor_steps = np.zeros_like(i)
+        else:
+            minor_steps = (2 * i * minor + major - 1) // (2 * major)
+        points = np.empty((len(i), 2), dtype=np.int64)
+        if dx >= dy:
+            points[:, 0] = x1 + sx * i
+            points[:, 1] = y1 + sy * minor_steps
+        else:
+            points[:, 0] = x1 + sx * minor_steps
+            points[:, 1] = y1 + sy * i
+        yield points
+
+
+def dda_buffers(x1, y1, x2, y2, viewport: Optional[Viewport] = None):
+    """
+    Igual interfaz que 'dda_algorithm', pero con PointBuffer compactos:
+    (puntos enteros int32, puntos flotantes float64, dx, dy).
+
+    Los bloques de 'dda_chunks' se copian directamente a buffers reservados
+    de antemano, sin listas de tuplas intermedias. Con 'viewport' la línea
+    se recorta antes de avanzar (ver recorte.dda_clipped).
+    """
+    if viewport is not None:
+        points_int, points_float = dda_clipped(x1, y1, x2, y2, viewport)
+        return (PointBuffer(points_int.astype(np.int32)), PointBuffer(points_float),
+                x2 - x1, y2 - y1)
+    total = int(max(abs(x2 - x1), abs(y2 - y1))) + 1
+    points_int = PointBuffer.empty(total, np.int32)
+    points_float = PointBuffer.empty(total, np.float64)
+    n = 0
+    for chunk_int, chunk_float in dda_chunks(x1, y1, x2, y2):
+        points_int.data[n:n + len(chunk_int)] = chunk_int
+        points_float.data[n:n + len(chunk_float)] = chunk_float
+        n += len(chunk_int)
+    return points_int, points_float, x2 - x1, y2 - y1
+
+
+def bresenham_buffers(x1: int, y1: int, x2: int, y2: int, viewport: Optional[Viewport] = None):
+    """
+    Igual interfaz que 'bresenham_algorithm', con un único PointBuffer int32
+    que sirve a la vez de puntos enteros y "flotantes" (son los mismos píxeles).
+    Con 'viewport' solo se evalúan los pasos visibles.
+    """
+    if viewport is not None:
+        points = PointBuffer(bresenham_clipped(x1, y1, x2, y2, viewport).astype(np.int32))
+        return points, points, x2 - x1, y2 - y1
+    total = max(abs(x2 - x1), abs(y2 - y1)) + 1
+    points = PointBuffer.from_chunks(bresenham_chunks(x1, y1, x2, y2), total, np.int32)
+    return points, points, x2 - x1, y2 - y1
+
+
+def dda_progressive(x1, y1, x2, y2, viewport: Optional[Viewport] = None,
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[tuple]:
+    """
+    Versión progresiva de 'dda_buffers': rellena los buffers bloque a bloque
+    y tras cada bloque produce (puntos enteros, puntos flotantes, dx, dy)
+    con los puntos calculados hasta ese momento (vistas, sin copia). Pensada
+    para mostrar resultados parciales mientras el cálculo sigue en otro hilo.
+    """
+    if viewport is not None:
+        yield dda_buffers(x1, y1, x2, y2, viewport)
+        return
+    total = int(max(abs(x2 - x1), abs(y2 - y1))) + 1
+    points_int = PointBuffer.empty(total, np.int32)
+    points_float = PointBuffer.empty(total, np.float64)
+    n = 0
+    for chunk_int, chunk_float in dda_chunks(x1, y1, x2, y2, chunk_size):
+        points_int.data[n:n + len(chunk_int)] = chunk_int
+        points_float.data[n:n + len(chunk_float)] = chunk_float
+        n += len(chunk_int)
+        yield points_int[:n], points_float[:n], x2 - x1, y2 - y1
+
+
+def bresenham_progressive(x1: int, y1: int, x2: int, y2: int, viewport: Optional[Viewport] = None,
+                          chunk_size: int = CHUNK_SIZE) -> Iterator[tuple]:
+    """
+    Versión progresiva de 'bresenham_buffers' (ver 'dda_progressive').
+    """
+    if viewport is not None:
+        yield bresenham_buffers(x1, y1, x2, y2, viewport)
+        return
+    total = max(abs(x2 - x1), abs(y2 - y1)) + 1
+    points = PointBuffer.empty(total, np.int32)
+    n = 0
+    for chunk in bresenham_chunks(x1, y1, x2, y2, chunk_size):
+        points.data[n:n + len(chunk)] = chunk
+        n += len(chunk)
+        yield points[:n], points[:n], x2 - x1, y2 - y1
+
+
+def bresenham_pattern(major: int, minor: int) -> np.ndarray:
+    """
+    Desplazamientos de Bresenham del segmento canónico de (0, 0) a
+    (major, minor), con major >= minor >= 0 (forma cerrada de 'bresenham_array').
+
+    Returns:
+        np.ndarray: Arreglo (n, 2) int32; la columna 0 es el eje mayor.
+    """
+    return bresenham_array(0, 0, major, minor).astype(np.int32)
+
+
+_PATTERNS = {"Bresenham": bresenham_pattern}
+
+
+class LinePatternCache:
+    """
+    Caché LRU de patrones de línea, indexada por motor y dirección.
+
+    Los píxeles de Bresenham solo dependen de (dx, dy): el punto inicial es
+    una traslación entera. Además el motor es simétrico por octantes
+    (cambiar el signo de dx o dy, o intercambiar los ejes, refleja el
+    patrón), así que se guarda un solo patrón canónico por
+    (|eje mayor|, |eje menor|) y las ocho direcciones reflejadas lo
+    comparten. Un trazo repetido cuesta entonces un cambio de signo y una
+    suma de arreglos en lugar de repetir el recorrido.
+
+    DDA no se memoriza: acumula flotantes desde (x1, y1), así que el
+    redondeo depende del inicio y un patrón trasladado no da los mismos
+    píxeles que 'dda_algorithm' (ver 'dda_buffers', que sí es exacto).
+
+    Se desalojan los patrones menos usados cuando el total supera
+    'max_bytes'; un patrón más grande que 'max_bytes' se calcula pero no
+    se guarda.
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._patterns: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+
+    def pattern(self, engine: str, major, minor) -> np.ndarray:
+        """
+        Patrón canónico (solo lectura) del motor para major >= minor >= 0.
+        """
+        key = (engine, major, minor)
+        pattern = self._patterns.get(key)
+        if pattern is not None:
+            self.hits += 1
+            self._patterns.move_to_end(key)
+            return pattern
+
+        self.misses += 1
+        pattern = _PATTERNS[engine](major, minor)
+        pattern.setflags(write=False)
+        if pattern.nbytes <= self.max_bytes:
+            self._patterns[key] = pattern
+            self.nbytes += pattern.nbytes
+            while self.nbytes > self.max_bytes:
+                _, old = self._patterns.popitem(last=False)
+                self.nbytes -= old.nbytes
+        return pattern
+
+    def offsets(self, engine: str, dx, dy) -> np.ndarray:
+        """
+        Desplazamientos (n, 2) del segmento de dirección (dx, dy), como
+        vista reflejada del patrón canónico.
+        """
+        swap = abs(dy) > abs(dx)
+        major, minor = (abs(dy), abs(dx)) if swap else (abs(dx), abs(dy))
+        pattern = self.pattern(engine, major, minor)
+        oriented = pattern[:, ::-1] if swap else pattern
+        signs = (-1 if dx < 0 else 1, -1 if dy < 0 else 1)
+        return oriented if signs == (1, 1) else oriented * np.array(signs, dtype=pattern.dtype)
+
+    def line(self, engine: str, x1, y1, x2, y2) -> np.ndarray:
+        """
+        Puntos (n, 2) enteros del segmento.
+        """
+        offsets = self.offsets(engine, x2 - x1, y2 - y1)
+        return offsets + np.array([x1, y1], dtype=np.int64)
+
+    def clear(self) -> None:
+        """
+        Vacía la caché y reinicia los contadores.
+        """
+        self._patterns.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def bypass(self):
+        """
+        Contexto en el que la caché no devuelve ni guarda patrones; al salir
+        se restauran su contenido y sus contadores (ver
+        motor_circulos.CircleShapeCache.bypass).
+        """
+        saved = (self._patterns, self.nbytes, self.hits, self.misses, self.max_bytes)
+        self._patterns = OrderedDict()
+        self.nbytes = 0
+        self.max_bytes = 0
+        try:
+            yield self
+        finally:
+            self._patterns, self.nbytes, self.hits, self.misses, self.max_bytes = saved
+
+
+# Caché compartida por las aplicaciones
+pattern_cache = LinePatternCache()
+
+
+def dda_float_points(x1, y1, x2, y2) -> np.ndarray:
+    """
+    Igual que 'dda_algorithm_float' (puntos flotantes), como arreglo (n, 2),
+    con la acumulación exacta de 'dda_chunks'.
+    """
+    return dda_buffers(x1, y1, x2, y2)[1].data
+
+
+def bresenham_points_cached(x1: int, y1: int, x2: int, y2: int) -> np.ndarray:
+    """
+    Igual que 'bresenham_points', como arreglo (n, 2) de enteros y usando
+    la caché compartida de patrones.
+    """
+    return pattern_cache.line("Bresenham", x1, y1, x2, y2)
+
+
+def bresenham_cached(x1: int, y1: int, x2: int, y2: int, viewport: Optional[Viewport] = None):
+    """
+    Igual interfaz que 'bresenham_buffers', usando la caché compartida de patrones.
+    """
+    if viewport is not None:
+        return bresenham_buffers(x1, y1, x2, y2, viewport)
+    points = PointBuffer(pattern_cache.line("Bresenham", x1, y1, x2, y2).astype(np.int32))
+    return points, points, x2 - x1, y2 - y1
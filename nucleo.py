@@ -0,0 +1,290 @@
+"""
+Núcleo de los algoritmos de rasterización, sin interfaz gráfica.
+
+Este módulo no importa Tkinter, matplotlib ni NumPy, así que se puede usar
+sin pantalla (trabajos por lotes, pruebas) y se carga en milisegundos. Las
+versiones vectorizadas viven en motor_lineas, motor_circulos y relleno, y
+se importan solo cuando se piden los rellenos.
+"""
+from typing import Iterator, List, Tuple
+
+
+# Tamaño de bloque por defecto de las variantes en streaming (puntos por bloque)
+CHUNK_SIZE = 65536
+
+
+# Algoritmo DDA en streaming: produce bloques de a lo sumo 'chunk_size'
+# puntos (listas entera y flotante), con memoria acotada sin importar la
+# longitud de la línea. La acumulación x += x_inc continúa entre bloques,
+# así que los valores son idénticos a los de la versión sin bloques.
+def iter_dda_chunks(x1, y1, x2, y2, chunk_size=CHUNK_SIZE):
+    dx = x2 - x1
+    dy = y2 - y1
+    steps = max(abs(dx), abs(dy))
+    
+    # Evitar división entre 0 si x1 == x2 y y1 == y2 (línea de un solo punto)
+    if steps == 0:
+        yield [(x1, y1)], [(float(x1), float(y1))]
+        return
+    
+    x_inc = dx / steps
+    y_inc = dy / steps
+    
+    x, y = x1, y1
+    remaining = int(steps) + 1
+    
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        points_int = []    # Puntos con round (enteros)
+        points_float = []  # Puntos en flotante
+        for _ in range(n):
+            points_int.append((round(x), round(y)))
+            points_float.append((x, y))
+            x += x_inc
+            y += y_inc
+        remaining -= n
+        yield points_int, points_float
+
+
+# Función para el algoritmo DDA (dos listas: entero y flotante)
+def dda_algorithm(x1, y1, x2, y2):
+    points_int = []
+    points_float = []
+    for chunk_int, chunk_float in iter_dda_chunks(x1, y1, x2, y2):
+        points_int.extend(chunk_int)
+        points_float.extend(chunk_float)
+    return points_int, points_float, x2 - x1, y2 - y1
+
+
+def dda_algorithm_float(x1, y1, x2, y2):
+    """
+    Versión de DDA que devuelve puntos en float,
+    para que la línea se vea suave (sin 'escalones').
+    """
+    points = []
+    for _, chunk_float in iter_dda_chunks(x1, y1, x2, y2):
+        points.extend(chunk_float)
+    return points
+
+
+# Función para clasificar el caso de la pendiente
+def classify_case(dx, dy):
+    if dx == 0:
+        return "Pendiente indefinida (línea vertical)", None
+    m = dy / dx
+    if m > 1:
+        return "Pendiente positiva > 1", m
+    elif 0 < m <= 1:
+        return "Pendiente positiva <= 1", m
+    elif -1 <= m < 0:
+        return "Pendiente negativa >= -1", m
+    elif m < -1:
+        return "Pendiente negativa < -1", m
+    else:
+        # m == 0
+        return "Pendiente 0 (línea horizontal)", m
+
+
+# Pendiente de un segmento (None si es vertical)
+def calculate_slope(x1, y1, x2, y2):
+    if (x2 - x1) != 0:
+        return (y2 - y1) / (x2 - x1)
+    return None
+
+
+def midpoint_octant(r: int) -> List[Tuple[int, int]]:
+    """
+    Recorre el primer octante (de (0, r) hacia la diagonal x == y) con el
+    algoritmo del punto medio.
+
+    Args:
+        r (int): Radio del círculo.
+
+    Returns:
+        List[Tuple[int, int]]: Puntos (x, y) del octante con x creciente.
+    """
+    octant = []
+    x = 0
+    y = r
+    p = 1 - r  # Valor de decisión inicial
+    while x <= y:
+        octant.append((x, y))
+        if p < 0:
+            p += 2 * x + 3
+        else:
+            p += 2 * x - 2 * y + 5
+            y -= 1
+        x += 1
+    return octant
+
+
+def _octant_checkpoints(r: int, block: int) -> Tuple[List[Tuple[int, int, int]], Tuple[int, int]]:
+    """
+    Recorre el primer octante guardando solo el estado (x, y, p) al inicio de
+    cada bloque de 'block' puntos, y devuelve además el último punto.
+
+    Con estos puntos de control cualquier bloque se puede regenerar (y
+    recorrer al revés) sin guardar el octante completo.
+    """
+    states = []
+    x = 0
+    y = r
+    p = 1 - r  # Valor de decisión inicial
+    last = (x, y)
+    while x <= y:
+        if x % block == 0:
+            states.append((x, y, p))
+        last = (x, y)
+        if p < 0:
+            p += 2 * x + 3
+        else:
+            p += 2 * x - 2 * y + 5
+            y -= 1
+        x += 1
+    return states, last
+
+
+def _octant_block(state: Tuple[int, int, int], block: int) -> List[Tuple[int, int]]:
+    """
+    Regenera hasta 'block' puntos del octante a partir de un punto de control.
+    """
+    x, y, p = state
+    points = []
+    while x <= y and len(points) < block:
+        points.append((x, y))
+        if p < 0:
+            p += 2 * x + 3
+        else:
+            p += 2 * x - 2 * y + 5
+            y -= 1
+        x += 1
+    return points
+
+
+def _octant_forward(states, block: int, skip_axis: bool) -> Iterator[Tuple[int, int]]:
+    # Octante de (0, r) hacia la diagonal; 'skip_axis' omite el punto x == 0
+    for k, state in enumerate(states):
+        points = _octant_block(state, block)
+        yield from (points[1:] if k == 0 and skip_axis else points)
+
+
+def _octant_backward(states, block: int, skip_diagonal: bool, skip_axis: bool) -> Iterator[Tuple[int, int]]:
+    # Octante de la diagonal hacia (0, r); omite el punto de la diagonal
+    # (si cae en x == y) y, con 'skip_axis', el punto x == 0 final
+    for k in range(len(states) - 1, -1, -1):
+        points = _octant_block(states[k], block)[::-1]
+        if k == len(states) - 1 and skip_diagonal:
+            points = points[1:]
+        if k == 0 and skip_axis:
+            points = points[:-1]
+        yield from points
+
+
+def circle_point_count(r: int) -> int:
+    """
+    Número de píxeles distintos de la circunferencia de radio 'r'.
+
+    Cada uno de los 8 octantes aporta los n puntos del primero, menos los
+    4 puntos de los ejes (x == 0) compartidos por dos octantes y, si el
+    octante termina en la diagonal (x == y), otros 4 puntos compartidos.
+    """
+    if r == 0:
+        return 1
+    _, last = _octant_checkpoints(r, CHUNK_SIZE)
+    on_diagonal = last[0] == last[1]
+    return 8 * (last[0] + 1) - 4 - 4 * on_diagonal
+
+
+def iter_circle_chunks(xc: int, yc: int, r: int,
+                       chunk_size: int = CHUNK_SIZE) -> Iterator[List[Tuple[int, int]]]:
+    """
+    Genera cada píxel de la circunferencia exactamente una vez, en orden
+    angular (sentido horario empezando en (xc, yc + r)), en bloques de a lo
+    sumo 'chunk_size' puntos y sin set() ni sort().
+
+    Los octantes se recorren alternando sentido para que el orden sea
+    continuo; en los bordes se omiten de forma explícita los puntos ya
+    emitidos: el de x == 0 al empezar un octante y el de la diagonal
+    x == y al terminarlo. Los octantes que van hacia atrás se regeneran
+    bloque a bloque desde puntos de control, así que la memoria queda
+    acotada por 'chunk_size' y no por el radio.
+
+    Args:
+        xc (int): Coordenada X del centro.
+        yc (int): Coordenada Y del centro.
+        r (int): Radio del círculo.
+        chunk_size (int, optional): Número máximo de puntos por bloque.
+
+    Yields:
+        List[Tuple[int, int]]: Bloques de puntos (x, y) de la circunferencia.
+    """
+    if r == 0:
+        yield [(xc, yc)]
+        return
+
+    states, last = _octant_checkpoints(r, chunk_size)
+    on_diagonal = last[0] == last[1]
+
+    def forward(skip_axis=True):
+        return _octant_forward(states, chunk_size, skip_axis)
+
+    def backward(skip_axis=False):
+        return _octant_backward(states, chunk_size, on_diagonal, skip_axis)
+
+    octants = [
+        ((xc + x, yc + y) for x, y in forward(skip_axis=False)),
+        ((xc + y, yc + x) for x, y in backward()),
+        ((xc + y, yc - x) for x, y in forward()),
+        ((xc + x, yc - y) for x, y in backward()),
+        ((xc - x, yc - y) for x, y in forward()),
+        ((xc - y, yc - x) for x, y in backward()),
+        ((xc - y, yc + x) for x, y in forward()),
+        ((xc - x, yc + y) for x, y in backward(skip_axis=True)),  # (xc, yc + r) ya fue el primero
+    ]
+    chunk = []
+    for octant in octants:
+        for point in octant:
+            chunk.append(point)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_circle_points(xc: int, yc: int, r: int) -> Iterator[Tuple[int, int]]:
+    """
+    Genera los píxeles de la circunferencia uno a uno, en el orden de
+    'iter_circle_chunks'.
+    """
+    for chunk in iter_circle_chunks(xc, yc, r):
+        yield from chunk
+
+
+def midpoint_circle_algorithm(xc: int, yc: int, r: int) -> List[Tuple[int, int]]:
+    """
+    Puntos de la circunferencia (algoritmo del punto medio), sin repetidos
+    y en orden angular.
+    """
+    points = []
+    for chunk in iter_circle_chunks(xc, yc, r):
+        points.extend(chunk)
+    return points
+
+
+def fill_circle_spans(xc: int, yc: int, r: int):
+    """
+    Tramos (y, x_start, x_end) del relleno del círculo, con
+    dx = sqrt(r² - (y - yc)²) en cada fila (ver motor_circulos).
+    """
+    from motor_circulos import circle_fill_spans
+    return circle_fill_spans(xc, yc, r)
+
+
+def fill_triangle_spans(tri_points, engine: str = "DDA") -> List[Tuple[int, int, int, int]]:
+    """
+    Tabla de intersecciones (x_min, y, x_max, y) del relleno scanline del
+    triángulo (ver relleno.triangle_spans).
+    """
+    from relleno import triangle_spans
+    return triangle_spans(tri_points, engine)
@@ -0,0 +1,223 @@
+import os
+from multiprocessing import Pool, shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from motor_circulos import shape_cache
+from motor_lineas import bresenham_batch, dda_batch
+from raster import Framebuffer
+from relleno import fill_triangles
+
+# Orden de dibujo de las capas (cada capa termina antes de empezar la
+# siguiente) y color por defecto de cada una
+LAYERS = ("triangles", "circles", "lines")
+DEFAULT_COLORS = {"triangles": "red", "circles": "green", "lines": "blue"}
+
+# Píxeles (aprox.) que calcula una tarea: acota la memoria de cada lote
+TASK_POINTS = 1 << 21
+
+# Estado de cada proceso trabajador (se asigna en '_init_worker')
+_worker: Dict[str, object] = {}
+
+
+class SharedFramebuffer:
+    """
+    Framebuffer cuyo arreglo de píxeles vive en un bloque de
+    'multiprocessing.shared_memory'.
+
+    El proceso principal lo crea (y lo libera al salir del 'with'); cada
+    trabajador lo abre por nombre con 'attach(spec)' y pinta directamente
+    en la misma memoria, así que ningún punto se serializa entre procesos.
+    """
+    def __init__(self, template: Framebuffer) -> None:
+        nbytes = template.pixels.nbytes
+        self.shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        pixels = np.ndarray(template.pixels.shape, dtype=np.uint8, buffer=self.shm.buf)
+        pixels[...] = template.pixels
+        self.fb = Framebuffer(template.width, template.height, template.x0, template.y0,
+                              scale=template.scale, pixels=pixels)
+
+    @property
+    def spec(self) -> Tuple[str, int, int, int, int, int]:
+        """
+        Lo necesario para abrir el lienzo desde otro proceso.
+        """
+        fb = self.fb
+        return (self.shm.name, fb.width, fb.height, fb.x0, fb.y0, fb.scale)
+
+    @staticmethod
+    def attach(spec) -> Tuple[shared_memory.SharedMemory, Framebuffer]:
+        """
+        Abre un lienzo compartido por su 'spec'. Hay que conservar el
+        SharedMemory devuelto mientras se use el Framebuffer.
+        """
+        name, width, height, x0, y0, scale = spec
+        shm = shared_memory.SharedMemory(name=name)
+        pixels = np.ndarray((height, width, 4), dtype=np.uint8, buffer=shm.buf)
+        return shm, Framebuffer(width, height, x0, y0, scale=scale, pixels=pixels)
+
+    def close(self) -> None:
+        # Las vistas NumPy deben soltarse antes de cerrar el bloque
+        self.fb = None
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedFramebuffer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def scene_bounds(lines, circles, triangles) -> Tuple[int, int, int, int]:
+    """
+    Rectángulo entero (x_min, y_min, x_max, y_max) que contiene la escena.
+    """
+    boxes = []
+    if len(lines):
+        boxes.append(np.vstack([lines[:, :2], lines[:, 2:]]))
+    if len(circles):
+        r = np.abs(circles[:, 2:3])
+        boxes.append(np.vstack([circles[:, :2] - r, circles[:, :2] + r]))
+    if len(triangles):
+        boxes.append(triangles.reshape(-1, 2))
+    if not boxes:
+        return (0, 0, 0, 0)
+    pts = np.vstack(boxes)
+    x_min, y_min = np.floor(pts.min(axis=0)).astype(int).tolist()
+    x_max, y_max = np.ceil(pts.max(axis=0)).astype(int).tolist()
+    return (x_min, y_min, x_max, y_max)
+
+
+def _weights(layer: str, items: np.ndarray) -> np.ndarray:
+    # Píxeles aproximados que genera cada primitiva
+    if layer == "lines":
+        return np.maximum(np.abs(items[:, 2] - items[:, 0]), np.abs(items[:, 3] - items[:, 1])) + 1
+    if layer == "circles":
+        return 6 * np.abs(items[:, 2]) + 1
+    size = items.max(axis=1) - items.min(axis=1)
+    return 2 * (size[:, 0] + size[:, 1]) + 1
+
+
+def partition(weights: np.ndarray, parts: int, max_weight: int = TASK_POINTS) -> List[Tuple[int, int]]:
+    """
+    Divide los índices 0..n en rangos contiguos [inicio, fin) de peso
+    parecido: al menos 'parts' rangos y ninguno (salvo una primitiva sola)
+    con más de 'max_weight' de peso.
+    """
+    n = len(weights)
+    if n == 0:
+        return []
+    cumulative = np.cumsum(weights, dtype=np.float64)
+    total = cumulative[-1]
+    count = int(min(n, max(parts, -(-total // max_weight))))
+    cuts = np.searchsorted(cumulative, total * np.arange(1, count) / count, side="right")
+    bounds = np.unique(np.concatenate([[0], cuts, [n]]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def _init_worker(spec, scene: Dict[str, np.ndarray], engine: str, colors: Dict[str, object]) -> None:
+    shm, fb = SharedFramebuffer.attach(spec)
+    _worker.update(shm=shm, fb=fb, scene=scene, engine=engine, colors=colors)
+
+
+def _draw_range(task: Tuple[str, int, int]) -> int:
+    """
+    Pinta las primitivas [inicio, fin) de una capa en el lienzo compartido
+    del proceso y devuelve cuántas dibujó.
+    """
+    layer, start, stop = task
+    fb = _worker["fb"]
+    items = _worker["scene"][layer][start:stop]
+    color = _worker["colors"][layer]
+    engine = _worker["engine"]
+
+    if layer == "lines":
+        if engine == "Bresenham":
+            points, _ = bresenham_batch(items)
+        else:
+            points = dda_batch(items)[0]
+        fb.plot_points(points, color)
+    elif layer == "circles":
+        # Los círculos de igual radio comparten la forma de la caché
+        centers = items[:, :2].astype(np.int64)
+        radii = items[:, 2].astype(np.int64)
+        for r in np.unique(radii).tolist():
+            offsets = shape_cache.offsets(r)
+            same = centers[radii == r]
+            fb.plot_points((same[:, None, :] + offsets[None, :, :]).reshape(-1, 2), color)
+    else:
+        fill_triangles(fb, items, color, engine)
+    return stop - start
+
+
+def render_scene(lines=(), circles=(), triangles=(), fb: Optional[Framebuffer] = None,
+                 workers: Optional[int] = None, engine: str = "DDA",
+                 colors: Optional[Dict[str, object]] = None) -> Framebuffer:
+    """
+    Rasteriza una escena grande repartiendo las primitivas entre procesos.
+
+    Las capas se dibujan en orden (rellenos de triángulos, circunferencias
+    y líneas); cada capa se divide en rangos contiguos de primitivas con
+    peso (píxeles aproximados) parecido y un pool de procesos los pinta en
+    paralelo sobre un framebuffer en memoria compartida. Dentro de una capa
+    todos los trabajadores escriben el mismo color, así que el resultado no
+    depende del reparto y es idéntico al de un solo proceso; entre capas se
+    espera a que termine la anterior. Cada proceso recibe la escena una sola
+    vez al iniciarse y solo se le envían tuplas (capa, inicio, fin).
+
+    Args:
+        lines: Arreglo (L, 4) de segmentos (x1, y1, x2, y2).
+        circles: Arreglo (C, 3) de circunferencias (xc, yc, r) enteras.
+        triangles: Arreglo (T, 3, 2) de triángulos (relleno scanline).
+        fb (Framebuffer, optional): Lienzo de destino; si falta, se crea uno
+            que cubre toda la escena.
+        workers (int, optional): Procesos del pool (por defecto, uno por
+            núcleo); con 1 se dibuja en el proceso actual.
+        engine (str, optional): Motor de línea, "DDA" o "Bresenham".
+        colors (Dict, optional): Color por capa (ver DEFAULT_COLORS).
+
+    Returns:
+        Framebuffer: El lienzo con la escena (una copia local).
+
+    Raises:
+        ValueError: Si alguna circunferencia tiene radio negativo.
+    """
+    scene = {
+        "lines": np.asarray(lines, dtype=np.float64 if engine == "DDA" else np.int64).reshape(-1, 4),
+        "circles": np.asarray(circles, dtype=np.int64).reshape(-1, 3),
+        "triangles": np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 2),
+    }
+    negative = np.flatnonzero(scene["circles"][:, 2] < 0)
+    if len(negative):
+        raise ValueError(f"El radio debe ser un número positivo (circunferencia {negative[0]}).")
+    colors = {**DEFAULT_COLORS, **(colors or {})}
+    workers = workers or os.cpu_count() or 1
+    if fb is None:
+        fb = Framebuffer.for_bounds(*scene_bounds(scene["lines"], scene["circles"], scene["triangles"]),
+                                    margin=1)
+
+    # Varias tareas por proceso para repartir bien la carga desigual
+    tasks = [[(layer, start, stop)
+              for start, stop in partition(_weights(layer, scene[layer]), workers * 4)]
+             for layer in LAYERS]
+
+    with SharedFramebuffer(fb) as shared:
+        if workers == 1:
+            _init_worker(shared.spec, scene, engine, colors)
+            try:
+                for layer_tasks in tasks:
+                    for task in layer_tasks:
+                        _draw_range(task)
+            finally:
+                _worker.pop("fb")
+                _worker.pop("shm").close()
+                _worker.clear()
+        else:
+            with Pool(workers, initializer=_init_worker,
+                      initargs=(shared.spec, scene, engine, colors)) as pool:
+                for layer_tasks in tasks:
+                    pool.map(_draw_range, layer_tasks, chunksize=1)
+        fb.pixels[...] = shared.fb.pixels
+    return fb
@@ -0,0 +1,162 @@
+import tkinter as tk
+from tkinter import messagebox
+import numpy as np
+from raster import Framebuffer
+from relleno import polygon_runs
+from renderizador import PlotRenderer
+from tabla_virtual import VirtualTable
+from trabajos import JobRunner
+from trazas import tracer
+
+def parse_vertices(text):
+    """
+    Lee los vértices del cuadro de texto: un par "x, y" (o "x y") por línea.
+    Las líneas vacías se ignoran; devuelve un arreglo (N, 2) de floats.
+    """
+    vertices = []
+    for line in text.splitlines():
+        line = line.replace(",", " ").split()
+        if not line:
+            continue
+        if len(line) != 2:
+            raise ValueError(f"Vértice inválido: {' '.join(line)}")
+        vertices.append((float(line[0]), float(line[1])))
+    if len(vertices) < 3:
+        raise ValueError("Se necesitan al menos 3 vértices.")
+    return np.array(vertices)
+
+def plot_polygon(renderer, vertices, overlay=False, spans=None, viewport=None):
+    """
+    Dibuja el contorno y el relleno scanline (tabla de aristas activas) de
+    un polígono de N vértices, cóncavo o no.
+    El relleno se pinta en un framebuffer que se muestra como una sola
+    imagen; con 'overlay' también se dibuja con matplotlib (una sola
+    LineCollection). 'spans' es el SpanSet ya calculado, por ejemplo en
+    segundo plano; si falta, se calcula aquí.
+    """
+    if spans is None:
+        with tracer.span("algoritmo"):
+            spans = polygon_runs(vertices, viewport)
+
+    renderer.begin()
+    renderer.set_title(f"Polígono de {len(vertices)} vértices", fontsize=14, fontweight='bold')
+
+    x_min, y_min = np.floor(vertices.min(axis=0)).astype(int)
+    x_max, y_max = np.ceil(vertices.max(axis=0)).astype(int)
+    fb = Framebuffer.for_bounds(x_min, y_min, x_max, y_max, margin=1)
+    spans.blit(fb, 'red')
+    if overlay and len(spans):
+        renderer.hlines('fill', spans.rows, spans.starts, spans.ends, colors='r', linewidth=1)
+    renderer.image('raster', fb)
+
+    outline = np.vstack([vertices, vertices[:1]])
+    renderer.lod_line('edges', outline[:, 0], outline[:, 1], color='b', linestyle='-', linewidth=2)
+
+    margin_x = (x_max - x_min) * 0.1 or 1
+    margin_y = (y_max - y_min) * 0.1 or 1
+    renderer.finish((x_min - margin_x, x_max + margin_x), (y_min - margin_y, y_max + margin_y))
+
+    return spans
+
+def update_table(spans):
+    # Misma tabla de intersecciones (x_min, y, x_max, y) que el triángulo
+    virtual_table.set_source(len(spans), spans.row_tuple)
+
+# El relleno se calcula en un hilo trabajador; "Cancelar" descarta el resultado
+def run_polygon():
+    try:
+        vertices = parse_vertices(vertices_text.get("1.0", tk.END))
+    except ValueError as exc:
+        messagebox.showerror("Error", str(exc))
+        return
+
+    viewport = renderer.view() if clip_var.get() else None
+    overlay = overlay_var.get()
+    info_label.config(text=f"Vértices: {len(vertices)}")
+    runner.submit(lambda: [polygon_runs(vertices, viewport)],
+                  on_done=lambda spans: finish_polygon(spans, vertices, overlay, viewport),
+                  on_error=lambda exc: messagebox.showerror("Error", str(exc)))
+
+# Resultado final, instrumentado con el tiempo del hilo trabajador
+def finish_polygon(spans, vertices, overlay, viewport):
+    job = runner.job
+    with tracer.run("poligono"):
+        tracer.record("algoritmo", job.started, job.finished)
+        plot_polygon(renderer, vertices, overlay, spans, viewport)
+        with tracer.span("tabla"):
+            update_table(spans)
+        info_label.config(text=f"Vértices: {len(vertices)}  Tramos: {len(spans)}  Área: {spans.area}")
+
+def clear_entries():
+    runner.cancel()
+    vertices_text.delete("1.0", tk.END)
+    info_label.config(text="Vértices:")
+    virtual_table.clear()
+    renderer.clear()
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Relleno Scanline - Polígono")
+    root.geometry("900x650")
+    root.config(bg="#f4f4f9")
+
+    # Barra de estado con el desglose de tiempos (solo con RASTER_TRACE activo)
+    if tracer.enabled:
+        status_var = tk.StringVar()
+        tk.Label(root, textvariable=status_var, anchor="w", relief=tk.SUNKEN,
+                 font=("Arial", 9)).pack(side=tk.BOTTOM, fill=tk.X)
+        tracer.on_run = status_var.set
+
+    frame_controls = tk.Frame(root, bg="#f4f4f9")
+    frame_controls.pack(side=tk.LEFT, padx=30, pady=30, fill=tk.Y)
+
+    frame_graph = tk.Frame(root, bg="#f4f4f9")
+    frame_graph.pack(side=tk.RIGHT, padx=30, pady=30, expand=True, fill=tk.BOTH)
+
+    tk.Label(frame_controls, text="Vértices del Polígono", font=("Arial", 14, "bold"), bg="#f4f4f9").pack(pady=10)
+    tk.Label(frame_controls, text="Un vértice \"x, y\" por línea", font=("Arial", 10), bg="#f4f4f9").pack()
+
+    vertices_text = tk.Text(frame_controls, width=22, height=10, font=("Arial", 12))
+    vertices_text.pack(pady=5)
+    vertices_text.insert("1.0", "0, 0\n20, 0\n20, 15\n10, 5\n0, 15")
+
+    overlay_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(frame_controls, text="Superponer relleno (matplotlib)", variable=overlay_var,
+                   font=("Arial", 12), bg="#f4f4f9").pack(pady=5)
+
+    # Recorte a la vista actual: solo se calculan las filas visibles
+    clip_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(frame_controls, text="Recortar a la vista actual", variable=clip_var,
+                   font=("Arial", 12), bg="#f4f4f9").pack(pady=5)
+
+    runner = JobRunner(root)
+    tk.Button(frame_controls, text="Rellenar Polígono", command=run_polygon,
+              font=("Arial", 12), bg="#4CAF50", fg="white", relief="solid", width=20).pack(pady=(20, 5))
+    tk.Button(frame_controls, text="Cancelar", command=runner.cancel,
+              font=("Arial", 12), bg="#ff9800", fg="white", relief="solid", width=20).pack(pady=(0, 5))
+    tk.Button(frame_controls, text="Limpiar", command=clear_entries,
+              font=("Arial", 12), bg="#f44336", fg="white", relief="solid", width=20).pack(pady=(0, 20))
+
+    info_label = tk.Label(frame_controls, text="Vértices:", font=("Arial", 12), bg="#f4f4f9")
+    info_label.pack(pady=10)
+
+    table_frame = tk.Frame(frame_controls, bg="#f4f4f9")
+    table_frame.pack(pady=10)
+
+    columns = ("X1", "Y1", "X2", "Y2")
+    virtual_table = VirtualTable(table_frame, columns=columns, height=5, bg="#f4f4f9")
+    table = virtual_table.tree
+    for col in columns:
+        table.heading(col, text=col, anchor="center")
+        table.column(col, anchor="center", width=80)
+    virtual_table.pack()
+
+    renderer = PlotRenderer(frame_graph, "Relleno de Polígono")
+
+    def on_close():
+        runner.shutdown()
+        renderer.close()
+        root.destroy()
+    root.protocol("WM_DELETE_WINDOW", on_close)
+
+    root.mainloop()
@@ -0,0 +1,97 @@
+import numpy as np
+from typing import Iterable, Iterator, Optional, Tuple
+
+from nucleo import CHUNK_SIZE
+
+
+class PointBuffer:
+    """
+    Almacenamiento compacto de puntos (x, y) en un arreglo NumPy (n, 2).
+
+    Un punto ocupa 8 bytes en int32 (16 en float64), frente a los 100+ bytes
+    de una tupla de Python dentro de una lista. Las columnas 'x' e 'y' son
+    vistas sin copia del mismo arreglo, y el buffer se comporta como una
+    secuencia de tuplas (len, índice, iteración), así que se acepta donde
+    antes se pasaba una lista de puntos.
+    """
+    def __init__(self, data) -> None:
+        self.data = np.asarray(data).reshape(-1, 2)
+
+    @classmethod
+    def empty(cls, count: int, dtype=np.int32) -> "PointBuffer":
+        """
+        Reserva un buffer de 'count' puntos sin inicializar.
+        """
+        return cls(np.empty((count, 2), dtype=dtype))
+
+    @classmethod
+    def from_points(cls, points, dtype=None) -> "PointBuffer":
+        """
+        Crea un buffer a partir de otro PointBuffer, un arreglo o una lista
+        de tuplas. Si ya es un PointBuffer del tipo pedido no se copia nada.
+        """
+        if isinstance(points, cls) and (dtype is None or points.data.dtype == dtype):
+            return points
+        return cls(np.asarray(points, dtype=dtype).reshape(-1, 2))
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable, count: Optional[int] = None, dtype=np.int32) -> "PointBuffer":
+        """
+        Reúne bloques (k, 2) de un generador en streaming. Si se conoce el
+        total 'count', los bloques se copian directamente a un buffer
+        reservado de antemano, sin listas intermedias.
+        """
+        if count is None:
+            parts = [np.asarray(chunk, dtype=dtype).reshape(-1, 2) for chunk in chunks]
+            return cls(np.concatenate(parts) if parts else np.empty((0, 2), dtype=dtype))
+        buf = cls.empty(count, dtype)
+        n = 0
+        for chunk in chunks:
+            chunk = np.asarray(chunk).reshape(-1, 2)
+            buf.data[n:n + len(chunk)] = chunk
+            n += len(chunk)
+        return buf
+
+    @property
+    def x(self) -> np.ndarray:
+        """Vista (sin copia) de la columna x."""
+        return self.data[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        """Vista (sin copia) de la columna y."""
+        return self.data[:, 1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PointBuffer(self.data[index])
+        x, y = self.data[index].tolist()
+        return (x, y)
+
+    def __iter__(self) -> Iterator[Tuple]:
+        # Se convierte por bloques para no duplicar en memoria todo el buffer
+        for start in range(0, len(self.data), CHUNK_SIZE):
+            yield from map(tuple, self.data[start:start + CHUNK_SIZE].tolist())
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if dtype is not None and dtype != self.data.dtype:
+            return self.data.astype(dtype)
+        return self.data
+
+    def __repr__(self) -> str:
+        return f"PointBuffer({len(self)} puntos, {self.data.dtype})"
+
+
+def as_points(points) -> PointBuffer:
+    """
+    Convierte cualquier representación de puntos a PointBuffer (sin copiar
+    si ya lo es).
+    """
+    return PointBuffer.from_points(points)
@@ -0,0 +1,141 @@
+import numpy as np
+from typing import Optional, Tuple
+
+from recorte import Viewport
+
+# Colores con nombre usados por las aplicaciones (RGBA, 0-255)
+COLORS = {
+    "white": (255, 255, 255, 255),
+    "black": (0, 0, 0, 255),
+    "blue": (0, 0, 255, 255),
+    "red": (255, 0, 0, 255),
+    "green": (0, 128, 0, 255),
+    "orange": (255, 165, 0, 255),
+    "transparent": (0, 0, 0, 0),
+}
+
+
+def to_rgba(color) -> Tuple[int, int, int, int]:
+    """
+    Convierte un nombre de COLORS o una tupla (r, g, b[, a]) a RGBA 0-255.
+    """
+    if isinstance(color, str):
+        return COLORS[color]
+    if len(color) == 3:
+        return (*color, 255)
+    return tuple(color)
+
+
+def pack_rgba(color) -> np.uint32:
+    """
+    Empaqueta un color RGBA en un solo uint32 con el orden de bytes del
+    arreglo de píxeles, para asignar un píxel con una sola palabra.
+    """
+    return np.array(to_rgba(color), dtype=np.uint8).view(np.uint32)[0]
+
+
+class Framebuffer:
+    """
+    Lienzo de píxeles respaldado por un arreglo NumPy RGBA (alto, ancho, 4).
+
+    Cada píxel del lienzo cubre 'scale' x 'scale' coordenadas enteras del
+    mundo, a partir de (x0, y0). La fila 0 del arreglo es la fila superior
+    (y máxima), como una imagen, de modo que se muestra con un solo 'imshow'
+    en lugar de un artista de matplotlib por punto o por fila. Los puntos
+    fuera del lienzo se ignoran.
+
+    Con 'pixels' el lienzo usa ese arreglo (alto, ancho, 4) uint8 ya
+    existente, por ejemplo sobre memoria compartida, sin copiarlo ni borrarlo.
+    """
+    def __init__(self, width: int, height: int, x0: int = 0, y0: int = 0,
+                 background="transparent", scale: int = 1,
+                 pixels: Optional[np.ndarray] = None) -> None:
+        self.width = width
+        self.height = height
+        self.x0 = x0
+        self.y0 = y0
+        self.scale = scale
+        self.y_top = y0 + height * scale - 1
+        self.pixels = np.empty((height, width, 4), dtype=np.uint8) if pixels is None else pixels
+        # Vista (alto, ancho) de palabras RGBA sobre la misma memoria
+        self.words = self.pixels.view(np.uint32)[:, :, 0]
+        if pixels is None:
+            self.clear(background)
+
+    @classmethod
+    def for_bounds(cls, x_min: int, y_min: int, x_max: int, y_max: int,
+                   margin: int = 0, background="transparent",
+                   max_side: int = 1024) -> "Framebuffer":
+        """
+        Crea un lienzo que cubre el rectángulo [x_min, x_max] x [y_min, y_max]
+        (inclusive), ampliado 'margin' unidades por cada lado.
+
+        Si el rectángulo tiene más de 'max_side' unidades por lado, se usa una
+        escala mayor que 1 para que la memoria no crezca con las coordenadas.
+        """
+        x0 = x_min - margin
+        y0 = y_min - margin
+        span_x = x_max - x_min + 1 + 2 * margin
+        span_y = y_max - y_min + 1 + 2 * margin
+        scale = max(1, -(-max(span_x, span_y) // max_side))
+        return cls(-(-span_x // scale), -(-span_y // scale), x0, y0, background, scale)
+
+    def clear(self, color="transparent") -> None:
+        """
+        Rellena todo el lienzo con un color.
+        """
+        self.words.fill(pack_rgba(color))
+
+    def extent(self) -> Tuple[float, float, float, float]:
+        """
+        Extensión (izq, der, abajo, arriba) para 'imshow', con cada píxel
+        centrado en su coordenada entera.
+        """
+        return (self.x0 - 0.5, self.x0 + self.width * self.scale - 0.5,
+                self.y0 - 0.5, self.y_top + 0.5)
+
+    def viewport(self) -> Viewport:
+        """
+        Rectángulo de coordenadas del mundo que cubre el lienzo.
+        """
+        return Viewport(self.x0, self.y0, self.x0 + self.width * self.scale - 1, self.y_top)
+
+    def plot_points(self, points, color="blue") -> None:
+        """
+        Pinta un arreglo (n, 2) de puntos enteros (x, y).
+        """
+        pts = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        cols = (pts[:, 0] - self.x0) // self.scale
+        rows = (self.y_top - pts[:, 1]) // self.scale
+        inside = (cols >= 0) & (cols < self.width) & (rows >= 0) & (rows < self.height)
+        self.words[rows[inside], cols[inside]] = pack_rgba(color)
+
+    def fill_spans(self, ys, x_starts, x_ends, color="orange") -> None:
+        """
+        Pinta tramos horizontales [x_start, x_end] (inclusive) en las filas 'ys'.
+
+        Se recorta cada tramo al lienzo y se asigna por rebanadas, una por fila,
+        sin recorrer píxel a píxel.
+        """
+        word = pack_rgba(color)
+        ys = np.asarray(ys, dtype=np.int64)
+        rows = (self.y_top - ys) // self.scale
+        c0 = np.maximum((np.asarray(x_starts, dtype=np.int64) - self.x0) // self.scale, 0)
+        c1 = np.minimum((np.asarray(x_ends, dtype=np.int64) - self.x0) // self.scale, self.width - 1)
+        visible = (rows >= 0) & (rows < self.height) & (c0 <= c1)
+        for row, a, b in zip(rows[visible].tolist(), c0[visible].tolist(), c1[visible].tolist()):
+            self.words[row, a:b + 1] = word
+
+    def row_block(self, start: int, stop: int) -> np.ndarray:
+        """
+        Filas [start, stop) del lienzo (contadas desde arriba) como arreglo
+        (k, ancho, 4) uint8, para exportarlo por bloques.
+        """
+        return self.pixels[start:stop]
+
+    def show(self, ax, **kwargs):
+        """
+        Muestra el lienzo en unos ejes de matplotlib como una sola imagen.
+        """
+        return ax.imshow(self.pixels, extent=self.extent(), origin="upper",
+                         interpolation="nearest", **kwargs)
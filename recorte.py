@@ -0,0 +1,341 @@
+import math
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from nucleo import CHUNK_SIZE
+
+
+class Viewport:
+    """
+    Rectángulo de recorte en coordenadas enteras del mundo, con bordes
+    inclusivos: [x_min, x_max] x [y_min, y_max].
+
+    Las variantes recortadas de los algoritmos solo generan los píxeles que
+    caen dentro, así que el trabajo depende de lo visible y no de la
+    magnitud de las coordenadas.
+    """
+    def __init__(self, x_min: int, y_min: int, x_max: int, y_max: int) -> None:
+        self.x_min = int(x_min)
+        self.y_min = int(y_min)
+        self.x_max = int(x_max)
+        self.y_max = int(y_max)
+
+    @classmethod
+    def from_limits(cls, xlim: Tuple[float, float], ylim: Tuple[float, float]) -> "Viewport":
+        """
+        Viewport con los píxeles enteros visibles en unos límites de ejes.
+        """
+        return cls(math.ceil(min(xlim)), math.ceil(min(ylim)),
+                   math.floor(max(xlim)), math.floor(max(ylim)))
+
+    def is_empty(self) -> bool:
+        return self.x_min > self.x_max or self.y_min > self.y_max
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.x_min <= x <= self.x_max and self.y_min <= y <= self.y_max
+
+    def contains_box(self, x_min: int, y_min: int, x_max: int, y_max: int) -> bool:
+        """
+        True si la caja [x_min, x_max] x [y_min, y_max] está completamente dentro.
+        """
+        return (self.x_min <= x_min and x_max <= self.x_max
+                and self.y_min <= y_min and y_max <= self.y_max)
+
+    def mask(self, points: np.ndarray) -> np.ndarray:
+        """
+        Máscara booleana de los puntos (n, 2) que caen dentro.
+        """
+        xs = points[:, 0]
+        ys = points[:, 1]
+        return (xs >= self.x_min) & (xs <= self.x_max) & (ys >= self.y_min) & (ys <= self.y_max)
+
+    def __repr__(self) -> str:
+        return f"Viewport({self.x_min}, {self.y_min}, {self.x_max}, {self.y_max})"
+
+
+def liang_barsky(x1: float, y1: float, x2: float, y2: float,
+                 x_min: float, y_min: float, x_max: float, y_max: float) -> Optional[Tuple[float, float]]:
+    """
+    Recorte paramétrico de Liang–Barsky del segmento P(t) = P1 + t·(P2 - P1).
+
+    Returns:
+        Optional[Tuple[float, float]]: Intervalo (t0, t1) dentro de [0, 1]
+        que queda en el rectángulo, o None si el segmento queda fuera.
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - x_min), (dx, x_max - x1), (-dy, y1 - y_min), (dy, y_max - y1)):
+        if p == 0:
+            if q < 0:
+                return None  # Paralelo al borde y por fuera
+        else:
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+    if t0 > t1:
+        return None
+    return t0, t1
+
+
+def _visible_steps(x1, y1, x2, y2, steps: int, viewport: Viewport) -> Optional[Tuple[int, int]]:
+    """
+    Rango de pasos [k0, k1] de un segmento de 'steps' pasos que puede caer
+    en el viewport. Se recorta contra el viewport ampliado medio píxel (lo
+    que redondea a un píxel de borde) y se deja un paso de holgura por lado;
+    los puntos se filtran después de forma exacta.
+    """
+    clip = liang_barsky(x1, y1, x2, y2, viewport.x_min - 0.5, viewport.y_min - 0.5,
+                        viewport.x_max + 0.5, viewport.y_max + 0.5)
+    if clip is None:
+        return None
+    t0, t1 = clip
+    k0 = max(0, math.floor(t0 * steps) - 1)
+    k1 = min(steps, math.ceil(t1 * steps) + 1)
+    return k0, k1
+
+
+def _dda_advance(start: np.ndarray, inc: np.ndarray, count: int,
+                 chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Valor de 'start' tras sumarle 'inc' 'count' veces de forma secuencial,
+    como el bucle x += x_inc de 'dda_algorithm'. Se acumula por bloques con
+    np.cumsum (memoria acotada), sin redondear ni guardar las muestras.
+    """
+    value = start
+    while count > 0:
+        n = min(chunk_size, count)
+        block = np.empty((n + 1, 2), dtype=np.float64)
+        block[0] = value
+        block[1:] = inc
+        np.cumsum(block, axis=0, out=block)
+        value = block[-1]
+        count -= n
+    return value
+
+
+def dda_clipped(x1, y1, x2, y2, viewport: Viewport) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Muestras DDA del segmento que caen en el viewport, sin redondear ni
+    guardar las de fuera.
+
+    Las muestras se acumulan desde P1 igual que en 'dda_algorithm' (el valor
+    del primer paso visible se obtiene sumando los incrementos anteriores
+    por bloques, ver '_dda_advance'), así que los puntos son exactamente los
+    de la línea completa que caen dentro.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Puntos enteros (n, 2) y flotantes (n, 2).
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    steps = int(max(abs(dx), abs(dy)))
+    rng = _visible_steps(x1, y1, x2, y2, steps, viewport) if steps else (0, 0)
+    if rng is None:
+        return np.empty((0, 2), dtype=np.int64), np.empty((0, 2), dtype=np.float64)
+    k0, k1 = rng
+    inc = np.array([dx / steps, dy / steps]) if steps else np.zeros(2)
+    points_float = np.empty((k1 - k0 + 1, 2), dtype=np.float64)
+    points_float[0] = _dda_advance(np.array([x1, y1], dtype=np.float64), inc, k0)
+    points_float[1:] = inc
+    np.cumsum(points_float, axis=0, out=points_float)
+    points_int = np.rint(points_float).astype(np.int64)
+    inside = viewport.mask(points_int)
+    return points_int[inside], points_float[inside]
+
+
+def bresenham_clipped(x1: int, y1: int, x2: int, y2: int, viewport: Viewport) -> np.ndarray:
+    """
+    Píxeles de Bresenham del segmento que caen en el viewport. La forma
+    cerrada de 'bresenham_array' se evalúa solo en el rango visible de
+    pasos, con resultados idénticos a los de la línea completa.
+    """
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    sx = 1 if x2 >= x1 else -1
+    sy = 1 if y2 >= y1 else -1
+    major, minor = (dx, dy) if dx >= dy else (dy, dx)
+    rng = _visible_steps(x1, y1, x2, y2, major, viewport) if major else (0, 0)
+    if rng is None:
+        return np.empty((0, 2), dtype=np.int64)
+    i = np.arange(rng[0], rng[1] + 1, dtype=np.int64)
+    if major == 0:
+        minor_steps = np.zeros_like(i)
+    else:
+        minor_steps = (2 * i * minor + major - 1) // (2 * major)
+    points = np.empty((len(i), 2), dtype=np.int64)
+    if dx >= dy:
+        points[:, 0] = x1 + sx * i
+        points[:, 1] = y1 + sy * minor_steps
+    else:
+        points[:, 0] = x1 + sx * minor_steps
+        points[:, 1] = y1 + sy * i
+    return points[viewport.mask(points)]
+
+
+# ---------- Circunferencias ----------
+
+def octant_y(r: int, x):
+    """
+    Valor y del algoritmo del punto medio en la columna x del primer octante,
+    sin recorrer las columnas anteriores.
+
+    El parámetro de decisión mantiene y mientras x² + y² - y < r², así que
+    y(x) es el mayor entero con y² - y < r² - x², es decir
+    (2y - 1)² < 4(r² - x²) + 1. Acepta un entero o un arreglo de columnas.
+    """
+    if np.ndim(x) == 0:
+        n = 4 * (r * r - x * x) + 1
+        s = math.isqrt(n)
+        return ((s - 1 if s * s == n else s) + 1) // 2
+    x = np.asarray(x, dtype=np.int64)
+    n = 4 * (r * r - x * x) + 1
+    y = np.floor((1 + np.sqrt(n.astype(np.float64))) / 2).astype(np.int64)
+    # Corrección entera del redondeo de sqrt (a lo sumo un paso)
+    y -= (2 * y - 1) ** 2 >= n
+    y += (2 * y + 1) ** 2 < n
+    return y
+
+
+def octant_end(r: int) -> int:
+    """
+    Última columna x del primer octante (el mayor x con x <= y(x)).
+    """
+    lo, hi = 0, r
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if mid <= octant_y(r, mid):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _columns_with_y(r: int, lo: int, hi: int, y_low: int, y_high: int) -> Tuple[int, int]:
+    """
+    Columnas [a, b] dentro de [lo, hi] con y_low <= y(x) <= y_high, usando
+    que y(x) no crece con x (búsqueda binaria).
+    """
+    # Primera columna con y(x) <= y_high
+    a, b = lo, hi + 1
+    while a < b:
+        mid = (a + b) // 2
+        if octant_y(r, mid) <= y_high:
+            b = mid
+        else:
+            a = mid + 1
+    first = a
+    # Última columna con y(x) >= y_low
+    a, b = lo - 1, hi
+    while a < b:
+        mid = (a + b + 1) // 2
+        if octant_y(r, mid) >= y_low:
+            a = mid
+        else:
+            b = mid - 1
+    return first, a
+
+
+# Piezas de la circunferencia en el orden de 'iter_circle_points':
+# (intercambia x/y, signo en x, signo en y, recorrido hacia atrás, omite x == 0)
+_CIRCLE_PIECES = (
+    (False, 1, 1, False, False),
+    (True, 1, 1, True, False),
+    (True, 1, -1, False, True),
+    (False, 1, -1, True, False),
+    (False, -1, -1, False, True),
+    (True, -1, -1, True, False),
+    (True, -1, 1, False, True),
+    (False, -1, 1, True, True),
+)
+
+
+def _axis_range(sign: int, center: int, low: int, high: int) -> Tuple[int, int]:
+    # Valores u con low <= center + sign·u <= high
+    if sign > 0:
+        return low - center, high - center
+    return center - high, center - low
+
+
+def circle_clipped_chunks(xc: int, yc: int, r: int, viewport: Viewport,
+                          chunk_size: Optional[int] = None) -> Iterator[np.ndarray]:
+    """
+    Píxeles visibles de la circunferencia, pieza a pieza (8 octantes), en el
+    orden angular de 'iter_circle_points' y sin repetidos.
+
+    En cada octante el rango de columnas visible se obtiene con una
+    búsqueda binaria sobre la forma cerrada de y(x), y solo esas columnas
+    se evalúan: el trabajo es proporcional a los píxeles visibles más
+    O(log r) por octante. Con 'chunk_size' cada octante se parte en bloques
+    de a lo sumo ese número de puntos.
+
+    Yields:
+        np.ndarray: Bloques (k, 2) int64 de puntos visibles.
+    """
+    if r == 0:
+        if viewport.contains(xc, yc):
+            yield np.array([[xc, yc]], dtype=np.int64)
+        return
+    last = octant_end(r)
+    on_diagonal = last == octant_y(r, last)
+    for swap, sx, sy, backward, skip_axis in _CIRCLE_PIECES:
+        lo = 1 if skip_axis else 0
+        hi = last - 1 if backward and on_diagonal else last
+        # La columna x va al eje y (si hay intercambio) o al eje x; y(x) al otro
+        if swap:
+            u_low, u_high = _axis_range(sy, yc, viewport.y_min, viewport.y_max)
+            v_low, v_high = _axis_range(sx, xc, viewport.x_min, viewport.x_max)
+        else:
+            u_low, u_high = _axis_range(sx, xc, viewport.x_min, viewport.x_max)
+            v_low, v_high = _axis_range(sy, yc, viewport.y_min, viewport.y_max)
+        lo, hi = max(lo, u_low), min(hi, u_high)
+        if lo > hi:
+            continue
+        lo, hi = _columns_with_y(r, lo, hi, v_low, v_high)
+        if lo > hi:
+            continue
+        step = chunk_size or hi - lo + 1
+        starts = range(lo, hi + 1, step)
+        for start in (reversed(starts) if backward else starts):
+            xs = np.arange(start, min(start + step, hi + 1), dtype=np.int64)
+            if backward:
+                xs = xs[::-1]
+            ys = octant_y(r, xs)
+            points = np.empty((len(xs), 2), dtype=np.int64)
+            points[:, 0] = xc + sx * (ys if swap else xs)
+            points[:, 1] = yc + sy * (xs if swap else ys)
+            yield points
+
+
+def circle_clipped(xc: int, yc: int, r: int, viewport: Viewport) -> np.ndarray:
+    """
+    Igual que 'circle_clipped_chunks', reunido en un solo arreglo (n, 2).
+    """
+    parts = list(circle_clipped_chunks(xc, yc, r, viewport))
+    return np.concatenate(parts) if parts else np.empty((0, 2), dtype=np.int64)
+
+
+def circle_fill_clipped(xc: int, yc: int, r: int, viewport: Viewport) -> np.ndarray:
+    """
+    Tramos (y, x_start, x_end) del relleno del círculo recortados al viewport:
+    solo se calculan las filas visibles y cada tramo se corta a sus bordes
+    (mismo redondeo que 'circle_fill_offsets').
+
+    Returns:
+        np.ndarray: Arreglo (m, 3) int64; se omiten las filas sin parte visible.
+    """
+    y0 = max(yc - r, viewport.y_min)
+    y1 = min(yc + r, viewport.y_max)
+    if y0 > y1:
+        return np.empty((0, 3), dtype=np.int64)
+    ys = np.arange(y0, y1 + 1, dtype=np.int64)
+    dy = ys - yc
+    dx = np.rint(np.sqrt(r * r - dy * dy)).astype(np.int64)
+    spans = np.empty((len(ys), 3), dtype=np.int64)
+    spans[:, 0] = ys
+    spans[:, 1] = np.maximum(xc - dx, viewport.x_min)
+    spans[:, 2] = np.minimum(xc + dx, viewport.x_max)
+    return spans[spans[:, 1] <= spans[:, 2]]
@@ -0,0 +1,212 @@
+import numpy as np
+from typing import List, Optional, Tuple
+
+from motor_lineas import bresenham_batch, dda_batch
+from recorte import Viewport
+from tramos import SpanSet
+
+
+def _edge_points_batch(segments, engine: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Píxeles enteros de muchos segmentos con el motor indicado por nombre.
+    """
+    if engine == "DDA":
+        points_int, _, offsets = dda_batch(segments)
+        return points_int, offsets
+    if engine == "Bresenham":
+        return bresenham_batch(segments)
+    raise ValueError(f"Motor de línea desconocido: {engine}")
+
+
+def triangle_spans_batch(triangles, engine: str = "DDA") -> np.ndarray:
+    """
+    Calcula los tramos de relleno (scanline) de muchos triángulos a la vez.
+
+    Reproduce exactamente el relleno de 'fill_triangle': los vértices se
+    ordenan por y, las aristas (0-1, 1-2, 2-0) se muestrean con el motor de
+    línea y en cada fila el tramo va del menor al mayor x muestreado (solo
+    en filas con más de una muestra). En lugar de un diccionario de listas
+    y un sort por fila, las muestras de todas las aristas se ordenan una vez
+    por (triángulo, y) y los extremos se obtienen con reduceat.
+
+    Args:
+        triangles: Arreglo (T, 3, 2) con los vértices de cada triángulo.
+        engine (str, optional): Motor de línea, "DDA" o "Bresenham".
+
+    Returns:
+        np.ndarray: Arreglo (S, 4) de enteros con filas
+        (triángulo, y, x_min, x_max), ordenado por triángulo y luego por y.
+    """
+    tris = np.asarray(triangles).reshape(-1, 3, 2)
+    order = np.argsort(tris[:, :, 1], axis=1, kind="stable")
+    tris = np.take_along_axis(tris, order[:, :, None], axis=1)
+
+    nxt = tris[:, [1, 2, 0]]
+    segments = np.concatenate([tris, nxt], axis=2).reshape(-1, 4)
+    points, offsets = _edge_points_batch(segments, engine)
+
+    owner = np.repeat(np.arange(len(tris)), np.diff(offsets).reshape(-1, 3).sum(axis=1))
+    xs = points[:, 0]
+    ys = points[:, 1]
+    idx = np.lexsort((ys, owner))
+    owner, xs, ys = owner[idx], xs[idx], ys[idx]
+
+    starts = np.flatnonzero(np.r_[True, (owner[1:] != owner[:-1]) | (ys[1:] != ys[:-1])])
+    counts = np.diff(np.r_[starts, len(xs)])
+    spans = np.empty((len(starts), 4), dtype=np.int64)
+    spans[:, 0] = owner[starts]
+    spans[:, 1] = ys[starts]
+    spans[:, 2] = np.minimum.reduceat(xs, starts)
+    spans[:, 3] = np.maximum.reduceat(xs, starts)
+    return spans[counts > 1]
+
+
+def triangle_spans(tri_points, engine: str = "DDA") -> List[Tuple[int, int, int, int]]:
+    """
+    Tabla de intersecciones (x_min, y, x_max, y) de un triángulo, en el
+    formato que consume 'update_table'.
+    """
+    spans = triangle_spans_batch([tri_points], engine)
+    return [(x_min, y, x_max, y) for _, y, x_min, x_max in spans.tolist()]
+
+
+def triangle_runs(tri_points, engine: str = "DDA") -> SpanSet:
+    """
+    Relleno de un triángulo como SpanSet: un tramo [x_min, x_max] por fila,
+    los mismos que 'triangle_spans'.
+    """
+    spans = triangle_spans_batch([tri_points], engine)
+    return SpanSet.from_spans(spans[:, 1], spans[:, 2], spans[:, 3], normalize=False)
+
+
+def fill_triangles(fb, triangles, color="red", engine: str = "DDA") -> None:
+    """
+    Rellena muchos triángulos en un framebuffer con una sola pasada de tramos.
+
+    Args:
+        fb (Framebuffer): Lienzo donde se pinta el relleno.
+        triangles: Arreglo (T, 3, 2) con los vértices de cada triángulo.
+        color: Color del relleno.
+        engine (str, optional): Motor de línea, "DDA" o "Bresenham".
+    """
+    spans = triangle_spans_batch(triangles, engine)
+    fb.fill_spans(spans[:, 1], spans[:, 2], spans[:, 3], color)
+
+
+def polygon_edge_table(vertices) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Tabla de aristas (ET) de un polígono cerrado, ordenada por fila inicial.
+
+    Cada arista no horizontal cubre las filas enteras y con
+    y_bajo <= y < y_alto (regla semiabierta: un vértice compartido se cuenta
+    una sola vez y las aristas horizontales no aportan cruces). De cada
+    arista se guarda su primera fila, la fila siguiente a la última, el x
+    en la primera fila y el incremento de x por fila (dx/dy).
+
+    Returns:
+        Tuple[np.ndarray, ...]: (row_start, row_end, x_start, dxdy), cada
+        uno de largo E y ordenados por 'row_start'.
+    """
+    v = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    p, q = v, np.roll(v, -1, axis=0)
+    flip = p[:, 1] > q[:, 1]
+    lo = np.where(flip[:, None], q, p)
+    hi = np.where(flip[:, None], p, q)
+    row_start = np.ceil(lo[:, 1]).astype(np.int64)
+    row_end = np.ceil(hi[:, 1]).astype(np.int64)
+    keep = row_start < row_end
+    lo, hi, row_start, row_end = lo[keep], hi[keep], row_start[keep], row_end[keep]
+    dxdy = (hi[:, 0] - lo[:, 0]) / (hi[:, 1] - lo[:, 1])
+    x_start = lo[:, 0] + (row_start - lo[:, 1]) * dxdy
+    order = np.argsort(row_start, kind="stable")
+    return row_start[order], row_end[order], x_start[order], dxdy[order]
+
+
+def polygon_spans(vertices, viewport: Optional[Viewport] = None) -> np.ndarray:
+    """
+    Relleno scanline de un polígono de N vértices (cóncavo o con
+    autointersecciones, regla par-impar) con tabla de aristas activas.
+
+    Las filas se recorren por bandas entre filas de evento (donde empieza o
+    termina alguna arista). Al entrar en una banda la tabla de aristas
+    activas (AET) descarta las aristas que terminaron y toma de la tabla de
+    aristas (ET), ya ordenada, las que empiezan; dentro de la banda el x de
+    cada arista activa avanza dx/dy por fila (evaluado como x_start + k·dx/dy,
+    sin acumular error), los cruces de cada fila se ordenan y se emparejan
+    (1.º-2.º, 3.º-4.º, ...). Cada par cubre los píxeles con centro en
+    [x_izq, x_der), igual que la regla semiabierta de las filas, así que
+    dos polígonos que comparten una arista no pintan dos veces sus píxeles.
+
+    El bucle de Python es por banda (a lo sumo 2·E) y el trabajo de NumPy
+    es proporcional a los cruces, es decir O(aristas + tramos), sin
+    muestrear el perímetro ni ordenar muestras por fila.
+
+    Args:
+        vertices: Secuencia (N, 2) de vértices (x, y), enteros o reales.
+        viewport (Viewport, optional): Si se indica, solo se calculan las
+            filas visibles y cada tramo se recorta a sus bordes.
+
+    Returns:
+        np.ndarray: Arreglo (S, 3) de enteros con filas (y, x_start, x_end),
+        extremos inclusivos, ordenado por y y luego por x.
+    """
+    row_start, row_end, x_start, dxdy = polygon_edge_table(vertices)
+    if len(row_start) == 0:
+        return np.empty((0, 3), dtype=np.int64)
+
+    events = np.unique(np.concatenate([row_start, row_end]))
+    if viewport is not None:
+        events = np.unique(np.clip(events, viewport.y_min, viewport.y_max + 1))
+
+    pieces = []
+    active = np.empty(0, dtype=np.int64)
+    next_edge = 0
+    for band_start, band_end in zip(events[:-1].tolist(), events[1:].tolist()):
+        # Actualiza la AET: fuera las aristas terminadas, dentro las que empiezan
+        entering = int(np.searchsorted(row_start, band_start, side="right"))
+        if entering > next_edge:
+            active = np.concatenate([active, np.arange(next_edge, entering)])
+            next_edge = entering
+        active = active[row_end[active] > band_start]
+        if len(active) < 2:
+            continue
+
+        rows = np.arange(band_start, band_end)
+        xs = x_start[active] + (rows[:, None] - row_start[active]) * dxdy[active]
+        xs.sort(axis=1)
+        pairs = len(active) // 2 * 2
+        starts = np.ceil(xs[:, 0:pairs:2]).astype(np.int64)
+        ends = np.ceil(xs[:, 1:pairs:2]).astype(np.int64) - 1
+        spans = np.empty(starts.shape + (3,), dtype=np.int64)
+        spans[..., 0] = rows[:, None]
+        spans[..., 1] = starts
+        spans[..., 2] = ends
+        pieces.append(spans.reshape(-1, 3))
+
+    if not pieces:
+        return np.empty((0, 3), dtype=np.int64)
+    spans = np.concatenate(pieces)
+    if viewport is not None:
+        np.maximum(spans[:, 1], viewport.x_min, out=spans[:, 1])
+        np.minimum(spans[:, 2], viewport.x_max, out=spans[:, 2])
+    return spans[spans[:, 1] <= spans[:, 2]]
+
+
+def polygon_runs(vertices, viewport: Optional[Viewport] = None) -> SpanSet:
+    """
+    Relleno de un polígono como SpanSet (ver 'polygon_spans'); los pares de
+    cruces ya dan tramos ordenados y disjuntos.
+    """
+    return SpanSet.from_array(polygon_spans(vertices, viewport), normalize=False)
+
+
+def fill_polygon(fb, vertices, color="red", viewport: Optional[Viewport] = None) -> SpanSet:
+    """
+    Rellena un polígono en un framebuffer con sus tramos scanline.
+
+    Returns:
+        SpanSet: Los tramos pintados.
+    """
+    runs = polygon_runs(vertices, viewport)
+    runs.blit(fb, color)
+    return runs
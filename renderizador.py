@@ -0,0 +1,322 @@
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+from detalle import LABEL_CELL_PX, POINT_CELL_PX, decimate
+from recorte import Viewport
+from trazas import tracer
+
+
+class PlotRenderer:
+    """
+    Renderizador de larga vida para una ventana: una sola figura, un solo
+    canvas de Tkinter y artistas que se reutilizan entre ejecuciones.
+
+    Cada ejecución llama a 'begin', actualiza los artistas por nombre
+    (set_data, set_offsets, set_segments...) y termina con 'finish'. Si los
+    límites de los ejes y los artistas visibles no cambian, solo se redibujan
+    los artistas sobre el fondo guardado (blitting); si cambian, se hace un
+    dibujo completo. Como la figura no se registra en pyplot y no se crean
+    widgets nuevos, la memoria se mantiene constante entre regeneraciones.
+
+    Con 'lod' activo, las capas añadidas con 'lod_line', 'lod_points' y
+    'lod_texts' guardan todos sus puntos pero solo dibujan los que la
+    resolución del widget puede mostrar (ver detalle.decimate); la selección
+    se rehace al cambiar los límites (zoom de la barra de herramientas) o el
+    tamaño de la ventana.
+
+    matplotlib se importa al crear el renderizador (al abrir la ventana), no
+    al importar este módulo.
+    """
+    def __init__(self, master, title: str, xlabel: str = "Eje X", ylabel: str = "Eje Y",
+                 figsize: Tuple[float, float] = (6, 6), grid: Optional[dict] = None,
+                 canvas_factory: Optional[Callable[[object], object]] = None,
+                 lod: bool = True, toolbar: bool = True) -> None:
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        self.ax.set_title(title)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.grid(True, **(grid or {}))
+        self.ax.set_aspect('equal', adjustable='box')
+
+        if canvas_factory is None:
+            import tkinter as tk
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            canvas = FigureCanvasTkAgg(self.figure, master=master)
+            if toolbar:
+                # Zoom y desplazamiento; se empaqueta abajo antes que el canvas
+                from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+                NavigationToolbar2Tk(canvas, master)
+            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        else:
+            # Sin ventana (p. ej. FigureCanvasAgg para pruebas o mediciones)
+            canvas = canvas_factory(self.figure)
+        self.canvas = canvas
+
+        self._artists: Dict[str, object] = {}
+        self._texts: List[object] = []
+        self._used: set = set()
+        self._texts_used = False
+        self._visible: Tuple[str, ...] = ()
+        self._limits: Optional[tuple] = None
+        self._background = None
+        self._begin_time = 0.0
+        self.lod = lod
+        self._lod_layers: Dict[str, tuple] = {}
+        self._lod_texts: Optional[tuple] = None
+        self._finishing = False
+        self._draw_cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+        self._resize_cid = self.canvas.mpl_connect('resize_event', self._on_view_changed)
+        self.ax.callbacks.connect('xlim_changed', self._on_view_changed)
+        self.ax.callbacks.connect('ylim_changed', self._on_view_changed)
+
+    # ---------- Ciclo de actualización ----------
+
+    def begin(self) -> None:
+        """
+        Inicia una ejecución: los artistas que no se actualicen quedarán ocultos.
+        """
+        self._used = set()
+        self._texts_used = False
+        self._lod_texts = None
+        if tracer.enabled:
+            self._begin_time = tracer.now()
+
+    def finish(self, xlim: Tuple[float, float], ylim: Tuple[float, float]) -> None:
+        """
+        Termina la ejecución: oculta los artistas no usados, fija los límites
+        y redibuja (con blitting si es posible). Con la instrumentación activa
+        se registran las etapas 'artistas' (desde 'begin') y 'dibujo'.
+        """
+        if tracer.enabled:
+            tracer.record("artistas", self._begin_time, tracer.now())
+        for name, artist in self._artists.items():
+            artist.set_visible(name in self._used)
+        if not self._texts_used:
+            self._set_texts([], [], [], {})
+        visible = tuple(sorted(self._used))
+        limits = (tuple(xlim), tuple(ylim))
+        self._finishing = True
+        try:
+            self.ax.set_xlim(*xlim)
+            self.ax.set_ylim(*ylim)
+        finally:
+            self._finishing = False
+        self._apply_lod()
+
+        if limits != self._limits or visible != self._visible or self._background is None:
+            self._limits = limits
+            self._visible = visible
+            self._update_legend()
+            with tracer.span("dibujo"):
+                self.canvas.draw()
+                self.canvas.blit(self.figure.bbox)
+        else:
+            with tracer.span("blit"):
+                self.canvas.restore_region(self._background)
+                self._draw_animated()
+                self.canvas.blit(self.figure.bbox)
+
+    def view(self) -> Viewport:
+        """
+        Píxeles enteros visibles con los límites actuales de los ejes.
+        """
+        return Viewport.from_limits(self.ax.get_xlim(), self.ax.get_ylim())
+
+    def set_title(self, title: str, **style) -> None:
+        """
+        Cambia el título; si es distinto, el siguiente 'finish' dibuja completo.
+        """
+        if title != self.ax.get_title():
+            self.ax.set_title(title, **style)
+            self._background = None
+
+    def clear(self) -> None:
+        """
+        Oculta todos los artistas (equivale a una ejecución vacía).
+        """
+        self.begin()
+        self.finish(self.ax.get_xlim(), self.ax.get_ylim())
+
+    def close(self) -> None:
+        """
+        Libera la figura y el widget de Tkinter de forma determinista.
+        """
+        self.canvas.mpl_disconnect(self._draw_cid)
+        self.canvas.mpl_disconnect(self._resize_cid)
+        self._lod_layers.clear()
+        self._lod_texts = None
+        self._artists.clear()
+        self._texts.clear()
+        self._background = None
+        self.figure.clear()
+        if hasattr(self.canvas, 'get_tk_widget'):
+            self.canvas.get_tk_widget().destroy()
+
+    # ---------- Artistas reutilizables ----------
+
+    def image(self, name: str, fb) -> None:
+        """
+        Muestra un Framebuffer como imagen (una sola AxesImage reutilizada).
+        """
+        artist = self._artists.get(name)
+        if artist is None:
+            artist = fb.show(self.ax, animated=True)
+            self._add(name, artist)
+        else:
+            artist.set_data(fb.pixels)
+            artist.set_extent(fb.extent())
+        self._used.add(name)
+
+    def line(self, name: str, xs, ys, **style) -> None:
+        """
+        Línea (Line2D) actualizada con set_data.
+        """
+        artist = self._artists.get(name)
+        if artist is None:
+            artist, = self.ax.plot(xs, ys, animated=True, **style)
+            self._add(name, artist)
+        else:
+            artist.set_data(xs, ys)
+        self._used.add(name)
+
+    def points(self, name: str, xs, ys, **style) -> None:
+        """
+        Nube de puntos (scatter) actualizada con set_offsets.
+        """
+        artist = self._artists.get(name)
+        if artist is None:
+            artist = self.ax.scatter(xs, ys, animated=True, **style)
+            self._add(name, artist)
+        else:
+            artist.set_offsets(np.column_stack([xs, ys]))
+        self._used.add(name)
+
+    def hlines(self, name: str, ys, x_starts, x_ends, **style) -> None:
+        """
+        Tramos horizontales en una sola LineCollection, actualizada con set_segments.
+        """
+        ys = np.asarray(ys, dtype=float)
+        segments = np.empty((len(ys), 2, 2))
+        segments[:, 0, 0] = x_starts
+        segments[:, 1, 0] = x_ends
+        segments[:, 0, 1] = ys
+        segments[:, 1, 1] = ys
+        artist = self._artists.get(name)
+        if artist is None:
+            from matplotlib.collections import LineCollection
+            artist = LineCollection(segments, animated=True, **style)
+            self.ax.add_collection(artist)
+            self._add(name, artist)
+        else:
+            artist.set_segments(segments)
+        self._used.add(name)
+
+    def texts(self, xs, ys, labels, **style) -> None:
+        """
+        Etiquetas de texto: se reutilizan los objetos Text existentes y solo
+        se crean o eliminan los que sobran o faltan.
+        """
+        self._set_texts(xs, ys, labels, style)
+        self._texts_used = True
+
+    # ---------- Capas con nivel de detalle ----------
+
+    def lod_line(self, name: str, xs, ys, **style) -> None:
+        """
+        Como 'line', pero con nivel de detalle: se guardan todos los puntos y
+        en 'finish' solo se dibujan los que la resolución puede mostrar.
+        """
+        self._lod_layers[name] = ('line', np.asarray(xs), np.asarray(ys))
+        self.line(name, [], [], **style)
+
+    def lod_points(self, name: str, xs, ys, **style) -> None:
+        """
+        Como 'points', pero con nivel de detalle (ver 'lod_line').
+        """
+        self._lod_layers[name] = ('points', np.asarray(xs), np.asarray(ys))
+        self.points(name, [], [], **style)
+
+    def lod_texts(self, xs, ys, formatter: Callable[[int], str], **style) -> None:
+        """
+        Etiquetas con nivel de detalle: a lo sumo una por celda de
+        LABEL_CELL_PX píxeles; 'formatter(i)' da el texto del punto i y solo
+        se llama para las etiquetas que se dibujan.
+        """
+        self._lod_texts = (np.asarray(xs), np.asarray(ys), formatter, style)
+        self._texts_used = True
+
+    # ---------- Internos ----------
+
+    def _apply_lod(self) -> None:
+        """
+        Recalcula qué puntos y etiquetas de las capas LOD se dibujan con los
+        límites y el tamaño actuales de los ejes.
+        """
+        if not self._lod_layers and self._lod_texts is None:
+            return
+        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        bbox = self.ax.get_window_extent()
+        size = (bbox.width, bbox.height)
+
+        for name, (kind, xs, ys) in self._lod_layers.items():
+            if name not in self._used:
+                continue
+            idx = decimate(xs, ys, xlim, ylim, size, POINT_CELL_PX) if self.lod else slice(None)
+            artist = self._artists[name]
+            if kind == 'line':
+                artist.set_data(xs[idx], ys[idx])
+            else:
+                artist.set_offsets(np.column_stack([xs[idx], ys[idx]]))
+
+        if self._lod_texts is not None:
+            xs, ys, formatter, style = self._lod_texts
+            if self.lod:
+                idx = decimate(xs, ys, xlim, ylim, size, LABEL_CELL_PX).tolist()
+            else:
+                idx = range(len(xs))
+            self._set_texts(xs[idx], ys[idx], [formatter(i) for i in idx], style)
+
+    def _on_view_changed(self, *args) -> None:
+        # Zoom, desplazamiento o cambio de tamaño fuera de 'finish'
+        if self._finishing:
+            return
+        self._apply_lod()
+        self.canvas.draw_idle()
+
+    def _set_texts(self, xs, ys, labels, style) -> None:
+        labels = list(labels)
+        while len(self._texts) > len(labels):
+            self._texts.pop().remove()
+        for text, x, y, label in zip(self._texts, xs, ys, labels):
+            text.set_position((x, y))
+            text.set_text(label)
+        for x, y, label in list(zip(xs, ys, labels))[len(self._texts):]:
+            self._texts.append(self.ax.text(x, y, label, animated=True, **style))
+
+    def _add(self, name: str, artist) -> None:
+        self._artists[name] = artist
+        # Obliga a un dibujo completo para recalcular la leyenda
+        self._visible = ()
+
+    def _update_legend(self) -> None:
+        handles = [a for n, a in self._artists.items()
+                   if n in self._used and not a.get_label().startswith('_')]
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if handles:
+            self.ax.legend(handles=handles)
+
+    def _draw_animated(self) -> None:
+        artists = [a for a in self._artists.values() if a.get_visible()] + self._texts
+        for artist in sorted(artists, key=lambda a: a.get_zorder()):
+            self.ax.draw_artist(artist)
+
+    def _on_draw(self, event) -> None:
+        # Tras cada dibujo completo (incluido un cambio de tamaño de la
+        # ventana) se guarda el fondo y se pintan encima los artistas animados
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
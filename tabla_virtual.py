@@ -0,0 +1,98 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Sequence
+
+
+class _VirtualView(tk.Frame):
+    """
+    Base de las vistas virtuales: solo existen las filas visibles.
+
+    Los datos no se copian al widget: la vista guarda el número de filas y
+    una función 'formatter(i)' que da el contenido de la fila i. Al
+    desplazarse se formatean únicamente las filas de la ventana visible,
+    de modo que cargar un resultado cuesta O(1) sin importar su tamaño.
+    """
+    def __init__(self, master, height: int, **frame_options) -> None:
+        super().__init__(master, **frame_options)
+        self.height = height
+        self.count = 0
+        self.first = 0
+        self.formatter: Callable[[int], object] = lambda i: ""
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+
+    def _bind_scrolling(self, widget: tk.Widget) -> None:
+        widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", lambda e: self._scroll_to(self.first - 3))
+        widget.bind("<Button-5>", lambda e: self._scroll_to(self.first + 3))
+
+    def set_source(self, count: int, formatter: Callable[[int], object]) -> None:
+        """
+        Asigna los datos: 'count' filas, formateadas bajo demanda por 'formatter'.
+        """
+        self.count = count
+        self.formatter = formatter
+        self._scroll_to(0)
+
+    def clear(self) -> None:
+        """
+        Vacía la vista.
+        """
+        self.set_source(0, lambda i: "")
+
+    def _scroll_to(self, first: int) -> str:
+        self.first = max(0, min(first, self.count - self.height))
+        last = min(self.first + self.height, self.count)
+        self._render([self.formatter(i) for i in range(self.first, last)])
+        if self.count > self.height:
+            self.scrollbar.set(self.first / self.count, last / self.count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        return "break"
+
+    def _yview(self, action: str, amount: str, unit: str = "units") -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * self.count))
+        elif action == "scroll":
+            step = self.height if unit == "pages" else 1
+            self._scroll_to(self.first + int(amount) * step)
+
+    def _on_wheel(self, event) -> str:
+        return self._scroll_to(self.first - (3 if event.delta > 0 else -3))
+
+    def _render(self, rows: list) -> None:
+        raise NotImplementedError
+
+
+class VirtualList(_VirtualView):
+    """
+    Lista virtual basada en tk.Listbox: 'formatter(i)' devuelve el texto de la fila i.
+    """
+    def __init__(self, master, height: int = 20, width: int = 25, font=("Arial", 10),
+                 **frame_options) -> None:
+        super().__init__(master, height, **frame_options)
+        self.listbox = tk.Listbox(self, height=height, width=width, font=font)
+        self._bind_scrolling(self.listbox)
+
+    def _render(self, rows: list) -> None:
+        self.listbox.delete(0, tk.END)
+        if rows:
+            self.listbox.insert(tk.END, *rows)
+
+
+class VirtualTable(_VirtualView):
+    """
+    Tabla virtual basada en ttk.Treeview: 'formatter(i)' devuelve la tupla de
+    valores de la fila i. El Treeview queda accesible en 'tree' para
+    configurar encabezados y columnas.
+    """
+    def __init__(self, master, columns: Sequence[str], height: int = 8, **frame_options) -> None:
+        super().__init__(master, height, **frame_options)
+        self.tree = ttk.Treeview(self, columns=tuple(columns), show="headings", height=height)
+        self._bind_scrolling(self.tree)
+
+    def _render(self, rows: list) -> None:
+        self.tree.delete(*self.tree.get_children())
+        for values in rows:
+            self.tree.insert("", tk.END, values=values)
@@ -0,0 +1,40 @@
+import json
+
+import numpy as np
+
+from autoajuste import EngineTuner, _circle_sample, _circle_size, midpoint_circle_python
+from motor_circulos import midpoint_circle_cached, shape_cache
+
+
+def _off_by_one(xc, yc, r):
+    points = midpoint_circle_cached(xc, yc, r).copy()
+    points[-1] += 1
+    return points
+
+
+def _tuner(path):
+    tuner = EngineTuner(path=str(path))
+    op = tuner.operation("circle", _circle_size, _circle_sample, default="numpy", reference="python")
+    op.register("python", midpoint_circle_python)
+    op.register("numpy", midpoint_circle_cached, cache=shape_cache)
+    op.register("roto", _off_by_one)
+    return tuner
+
+
+def test_calibration_rejects_wrong_engines_and_round_trips_its_cache(tmp_path):
+    path = tmp_path / "autoajuste.json"
+    before = (dict(shape_cache._shapes), shape_cache.nbytes, shape_cache.hits, shape_cache.misses)
+    measured = _tuner(path).prepare("circle")
+    # La calibración no usa ni llena la caché compartida de formas
+    assert (dict(shape_cache._shapes), shape_cache.nbytes, shape_cache.hits, shape_cache.misses) == before
+    assert set(measured.rejected) == {"roto"}
+    assert {engine for _, engine in measured.table} <= {"python", "numpy"}
+    assert "roto" in json.loads(path.read_text(encoding="utf-8"))["operations"]["circle"]["rejected"]
+
+    tuner = _tuner(path)
+    loaded = tuner.prepare("circle")
+    assert loaded.source.startswith("caché")
+    assert loaded.table == measured.table and loaded.rejected == measured.rejected
+    for r in (0, 3, 40, 700):
+        engine = tuner.select("circle", 2, -1, r)
+        assert np.array_equal(np.asarray(engine(2, -1, r)), midpoint_circle_python(2, -1, r)), r
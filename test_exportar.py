@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from exportar import main
+from nucleo import dda_algorithm, midpoint_circle_algorithm
+
+
+def test_circle_export_round_trip(tmp_path):
+    # Contorno en .npy y .csv, y relleno en el archivo '_relleno'
+    main(["circulo", "3", "-7", "250", "--fill", "-o", str(tmp_path / "c.npy")])
+    expected = np.array(midpoint_circle_algorithm(3, -7, 250))
+    assert np.array_equal(np.load(tmp_path / "c.npy"), expected)
+    spans = np.load(tmp_path / "c_relleno.npy")
+    assert len(spans) == 501 and (spans[:, 1] <= spans[:, 2]).all()
+
+    main(["circulo", "3", "-7", "250", "-o", str(tmp_path / "c.csv")])
+    assert np.array_equal(np.loadtxt(tmp_path / "c.csv", delimiter=",", skiprows=1, dtype=np.int64), expected)
+
+
+def test_line_export_round_trip(tmp_path):
+    main(["linea", "-5", "2", "3000", "1234", "-o", str(tmp_path / "l.npy")])
+    assert np.array_equal(np.load(tmp_path / "l.npy"), np.array(dda_algorithm(-5, 2, 3000, 1234)[0]))
+
+
+def test_negative_radius_is_rejected(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["circulo", "0", "0", "-3", "-o", str(tmp_path / "c.npy")])
@@ -0,0 +1,73 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from autoajuste import tuner
+from lote import main, read_scene
+from motor_circulos import circle_fill_spans
+from motor_lineas import bresenham_points
+from nucleo import dda_algorithm, midpoint_circle_algorithm
+
+CSV_SCENE = """tipo,a,b,c,d
+linea,-3,2,40,17,DDA
+circulo,5,-6,9,relleno
+linea,0,0,-12,30,Bresenham
+triangulo,0,0,20,4,6,15,Bresenham
+"""
+JSON_SCENE = """{"type": "line", "x1": -3, "y1": 2, "x2": 40, "y2": 17}
+{"type": "circle", "xc": 5, "yc": -6, "r": 9, "fill": true}
+{"type": "line", "x1": 0, "y1": 0, "x2": -12, "y2": 30, "engine": "Bresenham"}
+{"type": "triangle", "points": [[0, 0], [20, 4], [6, 15]], "engine": "Bresenham"}
+"""
+
+
+def test_negative_radius_reports_scene_line():
+    scene = io.StringIO("linea,0,0,5,3\n\n# comentario\ncirculo,1,1,-3,relleno\n")
+    with pytest.raises(ValueError, match="Línea 4 .*radio"):
+        list(read_scene(scene, "csv"))
+    scene = io.StringIO('[\n {"type": "line", "x1": 0, "y1": 0, "x2": 3, "y2": 1},\n'
+                        ' {"type": "circle",\n  "xc": 0, "yc": 0, "r": -2}\n]\n')
+    with pytest.raises(ValueError, match="Línea 3 .*radio"):
+        list(read_scene(scene, "json"))
+
+
+def test_unknown_engine_is_rejected_and_missing_is_dda():
+    kinds = list(read_scene(io.StringIO("linea,0,0,5,3\nlinea,0,0,5,3,\nlinea,0,0,5,3,Bresenham\n"), "csv"))
+    assert [params["engine"] for _, params in kinds] == ["DDA", "DDA", "Bresenham"]
+    with pytest.raises(ValueError, match="Línea 1 .*'bresenham'"):
+        list(read_scene(io.StringIO('{"type": "line", "x1": 0, "y1": 0, "x2": 1, "y2": 1, "engine": "bresenham"}'),
+                        "json"))
+
+
+def _run(tmp_path, name, text):
+    scene = tmp_path / name
+    scene.write_text(text, encoding="utf-8")
+    out = {kind: tmp_path / f"{scene.stem}_{kind}" for kind in ("points.csv", "spans.csv", "summary.json")}
+    main([str(scene), "--points", str(out["points.csv"]), "--spans", str(out["spans.csv"]),
+          "--summary", str(out["summary.json"])])
+    return out
+
+
+def test_batch_outputs_round_trip(tmp_path, monkeypatch):
+    # Sin calibrar ni escribir la caché del autoajuste del usuario
+    monkeypatch.setattr(tuner, "enabled", False)
+    monkeypatch.setattr(tuner, "_ready", {})
+    from_csv = _run(tmp_path, "escena.csv", CSV_SCENE)
+    from_json = _run(tmp_path, "escena.jsonl", JSON_SCENE)
+    for kind in from_csv:
+        if kind != "summary.json":
+            assert from_csv[kind].read_bytes() == from_json[kind].read_bytes(), kind
+
+    points = np.loadtxt(from_csv["points.csv"], delimiter=",", skiprows=1, dtype=np.int64)
+    for ident, expected in enumerate([dda_algorithm(-3, 2, 40, 17)[0], midpoint_circle_algorithm(5, -6, 9),
+                                      bresenham_points(0, 0, -12, 30)]):
+        assert np.array_equal(points[points[:, 0] == ident, 1:], np.array(expected)), ident
+    spans = np.loadtxt(from_csv["spans.csv"], delimiter=",", skiprows=1, dtype=np.int64)
+    assert np.array_equal(spans[spans[:, 0] == 1, 1:], circle_fill_spans(5, -6, 9))
+    assert set(spans[:, 0].tolist()) == {1, 3}
+
+    summary = json.loads(from_csv["summary.json"].read_text(encoding="utf-8"))
+    assert summary["primitives"] == 4
+    assert {row["kind"]: row["count"] for row in summary["kinds"]} == {"line": 2, "circle": 1, "triangle": 1}
@@ -0,0 +1,25 @@
+import random
+
+import numpy as np
+
+from mosaico import TiledCanvas
+from motor_lineas import bresenham_points
+from nucleo import dda_algorithm
+from raster import Framebuffer
+
+
+def _lines(count, seed=0):
+    # Segmentos que cruzan varios mosaicos y salen del lienzo
+    rng = random.Random(seed)
+    return [(30, 60, 24, 96)] + [tuple(rng.randint(-30, 130) for _ in range(4)) for _ in range(count)]
+
+
+def test_tiled_lines_match_plain_framebuffer(tmp_path):
+    with TiledCanvas.create(str(tmp_path / "lienzo.npy"), 100, 120, x0=-10, y0=-5, tile_size=16) as canvas:
+        for engine, reference in (("DDA", lambda *s: dda_algorithm(*s)[0]), ("Bresenham", bresenham_points)):
+            canvas.tiles[:] = 0
+            expected = Framebuffer(100, 120, -10, -5)
+            for segment in _lines(200):
+                canvas.draw_line(*segment, engine=engine)
+                expected.plot_points(np.array(reference(*segment)), "blue")
+            assert np.array_equal(canvas.region(canvas.viewport()).pixels, expected.pixels), engine
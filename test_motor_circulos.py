@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+
+from motor_circulos import CircleShapeCache, circle_fill_runs, midpoint_circle_cached, midpoint_circle_offsets
+from nucleo import midpoint_circle_algorithm
+
+
+def _reference_circle(xc, yc, r):
+    # Bucle original del punto medio con sus 8 simetrías (puntos repetidos incluidos)
+    x, y, p = 0, r, 1 - r
+    points = []
+    while x <= y:
+        points += [(xc + x, yc + y), (xc - x, yc + y), (xc + x, yc - y), (xc - x, yc - y),
+                   (xc + y, yc + x), (xc - y, yc + x), (xc + y, yc - x), (xc - y, yc - x)]
+        if p < 0:
+            p += 2 * x + 3
+        else:
+            p += 2 * x - 2 * y + 5
+            y -= 1
+        x += 1
+    return points
+
+
+def test_shape_cache_translates_bounds_bytes_and_bypasses():
+    cache = CircleShapeCache(max_bytes=midpoint_circle_offsets(40).nbytes * 2)
+    for r in (5, 40, 5, 12, 40, 300):
+        points = cache.points(-7, 11, r)
+        assert set(map(tuple, points.tolist())) == set(_reference_circle(-7, 11, r))
+        assert cache.nbytes <= cache.max_bytes
+    # La forma de r=300 no cabe en el presupuesto: se calcula sin guardarla
+    assert 300 not in cache._shapes and cache.hits == 2 and cache.misses == 4
+
+    contents, counters = dict(cache._shapes), (cache.nbytes, cache.hits, cache.misses)
+    with cache.bypass():
+        cache.points(0, 0, 5)
+        cache.points(0, 0, 7)
+        assert len(cache._shapes) == 0
+    assert dict(cache._shapes) == contents and (cache.nbytes, cache.hits, cache.misses) == counters
+
+
+def test_circle_points_once_in_clockwise_order():
+    for r in list(range(0, 150)) + [1000, 4097]:
+        points = midpoint_circle_cached(3, -4, r)
+        pairs = list(map(tuple, points.tolist()))
+        assert len(set(pairs)) == len(pairs), r
+        assert set(pairs) == set(_reference_circle(3, -4, r)), r
+        assert pairs == midpoint_circle_algorithm(3, -4, r), r
+        # Ángulo en sentido horario desde (xc, yc + r): nunca retrocede
+        angles = [math.atan2(x - 3, y + 4) % (2 * math.pi) for x, y in pairs]
+        assert all(a <= b for a, b in zip(angles, angles[1:])), r
+
+
+def test_circle_fill_spans_match_original_row_loop():
+    for r in list(range(0, 120)) + [999]:
+        runs = circle_fill_runs(5, -2, r)
+        # Relleno original: una fila por y con dx = round(sqrt(r² - (y - yc)²))
+        expected = []
+        for y in range(-2 - r, -2 + r + 1):
+            dx = int(round(math.sqrt(r * r - (y + 2) ** 2)))
+            expected.append((y, 5 - dx, 5 + dx))
+        assert runs.to_array().tolist() == [list(row) for row in expected], r
@@ -0,0 +1,35 @@
+import random
+
+import numpy as np
+
+from motor_lineas import bresenham_cached, bresenham_points, bresenham_points_cached, dda_buffers, dda_float_points
+from nucleo import dda_algorithm, dda_algorithm_float
+
+
+def _segments(count, seed=0, low=-200, high=200):
+    # Segmentos al azar que en general no empiezan en el origen
+    rng = random.Random(seed)
+    return [tuple(rng.randint(low, high) for _ in range(4)) for _ in range(count)]
+
+
+def test_dda_matches_dda_algorithm_off_origin():
+    for x1, y1, x2, y2 in _segments(3000):
+        points_int, points_float, dx, dy = dda_algorithm(x1, y1, x2, y2)
+        fast_int, fast_float, fast_dx, fast_dy = dda_buffers(x1, y1, x2, y2)
+        assert np.array_equal(fast_int.data, np.array(points_int)), (x1, y1, x2, y2)
+        assert np.array_equal(fast_float.data, np.array(points_float)), (x1, y1, x2, y2)
+        assert (fast_dx, fast_dy) == (dx, dy)
+
+
+def test_dda_float_points_matches_dda_algorithm_float():
+    for segment in _segments(1000, seed=1):
+        expected = np.array(dda_algorithm_float(*segment))
+        assert np.array_equal(dda_float_points(*segment), expected), segment
+
+
+def test_bresenham_cache_matches_bresenham_points():
+    # Segmentos repetidos y reflejados para que la caché acierte
+    for x1, y1, x2, y2 in _segments(1500, seed=2, low=-30, high=30) * 2:
+        expected = np.array(bresenham_points(x1, y1, x2, y2))
+        assert np.array_equal(bresenham_points_cached(x1, y1, x2, y2), expected)
+        assert np.array_equal(bresenham_cached(x1, y1, x2, y2)[0].data, expected)
@@ -0,0 +1,33 @@
+import numpy as np
+
+from motor_circulos import circle_chunks, circle_progressive
+from motor_lineas import bresenham_chunks, bresenham_points, dda_chunks
+from nucleo import circle_point_count, dda_algorithm, iter_circle_chunks, iter_dda_chunks, midpoint_circle_algorithm
+
+
+def _joined(chunks, chunk_size):
+    chunks = [np.asarray(chunk).reshape(-1, 2) for chunk in chunks]
+    assert all(1 <= len(chunk) <= chunk_size for chunk in chunks)
+    return np.concatenate(chunks)
+
+
+def test_streaming_chunks_match_whole_results():
+    for chunk_size in (1, 7, 64):
+        for segment in ((3, -2, 150, 71), (0, 0, -40, 200), (5, 5, 5, 5)):
+            points_int, points_float, _, _ = dda_algorithm(*segment)
+            python_chunks = list(iter_dda_chunks(*segment, chunk_size=chunk_size))
+            assert np.array_equal(_joined((c for c, _ in python_chunks), chunk_size), np.array(points_int))
+            numpy_chunks = list(dda_chunks(*segment, chunk_size=chunk_size))
+            assert np.array_equal(_joined((c for c, _ in numpy_chunks), chunk_size), np.array(points_int))
+            assert np.array_equal(_joined((f for _, f in numpy_chunks), chunk_size), np.array(points_float))
+            assert np.array_equal(_joined(bresenham_chunks(*segment, chunk_size=chunk_size), chunk_size),
+                                  np.array(bresenham_points(*segment)))
+        for r in (0, 1, 17, 300):
+            expected = np.array(midpoint_circle_algorithm(-3, 8, r))
+            assert len(expected) == circle_point_count(r)
+            assert np.array_equal(_joined(iter_circle_chunks(-3, 8, r, chunk_size), chunk_size), expected)
+            assert np.array_equal(_joined(circle_chunks(-3, 8, r, chunk_size), chunk_size), expected)
+            # Cada paso progresivo es un prefijo del resultado final
+            steps = list(circle_progressive(-3, 8, r, chunk_size=chunk_size))
+            assert all(np.array_equal(s.data, expected[:len(s)]) for s in steps)
+            assert len(steps[-1]) == len(expected)
@@ -0,0 +1,30 @@
+import random
+
+import numpy as np
+import pytest
+
+from paralelo import render_scene
+
+
+def _scene(seed=0):
+    rng = random.Random(seed)
+    lines = [[rng.randint(-200, 200) for _ in range(4)] for _ in range(300)]
+    circles = [[rng.randint(-150, 150), rng.randint(-150, 150), rng.randint(0, 60)] for _ in range(60)]
+    triangles = [[[rng.randint(-200, 200), rng.randint(-200, 200)] for _ in range(3)] for _ in range(40)]
+    return lines, circles, triangles
+
+
+@pytest.mark.parametrize("engine", ["DDA", "Bresenham"])
+def test_render_scene_is_independent_of_workers(engine):
+    lines, circles, triangles = _scene()
+    single = render_scene(lines, circles, triangles, workers=1, engine=engine)
+    several = render_scene(lines, circles, triangles, workers=3, engine=engine)
+    assert (single.width, single.height, single.x0, single.y0) == (several.width, several.height,
+                                                                   several.x0, several.y0)
+    assert np.array_equal(single.pixels, several.pixels)
+    assert single.pixels[..., 3].any()
+
+
+def test_render_scene_rejects_negative_radius():
+    with pytest.raises(ValueError, match="circunferencia 1"):
+        render_scene(circles=[[0, 0, 5], [3, 3, -1]], workers=1)
@@ -0,0 +1,23 @@
+import numpy as np
+
+from puntos import PointBuffer, as_points
+
+
+def test_point_buffer_behaves_like_a_list_of_tuples():
+    points = [(i, -2 * i) for i in range(-5, 300)]
+    buf = as_points(points)
+    assert len(buf) == len(points)
+    assert list(buf) == points
+    assert buf[3] == points[3] and buf[-1] == points[-1]
+    assert list(buf[10:20]) == points[10:20]
+    assert np.array_equal(buf.x, [x for x, _ in points]) and np.array_equal(buf.y, [y for _, y in points])
+    # Vistas y conversiones sin copia
+    assert as_points(buf) is buf
+    assert np.shares_memory(buf.x, buf.data) and np.asarray(buf) is buf.data
+
+    compact = PointBuffer.from_points(points, np.int32)
+    assert compact.nbytes == 8 * len(points)
+    chunks = [points[i:i + 64] for i in range(0, len(points), 64)]
+    assert list(PointBuffer.from_chunks(chunks, len(points))) == points
+    assert list(PointBuffer.from_chunks(chunks)) == points
+    assert len(PointBuffer.from_chunks([])) == 0
@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+
+from motor_circulos import circle_fill_spans
+from motor_lineas import bresenham_points
+from nucleo import dda_algorithm, midpoint_circle_algorithm
+from recorte import Viewport, bresenham_clipped, circle_clipped, circle_fill_clipped, dda_clipped
+
+
+def _masked(points_int, viewport, values=None):
+    # Puntos de la línea completa (o sus 'values' asociados) que caen en el viewport
+    points_int = np.array(points_int).reshape(-1, 2)
+    values = points_int if values is None else np.array(values).reshape(-1, 2)
+    return values[viewport.mask(points_int)]
+
+
+def test_dda_clipped_matches_dda_algorithm_masked():
+    rng = random.Random(0)
+    for _ in range(2000):
+        segment = tuple(rng.randint(-100, 100) for _ in range(4))
+        x_min, y_min = rng.randint(-60, 40), rng.randint(-60, 40)
+        viewport = Viewport(x_min, y_min, x_min + rng.randint(0, 60), y_min + rng.randint(0, 60))
+        points_int, points_float, _, _ = dda_algorithm(*segment)
+        clipped_int, clipped_float = dda_clipped(*segment, viewport)
+        assert np.array_equal(clipped_int, _masked(points_int, viewport)), (segment, viewport)
+        assert np.array_equal(clipped_float, _masked(points_int, viewport, points_float)), (segment, viewport)
+
+
+def test_dda_clipped_reported_case():
+    viewport = Viewport(-3, 12, 53, 60)
+    points_int, _, _, _ = dda_algorithm(78, 39, -94, 9)
+    clipped_int, _ = dda_clipped(78, 39, -94, 9, viewport)
+    assert np.array_equal(clipped_int, _masked(points_int, viewport))
+
+
+def test_clipped_bresenham_and_circles_match_full_then_mask():
+    rng = random.Random(1)
+    for _ in range(500):
+        x_min, y_min = rng.randint(-60, 40), rng.randint(-60, 40)
+        viewport = Viewport(x_min, y_min, x_min + rng.randint(0, 60), y_min + rng.randint(0, 60))
+        segment = tuple(rng.randint(-100, 100) for _ in range(4))
+        assert np.array_equal(bresenham_clipped(*segment, viewport),
+                              _masked(bresenham_points(*segment), viewport)), (segment, viewport)
+
+        xc, yc, r = rng.randint(-30, 30), rng.randint(-30, 30), rng.randint(0, 70)
+        # Mismo orden angular que la circunferencia completa
+        assert np.array_equal(circle_clipped(xc, yc, r, viewport),
+                              _masked(midpoint_circle_algorithm(xc, yc, r), viewport)), (xc, yc, r, viewport)
+        spans = circle_fill_spans(xc, yc, r)
+        spans[:, 1] = np.maximum(spans[:, 1], viewport.x_min)
+        spans[:, 2] = np.minimum(spans[:, 2], viewport.x_max)
+        visible = (spans[:, 0] >= viewport.y_min) & (spans[:, 0] <= viewport.y_max) & (spans[:, 1] <= spans[:, 2])
+        assert np.array_equal(circle_fill_clipped(xc, yc, r, viewport), spans[visible]), (xc, yc, r, viewport)
@@ -0,0 +1,63 @@
+import random
+
+import numpy as np
+
+from motor_lineas import bresenham_points
+from nucleo import dda_algorithm_float
+from recorte import Viewport
+from relleno import polygon_runs, triangle_runs, triangle_spans
+
+
+def _reference_triangle_spans(tri_points, engine):
+    # Relleno original: muestras de las aristas agrupadas por fila en un
+    # diccionario y, en cada fila con más de una, del menor al mayor x
+    tri_points = sorted(tri_points, key=lambda p: p[1])
+    edge_dict = {}
+    for i in range(3):
+        (x1, y1), (x2, y2) = tri_points[i], tri_points[(i + 1) % 3]
+        if engine == "DDA":
+            samples = [(round(x), round(y)) for x, y in dda_algorithm_float(x1, y1, x2, y2)]
+        else:
+            samples = bresenham_points(x1, y1, x2, y2)
+        for x, y in samples:
+            edge_dict.setdefault(y, []).append(x)
+    return [(min(xs), y, max(xs), y) for y, xs in sorted(edge_dict.items()) if len(xs) > 1]
+
+
+def test_triangle_fill_matches_original_scanline():
+    rng = random.Random(0)
+    for _ in range(500):
+        tri = [(rng.randint(-60, 60), rng.randint(-60, 60)) for _ in range(3)]
+        for engine in ("DDA", "Bresenham"):
+            expected = _reference_triangle_spans(tri, engine)
+            assert triangle_spans(tri, engine) == expected, (tri, engine)
+            assert [tuple(row) for row in triangle_runs(tri, engine).to_array().tolist()] == \
+                [(y, x_min, x_max) for x_min, y, x_max, _ in expected], (tri, engine)
+
+
+def _inside_even_odd(vertices, x, y):
+    # Prueba de paridad en el centro del píxel: cruces de las aristas que
+    # cubren la fila (regla semiabierta y_bajo <= y < y_alto) a la izquierda de x
+    crossings = 0
+    for (px, py), (qx, qy) in zip(vertices, vertices[1:] + vertices[:1]):
+        (lx, ly), (hx, hy) = sorted([(px, py), (qx, qy)], key=lambda p: p[1])
+        if ly <= y < hy and lx + (y - ly) * ((hx - lx) / (hy - ly)) <= x:
+            crossings += 1
+    return crossings % 2 == 1
+
+
+def test_polygon_fill_matches_per_pixel_even_odd():
+    rng = random.Random(1)
+    viewport = Viewport(-12, -15, 20, 9)
+    for _ in range(40):
+        vertices = [(rng.randint(-25, 25), rng.randint(-25, 25)) for _ in range(rng.randint(3, 9))]
+        for clip in (None, viewport):
+            grid = np.zeros((51, 51), dtype=bool)
+            for y, a, b in polygon_runs(vertices, clip).to_array().tolist():
+                grid[y + 25, a + 25:b + 26] = True
+            expected = np.array([[_inside_even_odd(vertices, x, y) for x in range(-25, 26)] for y in range(-25, 26)])
+            if clip is not None:
+                outside = np.ones_like(expected)
+                outside[clip.y_min + 25:clip.y_max + 26, clip.x_min + 25:clip.x_max + 26] = False
+                expected[outside] = False
+            assert np.array_equal(grid, expected), (vertices, clip)
@@ -0,0 +1,49 @@
+import random
+
+import numpy as np
+import pytest
+
+from tramos import SpanSet
+
+SIZE = 40
+
+
+def _random_spans(rng, count):
+    # Tramos al azar (con solapes) dentro de una rejilla SIZE x SIZE
+    ys = [rng.randrange(SIZE) for _ in range(count)]
+    starts = [rng.randrange(SIZE) for _ in range(count)]
+    ends = [min(SIZE - 1, x + rng.randrange(12)) for x in starts]
+    return ys, starts, ends
+
+
+def _mask(ys, starts, ends):
+    grid = np.zeros((SIZE, SIZE), dtype=bool)
+    for y, a, b in zip(ys, starts, ends):
+        grid[y, a:b + 1] = True
+    return grid
+
+
+def _to_mask(spans):
+    return _mask(spans.rows, spans.starts, spans.ends)
+
+
+def test_boolean_operations_match_pixel_masks():
+    rng = random.Random(0)
+    for _ in range(300):
+        raw_a, raw_b = _random_spans(rng, rng.randrange(30)), _random_spans(rng, rng.randrange(30))
+        a, b = SpanSet.from_spans(*raw_a), SpanSet.from_spans(*raw_b)
+        mask_a, mask_b = _mask(*raw_a), _mask(*raw_b)
+        assert a.is_disjoint() and np.array_equal(_to_mask(a), mask_a)
+        assert np.array_equal(_to_mask(a | b), mask_a | mask_b)
+        assert np.array_equal(_to_mask(a & b), mask_a & mask_b)
+        assert np.array_equal(_to_mask(a - b), mask_a & ~mask_b)
+        assert (a | b).area == int((mask_a | mask_b).sum())
+
+
+def test_unnormalized_overlaps_are_rejected():
+    with pytest.raises(ValueError):
+        SpanSet.from_spans([0, 0], [0, 3], [5, 8], normalize=False)
+    with pytest.raises(ValueError):
+        SpanSet.from_spans([1, 0], [0, 0], [2, 2], normalize=False)
+    touching = SpanSet.from_spans([0, 0], [0, 6], [5, 8], normalize=False)
+    assert (touching & SpanSet.from_spans([0], [0], [8])).area == 9
@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+# Intervalo (ms) con el que el hilo de Tk revisa la cola de resultados
+POLL_MS = 50
+
+_NOTHING = object()
+
+
+class Job:
+    """
+    Un trabajo en segundo plano: su bandera de cancelación, la cola por la
+    que el hilo trabajador envía resultados y los tiempos de inicio y fin
+    del cálculo (perf_counter, para la instrumentación).
+    """
+    def __init__(self) -> None:
+        self.cancel_event = threading.Event()
+        self.queue: "queue.Queue[tuple]" = queue.Queue()
+        self.started = 0.0
+        self.finished = 0.0
+        self.done = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        return self.finished - self.started
+
+
+class JobRunner:
+    """
+    Ejecuta cálculos fuera del hilo de la interfaz y entrega sus resultados
+    parciales en el hilo de Tk.
+
+    'submit' recibe una función que devuelve un iterable de resultados
+    acumulados (cada uno reemplaza al anterior: por ejemplo, el buffer con
+    los puntos calculados hasta ahora). Un hilo del pool lo recorre y pone
+    cada resultado en una cola segura entre hilos; la ventana la revisa con
+    'root.after' cada POLL_MS ms y solo muestra el último resultado
+    disponible, de modo que la interfaz nunca se bloquea y el dibujo se
+    actualiza a un ritmo acotado sin importar el tamaño de la entrada.
+
+    Entre un resultado y el siguiente el trabajador comprueba la bandera de
+    cancelación: 'cancel' (o enviar un trabajo nuevo) detiene el actual.
+    """
+    def __init__(self, root, workers: int = 1, poll_ms: int = POLL_MS) -> None:
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="raster")
+        self.job: Optional[Job] = None
+
+    def submit(self, produce: Callable[[], Iterable],
+               on_progress: Optional[Callable[[object], None]] = None,
+               on_done: Optional[Callable[[object], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               on_cancel: Optional[Callable[[], None]] = None) -> Job:
+        """
+        Lanza un trabajo nuevo (cancelando el anterior, si sigue en curso).
+
+        Args:
+            produce: Función sin argumentos que devuelve el iterable de
+                resultados acumulados; se llama en el hilo trabajador.
+            on_progress: Se llama en el hilo de Tk con el último resultado parcial.
+            on_done: Se llama en el hilo de Tk con el resultado final.
+            on_error: Se llama en el hilo de Tk si el cálculo lanza una excepción.
+            on_cancel: Se llama en el hilo de Tk si el trabajo se cancela.
+
+        Returns:
+            Job: El trabajo lanzado (también queda en 'self.job').
+        """
+        self.cancel()
+        job = Job()
+        self.job = job
+        self.executor.submit(self._work, job, produce)
+        self.root.after(self.poll_ms, self._poll, job, on_progress, on_done, on_error, on_cancel)
+        return job
+
+    def cancel(self) -> None:
+        """
+        Pide la cancelación del trabajo en curso (si lo hay).
+        """
+        if self.job is not None and not self.job.done:
+            self.job.cancel_event.set()
+
+    @property
+    def busy(self) -> bool:
+        return self.job is not None and not self.job.done
+
+    def shutdown(self) -> None:
+        """
+        Cancela el trabajo en curso y libera los hilos del pool.
+        """
+        self.cancel()
+        self.executor.shutdown(wait=False)
+
+    # ---------- Internos ----------
+
+    @staticmethod
+    def _work(job: Job, produce: Callable[[], Iterable]) -> None:
+        # Hilo trabajador: no toca widgets, solo escribe en la cola
+        job.started = time.perf_counter()
+        try:
+            last = _NOTHING
+            for result in produce():
+                if job.cancelled:
+                    job.queue.put(("cancel", None))
+                    return
+                job.queue.put(("progress", result))
+                last = result
+            job.finished = time.perf_counter()
+            job.queue.put(("done", None if last is _NOTHING else last))
+        except Exception as exc:
+            job.finished = time.perf_counter()
+            job.queue.put(("error", exc))
+
+    def _poll(self, job: Job, on_progress, on_done, on_error, on_cancel) -> None:
+        # Hilo de Tk: vacía la cola y entrega solo el último resultado parcial
+        latest = _NOTHING
+        final = None
+        while final is None:
+            try:
+                kind, value = job.queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                latest = value
+            else:
+                final = (kind, value)
+
+        if final is None and job.cancelled and job is not self.job:
+            # Reemplazado por un trabajo nuevo: se descarta en silencio
+            job.done = True
+            return
+        if latest is not _NOTHING and final is None and on_progress is not None:
+            on_progress(latest)
+        if final is None:
+            self.root.after(self.poll_ms, self._poll, job, on_progress, on_done, on_error, on_cancel)
+            return
+
+        job.done = True
+        if job is not self.job:
+            return
+        kind, value = final
+        if kind == "done" and on_done is not None:
+            on_done(value)
+        elif kind == "error" and on_error is not None:
+            on_error(value)
+        elif kind == "cancel" and on_cancel is not None:
+            on_cancel()
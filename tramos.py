@@ -0,0 +1,188 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from recorte import Viewport
+
+
+class SpanSet:
+    """
+    Región rellena codificada por tramos (RLE): tres arreglos paralelos
+    'rows', 'starts' y 'lengths', un tramo horizontal por fila y por pedazo
+    disjunto, con los píxeles [start, start + length) de la fila 'row'.
+
+    Los tramos están ordenados por (fila, inicio) y no se solapan. La
+    memoria crece con la altura de la región (y con sus huecos), no con su
+    área, y las operaciones booleanas trabajan sobre los bordes de los
+    tramos en O(S log S), sin rasterizar.
+
+    Los rellenos de círculo, triángulo y polígono producen un SpanSet; se
+    pinta con 'blit' en cualquier lienzo con 'fill_spans' (Framebuffer,
+    TiledCanvas) y se dibuja con 'hlines' del renderizador.
+    """
+    __slots__ = ("rows", "starts", "lengths")
+
+    def __init__(self, rows, starts, lengths) -> None:
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+
+    @classmethod
+    def empty(cls) -> "SpanSet":
+        return cls(np.empty(0), np.empty(0), np.empty(0))
+
+    @classmethod
+    def from_spans(cls, ys, x_starts, x_ends, normalize: bool = True) -> "SpanSet":
+        """
+        Crea el conjunto desde tramos [x_start, x_end] con extremos inclusivos.
+
+        Con 'normalize' (por defecto) los tramos se ordenan y se funden los
+        que se solapan o se tocan; los generadores de relleno, que ya los
+        producen ordenados y disjuntos, pasan normalize=False.
+
+        Raises:
+            ValueError: Con normalize=False, si los tramos no están ordenados
+            por (fila, inicio) o se solapan: las operaciones booleanas
+            cuentan la cobertura y un solape interno contaría doble.
+        """
+        ys = np.asarray(ys, dtype=np.int64)
+        x_starts = np.asarray(x_starts, dtype=np.int64)
+        lengths = np.asarray(x_ends, dtype=np.int64) - x_starts + 1
+        keep = lengths > 0
+        spans = cls(ys[keep], x_starts[keep], lengths[keep])
+        if normalize:
+            return _combine((spans,), 1)
+        if not spans.is_disjoint():
+            raise ValueError("Con normalize=False los tramos deben estar ordenados y sin solaparse.")
+        return spans
+
+    @classmethod
+    def from_array(cls, spans, normalize: bool = True) -> "SpanSet":
+        """
+        Crea el conjunto desde un arreglo (S, 3) de filas (y, x_start, x_end).
+        """
+        spans = np.asarray(spans, dtype=np.int64).reshape(-1, 3)
+        return cls.from_spans(spans[:, 0], spans[:, 1], spans[:, 2], normalize)
+
+    def is_disjoint(self) -> bool:
+        """
+        True si los tramos están ordenados por (fila, inicio) y no se solapan
+        (el invariante del que dependen las operaciones booleanas).
+        """
+        same_row = self.rows[1:] == self.rows[:-1]
+        return bool(np.all((self.rows[1:] > self.rows[:-1])
+                           | (same_row & (self.starts[1:] >= self.starts[:-1] + self.lengths[:-1]))))
+
+    @property
+    def ends(self) -> np.ndarray:
+        """
+        Último píxel (inclusivo) de cada tramo.
+        """
+        return self.starts + self.lengths - 1
+
+    @property
+    def area(self) -> int:
+        """
+        Número de píxeles de la región.
+        """
+        return int(self.lengths.sum())
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes + self.starts.nbytes + self.lengths.nbytes
+
+    def bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Caja (x_min, y_min, x_max, y_max) de la región, o None si está vacía.
+        """
+        if len(self) == 0:
+            return None
+        return (int(self.starts.min()), int(self.rows[0]), int(self.ends.max()), int(self.rows[-1]))
+
+    def to_array(self) -> np.ndarray:
+        """
+        Arreglo (S, 3) de filas (y, x_start, x_end), extremos inclusivos.
+        """
+        return np.column_stack([self.rows, self.starts, self.ends])
+
+    def row_tuple(self, i: int) -> Tuple[int, int, int, int]:
+        """
+        Tramo i en el formato (x_min, y, x_max, y) de las tablas de intersecciones.
+        """
+        y = int(self.rows[i])
+        start = int(self.starts[i])
+        return (start, y, start + int(self.lengths[i]) - 1, y)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __repr__(self) -> str:
+        return f"SpanSet({len(self)} tramos, área {self.area})"
+
+    # ---------- Operaciones ----------
+
+    def union(self, *others: "SpanSet") -> "SpanSet":
+        return _combine((self, *others), 1)
+
+    def intersection(self, other: "SpanSet") -> "SpanSet":
+        return _combine((self, other), 2)
+
+    def difference(self, other: "SpanSet") -> "SpanSet":
+        return _combine((self, other), 1, weights=(1, -2))
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def translate(self, dx: int, dy: int) -> "SpanSet":
+        return SpanSet(self.rows + dy, self.starts + dx, self.lengths)
+
+    def clip(self, viewport: Viewport) -> "SpanSet":
+        """
+        Parte de la región dentro del viewport.
+        """
+        starts = np.maximum(self.starts, viewport.x_min)
+        ends = np.minimum(self.ends, viewport.x_max)
+        keep = (self.rows >= viewport.y_min) & (self.rows <= viewport.y_max) & (starts <= ends)
+        return SpanSet(self.rows[keep], starts[keep], ends[keep] - starts[keep] + 1)
+
+    def blit(self, target, color="orange") -> None:
+        """
+        Pinta la región en un lienzo con 'fill_spans' (Framebuffer o TiledCanvas).
+        """
+        if len(self):
+            target.fill_spans(self.rows, self.starts, self.ends, color)
+
+
+def _combine(sets, need: int, weights=None) -> SpanSet:
+    """
+    Barrido por filas sobre los bordes de los tramos: cada tramo aporta +w
+    en su inicio y -w tras su fin; se conservan los intervalos cuya
+    cobertura acumulada es al menos 'need' y se funden los contiguos.
+    Con need=1 es la unión (y la normalización), con need=2 sobre dos
+    conjuntos la intersección y con pesos (1, -2) la diferencia.
+    """
+    weights = weights or (1,) * len(sets)
+    rows = np.concatenate([np.repeat(s.rows, 2) for s in sets])
+    xs = np.concatenate([np.column_stack([s.starts, s.starts + s.lengths]).ravel() for s in sets])
+    deltas = np.concatenate([np.tile(np.array([w, -w], dtype=np.int64), len(s))
+                             for s, w in zip(sets, weights)])
+    if len(rows) == 0:
+        return SpanSet.empty()
+
+    order = np.lexsort((xs, rows))
+    rows, xs, deltas = rows[order], xs[order], deltas[order]
+    coverage = np.cumsum(deltas)
+
+    # Intervalo [xs[i], xs[i+1]) con la cobertura tras el evento i
+    same_row = rows[:-1] == rows[1:]
+    keep = np.flatnonzero(same_row & (xs[1:] > xs[:-1]) & (coverage[:-1] >= need))
+    if len(keep) == 0:
+        return SpanSet.empty()
+    seg_rows, seg_starts, seg_ends = rows[keep], xs[keep], xs[keep + 1]
+
+    # Fusiona los intervalos que se tocan en la misma fila
+    new_run = np.r_[True, (seg_rows[1:] != seg_rows[:-1]) | (seg_starts[1:] != seg_ends[:-1])]
+    first = np.flatnonzero(new_run)
+    last = np.r_[first[1:], len(seg_rows)] - 1
+    return SpanSet(seg_rows[first], seg_starts[first], seg_ends[last] - seg_starts[first])
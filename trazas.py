@@ -0,0 +1,168 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import wraps
+from typing import Callable, List, Optional, Tuple
+
+# Contexto vacío compartido: con la instrumentación desactivada cada 'span'
+# cuesta una comprobación de atributo y nada más
+_NULL_SPAN = nullcontext()
+
+# Variable de entorno que activa la instrumentación: "1" solo mide y muestra
+# el desglose; una ruta (p. ej. traza.json) además exporta la traza al salir
+ENV_VAR = "RASTER_TRACE"
+
+
+class _Span:
+    """
+    Intervalo con nombre medido con perf_counter; se registra al salir.
+    """
+    __slots__ = ("tracer", "name", "start", "depth")
+
+    def __init__(self, tracer: "Tracer", name: str) -> None:
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.depth = self.tracer._depth
+        self.tracer._depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter()
+        self.tracer._depth -= 1
+        self.tracer._add(self.name, self.start, end, self.depth)
+
+
+class _Run(_Span):
+    """
+    Span raíz de una ejecución: al terminar publica el desglose.
+    """
+    __slots__ = ()
+
+    def __enter__(self) -> "_Run":
+        self.tracer._current = []
+        return super().__enter__()
+
+    def __exit__(self, *exc) -> None:
+        super().__exit__(*exc)
+        self.tracer.last_run = self.tracer._current
+        self.tracer._current = None
+        if self.tracer.on_run is not None:
+            self.tracer.on_run(self.tracer.summary())
+
+
+class Tracer:
+    """
+    Instrumentación ligera por etapas con intervalos (spans) con nombre.
+
+    Cada ejecución de una aplicación se envuelve en 'run(nombre)' (o se
+    decora con 'traced(nombre)') y sus etapas en 'span(nombre)': algoritmo,
+    tabla, artistas, dibujo... Al terminar la ejecución se llama a 'on_run'
+    con un resumen de una línea, pensado para una barra de estado. Todos
+    los eventos se guardan (hasta 'max_events') y pueden exportarse en
+    formato Chrome trace (chrome://tracing o Perfetto).
+
+    Desactivado, 'span' y 'run' devuelven un contexto vacío compartido.
+    """
+    def __init__(self, enabled: bool = False, max_events: int = 100_000) -> None:
+        self.enabled = enabled
+        self.events: deque = deque(maxlen=max_events)
+        self.last_run: List[Tuple[str, float, float, int]] = []
+        self.on_run: Optional[Callable[[str], None]] = None
+        self._current: Optional[list] = None
+        self._depth = 0
+        self._epoch = time.perf_counter()
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """
+        Crea el trazador según RASTER_TRACE; si su valor es una ruta, la
+        traza se exporta a ese archivo al terminar el proceso.
+        """
+        value = os.environ.get(ENV_VAR, "")
+        tracer = cls(enabled=value not in ("", "0"))
+        if tracer.enabled and value != "1":
+            atexit.register(tracer.export_chrome, value)
+        return tracer
+
+    def span(self, name: str):
+        """
+        Contexto que mide una etapa.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def run(self, name: str):
+        """
+        Contexto que mide una ejecución completa y publica su desglose.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Run(self, name)
+
+    def traced(self, name: str) -> Callable:
+        """
+        Decorador: cada llamada a la función es una ejecución 'run(name)'.
+        """
+        def decorator(fn: Callable) -> Callable:
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.run(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """
+        Registra una etapa medida a mano (cuando no cabe en un 'with').
+        """
+        if self.enabled:
+            self._add(name, start, end, self._depth)
+
+    def summary(self) -> str:
+        """
+        Desglose de la última ejecución: etapas de primer nivel y total.
+        """
+        if not self.last_run:
+            return ""
+        root = self.last_run[-1]
+        stages = [f"{name} {dur * 1e3:.1f} ms" for name, _, dur, depth in self.last_run
+                  if depth == root[3] + 1]
+        # Las etapas registradas a mano (p. ej. el cálculo de un hilo
+        # trabajador) pueden empezar antes que la ejecución
+        total = root[1] + root[2] - min(start for _, start, _, _ in self.last_run)
+        return " | ".join(stages + [f"total {total * 1e3:.1f} ms"])
+
+    def export_chrome(self, path: str) -> None:
+        """
+        Escribe los eventos en formato Chrome trace (JSON, eventos completos "X").
+        """
+        pid = os.getpid()
+        events = [{"name": name, "ph": "X", "pid": pid, "tid": tid,
+                   "ts": (start - self._epoch) * 1e6, "dur": dur * 1e6}
+                  for name, start, dur, tid in self.events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def clear(self) -> None:
+        self.events.clear()
+        self.last_run = []
+
+    def _add(self, name: str, start: float, end: float, depth: int) -> None:
+        self.events.append((name, start, end - start, threading.get_ident()))
+        if self._current is not None:
+            self._current.append((name, start, end - start, depth))
+
+
+# Trazador compartido por las aplicaciones
+tracer = Tracer.from_env()
@@ -1,168 +1,209 @@
 import tkinter as tk
-from tkinter import ttk
 from tkinter import messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-def dda_algorithm_float(x1, y1, x2, y2):
+import numpy as np
+from nucleo import calculate_slope
+from motor_lineas import bresenham_points_cached, dda_float_points
+from raster import Framebuffer
+from renderizador import PlotRenderer
+from tabla_virtual import VirtualTable
+from trabajos import JobRunner
+from relleno import triangle_runs
+from trazas import tracer
+
+# Motores de línea disponibles, seleccionables por nombre
+LINE_ENGINES = {
+    "DDA": dda_float_points,
+    "Bresenham": bresenham_points_cached,
+}
+
+def fill_triangle(renderer, points_float, engine="DDA"):
     """
-    Versión de DDA que devuelve puntos en float,
-    para que la línea se vea suave (sin 'escalones').
+    Relleno tipo 'scanline' (líneas horizontales).
+    Las aristas se muestrean con el motor de línea y, en cada fila (y),
+    el tramo va del menor al mayor x (ver relleno.triangle_runs).
+    Devuelve los tramos como SpanSet. Si 'renderer' es None solo se
+    calculan, sin dibujarlos; si no, se dibujan todos como una sola
+    LineCollection.
     """
-    dx = x2 - x1
-    dy = y2 - y1
-    steps = max(abs(dx), abs(dy))
+    runs = triangle_runs(points_float, engine)
+    if renderer is not None and len(runs):
+        renderer.hlines('fill', runs.rows, runs.starts, runs.ends, colors='r', linewidth=1)
+    return runs
 
-    if steps == 0:
-        return [(x1, y1)]
-    
-    x_inc = dx / steps
-    y_inc = dy / steps
-    
-    x, y = x1, y1
-    points = []
-    
-    for _ in range(int(steps) + 1):
-        points.append((x, y))
-        x += x_inc
-        y += y_inc
-    
-    return points
-
-def fill_triangle(ax, points_float):
+def triangle_progressive(tri_points, engine="DDA"):
     """
-    Relleno tipo 'scanline' (líneas horizontales).
-    Para ello, convertimos los puntos 'float' en enteros
-    y los agrupamos por filas (y).
+    Cálculo del triángulo por etapas, para mostrarlo mientras avanza: produce
+    (tramos del relleno, aristas calculadas hasta ahora) primero con el relleno
+    y luego tras cada arista.
     """
-    points_float = sorted(points_float, key=lambda p: p[1])
-
+    line_engine = LINE_ENGINES[engine]
+    intersections = fill_triangle(None, tri_points, engine)
     edges = []
+    yield intersections, list(edges)
     for i in range(3):
-        x1, y1 = points_float[i]
-        x2, y2 = points_float[(i + 1) % 3]
-        line_points = dda_algorithm_float(x1, y1, x2, y2)
-        edges.extend(line_points)
-
-    edge_dict = {}
-    for (xf, yf) in edges:
-        x = round(xf)
-        y = round(yf)
-        if y in edge_dict:
-            edge_dict[y].append(x)
-        else:
-            edge_dict[y] = [x]
-
-    intersections = []
-    for y in sorted(edge_dict.keys()):
-        x_vals = sorted(edge_dict[y])
-        if len(x_vals) > 1:
-            x_min, x_max = x_vals[0], x_vals[-1]
-            intersections.append((x_min, y, x_max, y))
-            ax.plot(range(x_min, x_max + 1), [y]*(x_max - x_min + 1),
-                    'r-', markersize=1)
-    return intersections
+        x1, y1 = tri_points[i]
+        x2, y2 = tri_points[(i + 1) % 3]
+        edges.append(line_engine(x1, y1, x2, y2))
+        yield intersections, list(edges)
 
-def plot_triangle(canvas, ax, tri_points):
+def plot_triangle(renderer, tri_points, engine="DDA", overlay=False, computed=None):
     """
     Dibuja contorno y rellena el triángulo.
+    'engine' es el nombre del motor de línea ("DDA" o "Bresenham").
+    El relleno y los píxeles del contorno se pintan en un framebuffer que se
+    muestra como una sola imagen; con 'overlay' el relleno también se dibuja
+    con matplotlib. La figura y los artistas se reutilizan entre ejecuciones.
+    'computed' es un resultado (intersecciones, aristas) ya calculado, por
+    ejemplo en segundo plano; si falta, se calcula aquí.
     """
-    ax.clear()
+    # Cálculo (tramos de relleno y aristas) antes de tocar los artistas
+    if computed is None:
+        with tracer.span("algoritmo"):
+            for computed in triangle_progressive(tri_points, engine):
+                pass
+    intersections, edges = computed
     
-    for i in range(3):
-        x1, y1 = tri_points[i]
-        x2, y2 = tri_points[(i + 1) % 3]
-        line_points = dda_algorithm_float(x1, y1, x2, y2)
-        xf = [p[0] for p in line_points]
-        yf = [p[1] for p in line_points]
-        ax.plot(xf, yf, 'b-', linewidth=2)
+    renderer.begin()
+    renderer.set_title(f"Triángulo con {engine}", fontsize=14, fontweight='bold')
+    
+    xs = [p[0] for p in tri_points]
+    ys = [p[1] for p in tri_points]
+    fb = Framebuffer.for_bounds(min(xs), min(ys), max(xs), max(ys), margin=1)
+    
+    intersections.blit(fb, 'red')
+    if overlay and len(intersections):
+        renderer.hlines('fill', intersections.rows, intersections.starts, intersections.ends,
+                        colors='r', linewidth=1)
+    
+    for line_points in edges:
+        fb.plot_points(np.rint(line_points), 'blue')
+    renderer.image('raster', fb)
     
-    intersections = fill_triangle(ax, tri_points)
+    for i, line_points in enumerate(edges):
+        edge = np.asarray(line_points, dtype=float).reshape(-1, 2)
+        renderer.lod_line(f'edge{i}', edge[:, 0], edge[:, 1], color='b', linestyle='-', linewidth=2)
     
-    ax.set_title("Triángulo con DDA", fontsize=14, fontweight='bold')
-    ax.set_xlabel("Eje X", fontsize=12)
-    ax.set_ylabel("Eje Y", fontsize=12)
-    ax.set_aspect('equal', adjustable='box')
-    ax.grid(True)
-    canvas.draw()
+    margin_x = (max(xs) - min(xs)) * 0.1 or 1
+    margin_y = (max(ys) - min(ys)) * 0.1 or 1
+    renderer.finish((min(xs) - margin_x, max(xs) + margin_x),
+                    (min(ys) - margin_y, max(ys) + margin_y))
     
     return intersections
 
-def calculate_slope(x1, y1, x2, y2):
-    if (x2 - x1) != 0:
-        return (y2 - y1) / (x2 - x1)
-    return None
-
 def update_table(intersections):
-    for row in table.get_children():
-        table.delete(row)
-    for inter in intersections:
-        table.insert("", "end", values=(inter[0], inter[1], inter[2], inter[3]))
+    # Tabla virtual: solo se formatean las filas visibles, (x_min, y, x_max, y)
+    virtual_table.set_source(len(intersections), intersections.row_tuple)
 
+# El cálculo corre en un hilo trabajador; la gráfica se actualiza por etapas
+# (relleno y luego cada arista) y "Cancelar" detiene un cálculo en curso
 def run_dda_triangle():
     try:
         xa, ya = int(entry_xa.get()), int(entry_ya.get())
         xb, yb = int(entry_xb.get()), int(entry_yb.get())
         xc, yc = int(entry_xc.get()), int(entry_yc.get())
-        
-        mAB = calculate_slope(xa, ya, xb, yb)
-        mBC = calculate_slope(xb, yb, xc, yc)
-        mCA = calculate_slope(xc, yc, xa, ya)
-        
-        slope_label.config(text=f"Pendiente AB: {mAB}, BC: {mBC}, CA: {mCA}")
-        
-        intersections = plot_triangle(canvas_plot, ax, [(xa, ya), (xb, yb), (xc, yc)])
-        
-        update_table(intersections)
     except ValueError:
         messagebox.showerror("Error", "Por favor, ingrese valores enteros válidos.")
+        return
+    
+    mAB = calculate_slope(xa, ya, xb, yb)
+    mBC = calculate_slope(xb, yb, xc, yc)
+    mCA = calculate_slope(xc, yc, xa, ya)
+    
+    slope_label.config(text=f"Pendiente AB: {mAB}, BC: {mBC}, CA: {mCA}")
+    
+    tri_points = [(xa, ya), (xb, yb), (xc, yc)]
+    engine = engine_var.get()
+    overlay = overlay_var.get()
+    runner.submit(lambda: triangle_progressive(tri_points, engine),
+                  on_progress=lambda result: show_triangle(result, tri_points, engine, overlay),
+                  on_done=lambda result: finish_triangle(result, tri_points, engine, overlay),
+                  on_error=lambda exc: messagebox.showerror("Error", str(exc)))
+
+# Resultado final, instrumentado con el tiempo del hilo trabajador
+def finish_triangle(result, tri_points, engine, overlay):
+    job = runner.job
+    with tracer.run("triangulo"):
+        tracer.record("algoritmo", job.started, job.finished)
+        show_triangle(result, tri_points, engine, overlay)
+
+def show_triangle(result, tri_points, engine, overlay):
+    intersections = plot_triangle(renderer, tri_points, engine, overlay, computed=result)
+    with tracer.span("tabla"):
+        update_table(intersections)
 
-root = tk.Tk()
-root.title("Algoritmo DDA - Triángulo (líneas suaves)")
-root.geometry("900x600")
-root.config(bg="#f4f4f9")
-
-frame_controls = tk.Frame(root, bg="#f4f4f9")
-frame_controls.pack(side=tk.LEFT, padx=30, pady=30, fill=tk.Y)
-
-frame_graph = tk.Frame(root, bg="#f4f4f9")
-frame_graph.pack(side=tk.RIGHT, padx=30, pady=30, expand=True, fill=tk.BOTH)
-
-tk.Label(frame_controls, text="Vértices del Triángulo", font=("Arial", 14, "bold"), bg="#f4f4f9").pack(pady=10)
-
-entries = []
-labels = ["Xa:", "Ya:", "Xb:", "Yb:", "Xc:", "Yc:"]
-for i, lbl in enumerate(labels):
-    tk.Label(frame_controls, text=lbl, font=("Arial", 12), bg="#f4f4f9").pack(pady=5)
-    entry = tk.Entry(frame_controls, width=8, font=("Arial", 12))
-    entry.pack(pady=5)
-    entries.append(entry)
-
-entry_xa, entry_ya, entry_xb, entry_yb, entry_xc, entry_yc = entries
-
-tk.Button(frame_controls, text="Generar Triángulo", command=run_dda_triangle,
-          font=("Arial", 12), bg="#4CAF50", fg="white", relief="solid", width=20).pack(pady=20)
-
-slope_label = tk.Label(frame_controls, text="Pendientes de las líneas:", font=("Arial", 12), bg="#f4f4f9")
-slope_label.pack(pady=10)
-
-table_frame = tk.Frame(frame_controls, bg="#f4f4f9")
-table_frame.pack(pady=20)
-
-columns = ("X1", "Y1", "X2", "Y2")
-table = ttk.Treeview(table_frame, columns=columns, show="headings", height=5)
-table.heading("X1", text="X1", anchor="center")
-table.heading("Y1", text="Y1", anchor="center")
-table.heading("X2", text="X2", anchor="center")
-table.heading("Y2", text="Y2", anchor="center")
-table.column("X1", anchor="center", width=80)
-table.column("Y1", anchor="center", width=80)
-table.column("X2", anchor="center", width=80)
-table.column("Y2", anchor="center", width=80)
-table.pack()
-
-fig, ax = plt.subplots(figsize=(6, 6))
-canvas_plot = FigureCanvasTkAgg(fig, master=frame_graph)
-canvas_plot.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-root.mainloop()
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Algoritmo DDA - Triángulo (líneas suaves)")
+    root.geometry("900x600")
+    root.config(bg="#f4f4f9")
+
+    # Barra de estado con el desglose de tiempos (solo con RASTER_TRACE activo)
+    if tracer.enabled:
+        status_var = tk.StringVar()
+        tk.Label(root, textvariable=status_var, anchor="w", relief=tk.SUNKEN,
+                 font=("Arial", 9)).pack(side=tk.BOTTOM, fill=tk.X)
+        tracer.on_run = status_var.set
+
+    frame_controls = tk.Frame(root, bg="#f4f4f9")
+    frame_controls.pack(side=tk.LEFT, padx=30, pady=30, fill=tk.Y)
+
+    frame_graph = tk.Frame(root, bg="#f4f4f9")
+    frame_graph.pack(side=tk.RIGHT, padx=30, pady=30, expand=True, fill=tk.BOTH)
+
+    tk.Label(frame_controls, text="Vértices del Triángulo", font=("Arial", 14, "bold"), bg="#f4f4f9").pack(pady=10)
+
+    entries = []
+    labels = ["Xa:", "Ya:", "Xb:", "Yb:", "Xc:", "Yc:"]
+    for i, lbl in enumerate(labels):
+        tk.Label(frame_controls, text=lbl, font=("Arial", 12), bg="#f4f4f9").pack(pady=5)
+        entry = tk.Entry(frame_controls, width=8, font=("Arial", 12))
+        entry.pack(pady=5)
+        entries.append(entry)
+
+    entry_xa, entry_ya, entry_xb, entry_yb, entry_xc, entry_yc = entries
+
+    engine_var = tk.StringVar(value="DDA")
+    tk.Label(frame_controls, text="Algoritmo:", font=("Arial", 12), bg="#f4f4f9").pack(pady=5)
+    tk.OptionMenu(frame_controls, engine_var, *LINE_ENGINES).pack(pady=5)
+
+    overlay_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(frame_controls, text="Superponer relleno (matplotlib)", variable=overlay_var,
+                   font=("Arial", 12), bg="#f4f4f9").pack(pady=5)
+
+    runner = JobRunner(root)
+    tk.Button(frame_controls, text="Generar Triángulo", command=run_dda_triangle,
+              font=("Arial", 12), bg="#4CAF50", fg="white", relief="solid", width=20).pack(pady=(20, 5))
+    tk.Button(frame_controls, text="Cancelar", command=runner.cancel,
+              font=("Arial", 12), bg="#ff9800", fg="white", relief="solid", width=20).pack(pady=(0, 20))
+
+    slope_label = tk.Label(frame_controls, text="Pendientes de las líneas:", font=("Arial", 12), bg="#f4f4f9")
+    slope_label.pack(pady=10)
+
+    table_frame = tk.Frame(frame_controls, bg="#f4f4f9")
+    table_frame.pack(pady=20)
+
+    columns = ("X1", "Y1", "X2", "Y2")
+    virtual_table = VirtualTable(table_frame, columns=columns, height=5, bg="#f4f4f9")
+    table = virtual_table.tree
+    table.heading("X1", text="X1", anchor="center")
+    table.heading("Y1", text="Y1", anchor="center")
+    table.heading("X2", text="X2", anchor="center")
+    table.heading("Y2", text="Y2", anchor="center")
+    table.column("X1", anchor="center", width=80)
+    table.column("Y1", anchor="center", width=80)
+    table.column("X2", anchor="center", width=80)
+    table.column("Y2", anchor="center", width=80)
+    virtual_table.pack()
+
+    renderer = PlotRenderer(frame_graph, "Triángulo con DDA")
+    renderer.ax.set_title("Triángulo con DDA", fontsize=14, fontweight='bold')
+    renderer.ax.xaxis.label.set_fontsize(12)
+    renderer.ax.yaxis.label.set_fontsize(12)
+
+    def on_close():
+        runner.shutdown()
+        renderer.close()
+        root.destroy()
+    root.protocol("WM_DELETE_WINDOW", on_close)
+
+    root.mainloop()